@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
 
-from controllers.agent import watchdog_online_handler
+from controllers.agent import watchdog_online_handler, cache_status_handler
 
 from vui_common.utils.swagger import route_description
 from vui_common.utils.exceptions import handle_exceptions_endpoint
@@ -41,3 +41,28 @@ route = '/watchdog'
 @handle_exceptions_endpoint
 async def watchdog_config():
     return await watchdog_online_handler()
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET RESOURCE CACHE READINESS
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_cache = endpoint_limiter.get_limiter_cust('info_cache')
+route = '/cache'
+
+
+@router.get(path=route,
+            tags=[tag_name],
+            summary='Get readiness of the Velero resources cache',
+            description=route_description(tag=tag_name,
+                                          route=route,
+                                          limiter_calls=limiter_cache.max_request,
+                                          limiter_seconds=limiter_cache.seconds),
+            dependencies=[Depends(RateLimiter(interval_seconds=limiter_cache.seconds,
+                                              max_requests=limiter_cache.max_request))],
+            response_model=SuccessfulRequest,
+            status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def cache_status():
+    return await cache_status_handler()
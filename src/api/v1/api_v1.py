@@ -14,7 +14,8 @@ from api.v1.routers import (sc_mapping,
                             pvb,
                             location,
                             inspect,
-                            requests)
+                            requests,
+                            cache)
 # from vui_common.security.routers import authentication, user
 from vui_common.security.authentication.auth_service import get_current_active_user
 
@@ -59,6 +60,8 @@ if config_app.app.auth_enabled:
                       dependencies=[Depends(get_current_active_user)])
     v1.include_router(requests.router,
                       dependencies=[Depends(get_current_active_user)])
+    v1.include_router(cache.router,
+                      dependencies=[Depends(get_current_active_user)])
 
 else:
     v1.include_router(backup.router)
@@ -76,3 +79,4 @@ else:
     v1.include_router(location.router)
     v1.include_router(inspect.router)
     v1.include_router(requests.router)
+    v1.include_router(cache.router)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 
 from constants.response import common_error_authenticated_response
 
@@ -25,7 +25,8 @@ from controllers.backup import (get_backups_handler,
                                 update_backup_expiration_handler,
                                 get_backup_expiration_handler,
                                 download_backup_handler,
-                                inspect_download_backup_handler)
+                                inspect_download_backup_handler,
+                                search_backup_logs_handler)
 
 router = APIRouter()
 
@@ -89,8 +90,43 @@ route = '/backup/logs'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def get_backup_logs(resource_name: str):
-    return await get_resource_logs_handler(resource_name=resource_name, resource_type='backup')
+async def get_backup_logs(resource_name: str, format: str = 'json', offset: int = 0, limit: int | None = None,
+                          tail: int | None = None, level: str | None = None, search: str | None = None,
+                          regex: str | None = None, resource: str | None = None, namespace: str | None = None,
+                          error: str | None = None,
+                          accept_encoding: str | None = Header(default=None, include_in_schema=False)):
+    return await get_resource_logs_handler(resource_name=resource_name, resource_type='backup', format=format,
+                                           accept_encoding=accept_encoding,
+                                           offset=offset, limit=limit, tail=tail, level=level, search=search,
+                                           regex=regex, resource=resource, namespace=namespace, error=error)
+
+
+# ------------------------------------------------------------------------------------------------
+#             SEARCH BACKUPS LOGS
+# ------------------------------------------------------------------------------------------------
+
+limiter_logs_search = endpoint_limiter.get_limiter_cust('backup_logs_search')
+route = '/backup/logs/search'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Search a pattern in the logs of the latest backups',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_logs_search.max_request,
+                                  limiter_seconds=limiter_logs_search.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_logs_search.seconds,
+                                      max_requests=limiter_logs_search.max_request))],
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def search_backup_logs(pattern: str, regex: bool = False, start: str | None = None, end: str | None = None,
+                             schedule_name: str | None = None, last: int = 100, level: str | None = None,
+                             limit: int | None = 100):
+    return await search_backup_logs_handler(pattern=pattern, regex=regex, start=start, end=end,
+                                            schedule_name=schedule_name, last=last, level=level, limit=limit)
 
 
 # ------------------------------------------------------------------------------------------------
@@ -357,5 +393,5 @@ route = '/backup/inspect-download'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def inspect_download_backup(backup_name: str):
-    return await inspect_download_backup_handler(backup_name)
+async def inspect_download_backup(backup_name: str, mode: str = 'extract'):
+    return await inspect_download_backup_handler(backup_name, mode=mode)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, status
+
+from constants.response import common_error_authenticated_response
+
+from vui_common.security.helpers.rate_limiter import RateLimiter, LimiterRequests
+
+from vui_common.utils.swagger import route_description
+from vui_common.utils.exceptions import handle_exceptions_endpoint
+
+from vui_common.schemas.response.successful_request import SuccessfulRequest
+from schemas.request.resync_cache import ResyncCacheRequestSchema
+
+from controllers.cache import resync_cache_handler
+
+router = APIRouter()
+
+tag_name = 'Cache'
+endpoint_limiter = LimiterRequests(tags=tag_name,
+                                   default_key='L1')
+
+# ------------------------------------------------------------------------------------------------
+#             FORCE RESOURCE CACHE RESYNC
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_resync = endpoint_limiter.get_limiter_cust('cache_resync')
+route = '/cache/resync'
+
+
+@router.post(
+    path=route,
+    tags=[tag_name],
+    summary='Force a relist of the Velero resources cache',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_resync.max_request,
+                                  limiter_seconds=limiter_resync.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_resync.seconds,
+                                      max_requests=limiter_resync.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def resync_cache(resync: ResyncCacheRequestSchema):
+    return await resync_cache_handler(resync=resync)
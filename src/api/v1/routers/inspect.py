@@ -11,7 +11,10 @@ from vui_common.utils.exceptions import handle_exceptions_endpoint
 from controllers.inspect import (get_backups_handler,
                                  # get_folders_handler,
                                  get_file_content_handler,
-                                 get_recursive_directory_contents_handler)
+                                 get_recursive_directory_contents_handler,
+                                 get_directory_page_handler,
+                                 get_directory_summary_handler,
+                                 get_workspace_usage_handler)
 
 router = APIRouter()
 
@@ -127,3 +130,71 @@ async def get_folder_content(backup: str):
     return await get_recursive_directory_contents_handler(backup=backup)
 
 
+limiter_tree = endpoint_limiter.get_limiter_cust('inspect_folder_tree')
+route = '/inspect/folder/tree'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get one page of a folder of an inspected backup',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_tree.max_request,
+                                  limiter_seconds=limiter_tree.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_tree.seconds,
+                                      max_requests=limiter_tree.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK
+)
+@handle_exceptions_endpoint
+async def get_folder_tree(backup: str, path: str | None = None, depth: int = 1, cursor: str | None = None,
+                          limit: int = 200):
+    return await get_directory_page_handler(backup=backup, path=path, depth=depth, cursor=cursor, limit=limit)
+
+
+limiter_summary = endpoint_limiter.get_limiter_cust('inspect_folder_summary')
+route = '/inspect/folder/summary'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the summary of an inspected backup',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_summary.max_request,
+                                  limiter_seconds=limiter_summary.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_summary.seconds,
+                                      max_requests=limiter_summary.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK
+)
+@handle_exceptions_endpoint
+async def get_folder_summary(backup: str):
+    return await get_directory_summary_handler(backup=backup)
+
+
+limiter_workspace = endpoint_limiter.get_limiter_cust('inspect_workspace')
+route = '/inspect/workspace'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the disk usage of the inspected backups',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_workspace.max_request,
+                                  limiter_seconds=limiter_workspace.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_workspace.seconds,
+                                      max_requests=limiter_workspace.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK
+)
+@handle_exceptions_endpoint
+async def get_workspace_usage():
+    return await get_workspace_usage_handler()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 
 from constants.response import common_error_authenticated_response
 from vui_common.security.helpers.rate_limiter import RateLimiter, LimiterRequests
@@ -74,8 +74,15 @@ route = '/restore/logs'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def get_restore_logs(resource_name: str):
-    return await get_resource_logs_handler(resource_name=resource_name, resource_type='restore')
+async def get_restore_logs(resource_name: str, format: str = 'json', offset: int = 0, limit: int | None = None,
+                           tail: int | None = None, level: str | None = None, search: str | None = None,
+                           regex: str | None = None, resource: str | None = None, namespace: str | None = None,
+                           error: str | None = None,
+                           accept_encoding: str | None = Header(default=None, include_in_schema=False)):
+    return await get_resource_logs_handler(resource_name=resource_name, resource_type='restore', format=format,
+                                           accept_encoding=accept_encoding,
+                                           offset=offset, limit=limit, tail=tail, level=level, search=search,
+                                           regex=regex, resource=resource, namespace=namespace, error=error)
 
 
 # ------------------------------------------------------------------------------------------------
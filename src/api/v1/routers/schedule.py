@@ -21,7 +21,8 @@ from controllers.schedule import (get_schedules_handler,
                                   unpause_schedule_handler,
                                   pause_schedule_handler,
                                   delete_schedule_handler,
-                                  update_schedule_handler)
+                                  update_schedule_handler,
+                                  stagger_schedules_handler)
 
 router = APIRouter()
 rate_limiter = RateLimiter()
@@ -245,3 +246,30 @@ route = '/schedule'
 @handle_exceptions_endpoint
 async def update_schedule(schedule: UpdateScheduleRequestSchema):
     return await update_schedule_handler(schedule=schedule)
+
+
+# ------------------------------------------------------------------------------------------------
+#             STAGGER SCHEDULES
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_stagger = endpoint_limiter.get_limiter_cust('schedule_stagger')
+route = '/schedule/stagger'
+
+
+@router.patch(
+    path=route,
+    tags=[tag_name],
+    summary='Move the schedules start times to minimize the peak of concurrent backups',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_stagger.max_request,
+                                  limiter_seconds=limiter_stagger.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_stagger.seconds,
+                                      max_requests=limiter_stagger.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def stagger_schedules(window: int = 120):
+    return await stagger_schedules_handler(window=window)
@@ -11,7 +11,10 @@ from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 from controllers.stats import (get_stats_handler,
                                get_in_progress_task_handler,
-                               get_schedules_heatmap_handler)
+                               get_schedules_heatmap_handler,
+                               get_upcoming_runs_handler,
+                               get_concurrency_handler,
+                               get_schedules_stagger_handler)
 
 router = APIRouter()
 rate_limiter = RateLimiter()
@@ -98,5 +101,86 @@ route = '/stats/schedules'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 #@handle_exceptions_endpoint
-async def get_schedules_heatmap():
-    return await get_schedules_heatmap_handler()
+async def get_schedules_heatmap(format: str = 'dense'):
+    return await get_schedules_heatmap_handler(format=format)
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET UPCOMING SCHEDULED RUNS
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_upcoming = endpoint_limiter.get_limiter_cust('stats_schedules_upcoming')
+route = '/stats/schedules/upcoming'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the next backup runs of all schedules',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_upcoming.max_request,
+                                  limiter_seconds=limiter_upcoming.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_upcoming.seconds,
+                                      max_requests=limiter_upcoming.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_upcoming_runs(limit: int = 50, hours: int | None = None):
+    return await get_upcoming_runs_handler(limit=limit, hours=hours)
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET BACKUPS AND RESTORES CONCURRENCY
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_concurrency = endpoint_limiter.get_limiter_cust('stats_concurrency')
+route = '/stats/concurrency'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the actual concurrency of backups and restores',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_concurrency.max_request,
+                                  limiter_seconds=limiter_concurrency.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_concurrency.seconds,
+                                      max_requests=limiter_concurrency.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_concurrency(start: str | None = None, end: str | None = None):
+    return await get_concurrency_handler(start=start, end=end)
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET SCHEDULES STAGGERING PROPOSAL
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_stagger = endpoint_limiter.get_limiter_cust('stats_schedules_stagger')
+route = '/stats/schedules/stagger'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the schedules start times that minimize the peak of concurrent backups',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_stagger.max_request,
+                                  limiter_seconds=limiter_stagger.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_stagger.seconds,
+                                      max_requests=limiter_stagger.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_schedules_stagger(window: int = 120):
+    return await get_schedules_stagger_handler(window=window)
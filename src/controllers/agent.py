@@ -1,12 +1,20 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 from service.watchdog import check_watchdog_online_service
+from service.cache import get_cache_status_service
 
 
 async def watchdog_online_handler():
     payload = await check_watchdog_online_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def cache_status_handler():
+    payload = await get_cache_status_service()
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,5 +1,7 @@
 import json
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+
+from utils.json_response import ModelJSONResponse
 
 from schemas.request.create_backup import CreateBackupRequestSchema
 from schemas.request.create_backup_from_schedule import CreateBackupFromScheduleRequestSchema
@@ -18,13 +20,14 @@ from service.backup import (get_backups_service,
                             update_backup_expiration_service,
                             download_backup_service)
 from service.inspect_download_backup import inspect_download_backup_service
+from service.log_search import search_backup_logs_service
 
 
 async def get_creation_settings_handler():
     payload = await get_resource_creation_settings_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_backups_handler(schedule_name: str | None = None, latest_per_schedule: bool = False,
@@ -34,7 +37,7 @@ async def get_backups_handler(schedule_name: str | None = None, latest_per_sched
                                         in_progress=in_progress)
 
     response = SuccessfulBackupResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def delete_backup_handler(backup_name: str):
@@ -45,7 +48,7 @@ async def delete_backup_handler(backup_name: str):
                        type_='INFO')
 
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_backup_handler(backup: CreateBackupRequestSchema):
@@ -55,7 +58,7 @@ async def create_backup_handler(backup: CreateBackupRequestSchema):
                        description=f"Backup {backup.name} created!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def create_backup_from_schedule_handler(backup: CreateBackupFromScheduleRequestSchema):
@@ -65,7 +68,7 @@ async def create_backup_from_schedule_handler(backup: CreateBackupFromScheduleRe
                        description=f"Backup created!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def update_backup_expiration_handler(ttl: UpdateBackupExpirationRequestSchema):
@@ -76,32 +79,40 @@ async def update_backup_expiration_handler(ttl: UpdateBackupExpirationRequestSch
                        description=f"Backup {ttl.backupName} expiration updated!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def get_backup_expiration_handler(backup_name: str):
     payload = await get_backup_expiration_service(backup_name=backup_name)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_backup_storage_classes_handler(backup_name: str):
     payload = await get_backup_storage_classes_service(backup_name=backup_name)
 
     response = SuccessfulRequest(payload=json.loads(payload.model_dump_json())['storage_classes'])
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def download_backup_handler(backup_name: str):
     payload = await download_backup_service(backup_name=backup_name)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
-async def inspect_download_backup_handler(backup_name: str):
-    payload = await inspect_download_backup_service(backup_name=backup_name)
+async def inspect_download_backup_handler(backup_name: str, mode: str = 'extract'):
+    payload = await inspect_download_backup_service(backup_name=backup_name, mode=mode)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def search_backup_logs_handler(pattern: str, regex: bool = False, start: str | None = None,
+                                     end: str | None = None, schedule_name: str | None = None, last: int = 100,
+                                     level: str | None = None, limit: int | None = 100):
+    content = await search_backup_logs_service(pattern=pattern, regex=regex, start=start, end=end,
+                                               schedule_name=schedule_name, last=last, level=level, limit=limit)
+    return StreamingResponse(content, media_type='application/x-ndjson', status_code=200)
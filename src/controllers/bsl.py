@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from schemas.request.update_bsl import UpdateBslRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
@@ -18,7 +18,7 @@ async def get_bsls_handler():
     payload = await get_bsls_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_bsl_handler(bsl: CreateBslRequestSchema):
@@ -26,7 +26,7 @@ async def create_bsl_handler(bsl: CreateBslRequestSchema):
 
     msg = Notification(title='Create bsl', description=f"BSL {bsl.name} created!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def set_default_bsl_handler(default_bsl: DefaultBslRequestSchema):
@@ -34,7 +34,7 @@ async def set_default_bsl_handler(default_bsl: DefaultBslRequestSchema):
 
     msg = Notification(title='Default bsl', description=f"BSL {default_bsl.name} set as default!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def set_remove_default_bsl_handler(default_bsl: DefaultBslRequestSchema):
@@ -42,7 +42,7 @@ async def set_remove_default_bsl_handler(default_bsl: DefaultBslRequestSchema):
 
     msg = Notification(title='Default bsl', description=f"BSL {default_bsl.name} removed as default!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def delete_bsl_handler(bsl_name: str):
@@ -54,7 +54,7 @@ async def delete_bsl_handler(bsl_name: str):
 
     response = SuccessfulRequest(payload=payload)
     response.notifications = [msg]
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def update_bsl_handler(bsl: UpdateBslRequestSchema):
@@ -65,4 +65,4 @@ async def update_bsl_handler(bsl: UpdateBslRequestSchema):
                        type_='INFO')
 
     response = SuccessfulRequest(payload=payload, notifications=[msg])
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
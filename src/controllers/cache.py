@@ -0,0 +1,17 @@
+from utils.json_response import ModelJSONResponse
+
+from vui_common.schemas.response.successful_request import SuccessfulRequest
+from vui_common.schemas.notification import Notification
+from schemas.request.resync_cache import ResyncCacheRequestSchema
+
+from service.cache import resync_cache_service
+
+
+async def resync_cache_handler(resync: ResyncCacheRequestSchema):
+    payload = await resync_cache_service(plural=resync.plural)
+
+    msg = Notification(title='Cache resync',
+                       description=f"Resync requested for {', '.join(payload['resync'])}",
+                       type_='INFO')
+    response = SuccessfulRequest(notifications=[msg], payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,10 +1,13 @@
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 # from utils.commons import logs_string_to_list
 
-from service.logs import get_velero_logs_service
+from service.logs import get_velero_logs_service, stream_velero_logs_service, stream_velero_text_logs_service
 from service.describe import get_velero_resource_details_service
 
 
@@ -12,15 +15,42 @@ async def get_resource_describe_handler(resource_name: str, resource_type: str):
     payload = await get_velero_resource_details_service(resource_name, resource_type)
 
     response = SuccessfulRequest(payload=payload.details)
-    return JSONResponse(content=response.model_dump(), status_code=200)
-
-
-async def get_resource_logs_handler(resource_name: str, resource_type: str):
-    payload = await get_velero_logs_service(resource_name, resource_type)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """Whether the Accept-Encoding header of the client allows a gzip content (not refused with q=0)"""
+    for item in (accept_encoding or '').split(','):
+        coding, *params = [part.strip().lower() for part in item.split(';')]
+        if coding in ('gzip', '*'):
+            quality = next((param[2:] for param in params if param.startswith('q=')), '1')
+            try:
+                return float(quality) > 0
+            except ValueError:
+                return False
+    return False
+
+
+async def get_resource_logs_handler(resource_name: str, resource_type: str, format: str = 'json',
+                                    accept_encoding: str | None = None, **filters):
+    if format == 'ndjson':
+        content = await stream_velero_logs_service(resource_name, resource_type, **filters)
+        return StreamingResponse(content, media_type='application/x-ndjson', status_code=200)
+    if format == 'text':
+        content, gzipped = await stream_velero_text_logs_service(resource_name, resource_type,
+                                                                 gzip=_accepts_gzip(accept_encoding), **filters)
+        headers = {'Vary': 'Accept-Encoding'}
+        if gzipped:
+            headers['Content-Encoding'] = 'gzip'
+        return StreamingResponse(content, media_type='text/plain; charset=utf-8', headers=headers, status_code=200)
+    if format != 'json':
+        raise HTTPException(status_code=400, detail=f"Unsupported logs format: {format}")
+
+    payload = await get_velero_logs_service(resource_name, resource_type, **filters)
 
     # logs = payload.logs
 
     # data = logs_string_to_list('\n'.join(logs))
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,37 +1,63 @@
 import os
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.configs.config_proxy import config_app
 from service.inspect import (get_folders_list,
                              # get_directory_contents,
                              read_json_file,
-                             get_recursive_directory_contents)
+                             get_recursive_directory_contents,
+                             get_directory_page,
+                             get_directory_summary,
+                             backup_directory,
+                             get_workspace_usage)
 
 
 async def get_backups_handler():
     payload = await get_folders_list(config_app.app.inspect_folder)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 # async def get_folders_handler(path: str):
 #     payload = await get_directory_contents(os.path.join(config_app.app.inspect_folder, path))
 #
 #     response = SuccessfulRequest(payload=payload)
-#     return JSONResponse(content=response.model_dump(), status_code=200)
+#     return ModelJSONResponse(content=response, status_code=200)
 #
 
 async def get_file_content_handler(path: str):
     payload = await read_json_file(os.path.join(config_app.app.inspect_folder, path))
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_recursive_directory_contents_handler(backup: str):
     payload = await get_recursive_directory_contents(os.path.join(config_app.app.inspect_folder, backup))
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_directory_page_handler(backup: str, path: str | None = None, depth: int = 1,
+                                     cursor: str | None = None, limit: int = 200):
+    payload = await get_directory_page(backup_directory(backup), path=path, depth=depth, cursor=cursor, limit=limit)
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_directory_summary_handler(backup: str):
+    payload = await get_directory_summary(backup_directory(backup))
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_workspace_usage_handler():
+    payload = await get_workspace_usage()
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.configs.config_proxy import config_app
 
@@ -19,35 +19,35 @@ async def get_ns_handler():
     payload = await get_namespaces_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_resources_handler():
     payload = await get_namespaces_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_credential_handler(secret_name, secret_key):
     payload = await get_credential_service(secret_name, secret_key)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_default_credential_handler():
     payload = await get_default_credential_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_k8s_storage_classes_handler():
     payload = await get_storage_classes_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_pod_logs_handler(pod, target='velero', lines=100):
@@ -55,7 +55,7 @@ async def get_pod_logs_handler(pod, target='velero', lines=100):
     payload = await get_pod_logs_service(namespace=namespace, pod=pod, lines=lines)
 
     response = SuccessfulRequest(payload={'logs': payload})
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_cloud_credentials_handler(cloud_credentials: CreateCloudCredentialsRequestSchema):
@@ -65,21 +65,21 @@ async def create_cloud_credentials_handler(cloud_credentials: CreateCloudCredent
                                                             cloud_credentials.awsSecretAccessKey)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_velero_secret_handler():
     payload = await get_velero_secret_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_velero_secret_key_handler(secret_name):
     payload = await get_secret_keys_service(config_app.k8s.velero_namespace, secret_name)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_velero_manifest_handler(resource_type: str, resource_name: str, neat: bool):
@@ -88,7 +88,7 @@ async def get_velero_manifest_handler(resource_type: str, resource_name: str, ne
                                                          neat=neat)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_k8s_manifest_handler(kind: str,
@@ -105,4 +105,4 @@ async def get_k8s_manifest_handler(kind: str,
                                                       neat=neat)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
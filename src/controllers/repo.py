@@ -1,5 +1,5 @@
 import os
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
@@ -18,7 +18,7 @@ async def get_repos_handler():
     payload = await get_repos_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_backup_size_handler(repository_url: str = None,
@@ -34,7 +34,7 @@ async def get_backup_size_handler(repository_url: str = None,
                                                  volume_namespace=volume_namespace)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_restic_repo_locks_handler(bsl, repository_url):
@@ -51,7 +51,7 @@ async def get_restic_repo_locks_handler(bsl, repository_url):
                        type_='INFO')
 
     response = SuccessfulRequest(payload=payload, notifications=[msg])
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def unlock_restic_repo_handler(repo: UnlockResticRepoRequestSchema):
@@ -64,7 +64,7 @@ async def unlock_restic_repo_handler(repo: UnlockResticRepoRequestSchema):
     payload = await unlock_restic_repo_service(env, repo.bsl, repo.repositoryUrl, repo.removeAll)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def check_restic_repo_handler(bsl, repository_url):
@@ -81,4 +81,4 @@ async def check_restic_repo_handler(bsl, repository_url):
                   type_='INFO')
 
     response = SuccessfulRequest(messages=[msg])
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
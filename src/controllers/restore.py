@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from schemas.request.create_restore import CreateRestoreRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
@@ -12,7 +12,7 @@ async def get_restores_handler(in_progress=False):
     payload = await get_restores_service(in_progress=in_progress)
 
     response = SuccessfulRestoreResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_restore_handler(restore: CreateRestoreRequestSchema):
@@ -23,7 +23,7 @@ async def create_restore_handler(restore: CreateRestoreRequestSchema):
                                    f"{restore.name} created successfully",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def delete_restore_handler(restore_name: str):
@@ -33,4 +33,4 @@ async def delete_restore_handler(restore_name: str):
                        description=f"Restore {restore_name} deleted request done!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
@@ -13,7 +13,7 @@ async def get_storages_classes_map_handler():
     payload = await get_storages_classes_map_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def update_storages_classes_mapping_handler(maps: StorageClassMapRequestSchema):
@@ -21,7 +21,7 @@ async def update_storages_classes_mapping_handler(maps: StorageClassMapRequestSc
 
     msg = Notification(title='Storage Class Map', description=f"Done!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def delete_storages_classes_mapping_handler(data_list=None):
@@ -29,4 +29,4 @@ async def delete_storages_classes_mapping_handler(data_list=None):
 
     msg = Notification(title='Storage Class Map', description=f"Deleted!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
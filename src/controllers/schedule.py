@@ -1,6 +1,6 @@
 # import json
 
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
@@ -13,6 +13,7 @@ from service.schedule import (get_schedules_service,
                               create_schedule_service,
                               pause_schedule_service,
                               update_schedule_service)
+from service.schedule_stagger import stagger_schedules_service
 from vui_common.logger.logger_proxy import logger
 
 
@@ -20,7 +21,7 @@ async def get_schedules_handler():
     payload = await get_schedules_service()
 
     response = SuccessfulScheduleResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def pause_schedule_handler(schedule: str):
@@ -30,7 +31,7 @@ async def pause_schedule_handler(schedule: str):
                        description=f"Schedule {schedule} pause request done!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def unpause_schedule_handler(schedule: str):
@@ -40,7 +41,7 @@ async def unpause_schedule_handler(schedule: str):
                        description=f"Schedule {schedule} start request done!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_schedule_handler(info: CreateScheduleRequestSchema):
@@ -50,7 +51,7 @@ async def create_schedule_handler(info: CreateScheduleRequestSchema):
                        description=f"Schedule {info.name} created!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def delete_schedule_handler(schedule_name: str):
@@ -60,7 +61,7 @@ async def delete_schedule_handler(schedule_name: str):
                        description=f"Schedule {schedule_name} deleted request done!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def update_schedule_handler(schedule: UpdateScheduleRequestSchema):
@@ -70,4 +71,16 @@ async def update_schedule_handler(schedule: UpdateScheduleRequestSchema):
                        description=f"Schedule '{schedule.name}' successfully updated.",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def stagger_schedules_handler(window: int = 120):
+    payload = await stagger_schedules_service(window=window, apply=True)
+
+    moved = sum(1 for schedule in payload['schedules'] if schedule.get('applied'))
+    msg = Notification(title='Stagger schedules',
+                       description=f"{moved} schedules moved, backups peak from {payload['peak_before']} "
+                                   f"to {payload['peak_after']}",
+                       type_='INFO')
+    response = SuccessfulRequest(notifications=[msg], payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,5 +1,5 @@
 import os
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.configs.config_proxy import config_app
 
@@ -18,14 +18,14 @@ async def get_env_handler():
         env_data = config_app.get_env_variables()
 
     response = SuccessfulRequest(payload=env_data)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_velero_version_handler():
     payload = await get_velero_version_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_velero_pods_handler():
@@ -37,7 +37,7 @@ async def get_velero_pods_handler():
                                      namespace=config_app.k8s.velero_namespace)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_vui_pods_handler():
@@ -51,4 +51,4 @@ async def get_vui_pods_handler():
     payload = await get_pods_service(label_selectors_by_type, namespace=config_app.k8s.vui_namespace)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
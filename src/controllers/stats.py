@@ -1,18 +1,20 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 from service.backup import get_backups_service
 from service.restore import get_restores_service
 from service.stats import get_stats_service
-from service.schedule_heatmap import get_schedules_heatmap_service
+from service.schedule_heatmap import get_schedules_heatmap_service, get_upcoming_runs_service
+from service.concurrency import get_concurrency_service
+from service.schedule_stagger import stagger_schedules_service
 
 
 async def get_stats_handler():
     payload = await get_stats_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_in_progress_task_handler():
@@ -21,11 +23,32 @@ async def get_in_progress_task_handler():
     payload = [*backups, *restores]
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
-async def get_schedules_heatmap_handler():
-    payload = await get_schedules_heatmap_service()
+async def get_schedules_heatmap_handler(format: str = 'dense'):
+    payload = await get_schedules_heatmap_service(format=format)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_upcoming_runs_handler(limit: int = 50, hours: int | None = None):
+    payload = await get_upcoming_runs_service(limit=limit, hours=hours)
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_concurrency_handler(start: str | None = None, end: str | None = None):
+    payload = await get_concurrency_service(start=start, end=end)
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
+
+
+async def get_schedules_stagger_handler(window: int = 120):
+    payload = await stagger_schedules_service(window=window)
+
+    response = SuccessfulRequest(payload=payload)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from schemas.request.update_vsl import UpdateVslRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
@@ -12,7 +12,7 @@ async def get_vsl_handler():
     payload = await get_vsls_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_vsl_handler(create_bsl: CreateVslRequestSchema):
@@ -20,14 +20,14 @@ async def create_vsl_handler(create_bsl: CreateVslRequestSchema):
 
     msg = Notification(title='Create bsl', description=f"BSL {create_bsl.name} created!", type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def delete_vsl_handler(bsl_delete: str):
     payload = await delete_vsl_service(vsl_name=bsl_delete)
     msg = Notification(title='Delete bsl', description=f'Bsl {bsl_delete} deleted request done!', type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 async def update_vsl_handler(vsl: UpdateVslRequestSchema):
     payload = await update_vsl_service(vsl_data=vsl)
@@ -37,4 +37,4 @@ async def update_vsl_handler(vsl: UpdateVslRequestSchema):
                        type_='INFO')
 
     response = SuccessfulRequest(payload=payload, notifications=[msg])
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from utils.json_response import ModelJSONResponse
 
 from vui_common.configs.config_proxy import config_app
 
@@ -25,28 +25,28 @@ async def version_handler():
     payload = await get_watchdog_version_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def send_report_handler():
     payload = await send_watchdog_report()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_env_handler():
     payload = await get_watchdog_env_services()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_cron_handler():
     payload = await get_watchdog_report_cron_service(job_name=config_app.watchdog.report_cronjob_name)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def send_test_notification_handler(provider: AppriseTestServiceRequestSchema):
@@ -54,14 +54,14 @@ async def send_test_notification_handler(provider: AppriseTestServiceRequestSche
 
     msg = Notification(title='Send Notification', description=f"Test notification done!", type_='Success')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def restart_handler():
     payload = await restart_watchdog_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def user_configs_handler():
@@ -70,21 +70,21 @@ async def user_configs_handler():
 
     payload['APPRISE'] = ';'.join(secrets)
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def update_user_configs_handler(user_configs: UpdateUserConfigRequestSchema):
     payload = await update_watchdog_user_configs_service(user_configs)
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def get_apprise_services_handler():
     payload = await get_apprise_services()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
 
 
 async def create_apprise_service_handler(service: CreateUserServiceRequestSchema):
@@ -94,7 +94,7 @@ async def create_apprise_service_handler(service: CreateUserServiceRequestSchema
                        description=f"New service added!",
                        type_='INFO')
     response = SuccessfulRequest(notifications=[msg], payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=201)
+    return ModelJSONResponse(content=response, status_code=201)
 
 
 async def delete_apprise_service_handler(service: str):
@@ -106,4 +106,4 @@ async def delete_apprise_service_handler(service: str):
 
     response = SuccessfulRequest(payload=payload)
     response.notifications = [msg]
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return ModelJSONResponse(content=response, status_code=200)
@@ -464,9 +464,6 @@ class NatsManager:
                     else:
                         response = await endpoint_function()
 
-                    if isinstance(response, JSONResponse):
-                        response = json.loads(response.body.decode())
-
                 elif command['method'] == 'POST' or command['method'] == 'PATCH' or command['method'] == 'PUT' or command['method'] == 'DELETE':
                     logger.debug(f"message_handle.command {command['method']}")
 
@@ -507,11 +504,11 @@ class NatsManager:
                         # else:
                         #     raise HTTPException(status_code=400, detail="Unsupported parameter type")
 
-                        # If the response is a JSONResponse object, get content
-                        if isinstance(response, JSONResponse):
-                            response = json.loads(response.body.decode())
-
-                content = json.dumps(response)
+                # If the response is a JSONResponse object, its body is already serialized
+                if isinstance(response, JSONResponse):
+                    content = response.body
+                else:
+                    content = json.dumps(response)
 
             else:  # command['method'] not in commands:
                 logger.warning(f"message_handle.command {command['method']} not recognized ")
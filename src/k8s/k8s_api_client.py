@@ -0,0 +1,72 @@
+import asyncio
+import os
+
+from kubernetes_asyncio import client, config
+
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+# Max number of concurrent connections towards the API server (shared by services and watches)
+K8S_API_POOL_MAXSIZE = int(os.getenv('K8S_API_POOL_MAXSIZE', 32))
+
+_api_client: client.ApiClient | None = None
+_api_client_lock = asyncio.Lock()
+
+
+async def get_api_client() -> client.ApiClient:
+    """Returns the process-wide async ApiClient, loading the Kubernetes configuration at first use"""
+    global _api_client
+
+    if _api_client is None:
+        async with _api_client_lock:
+            if _api_client is None:
+                configuration = client.Configuration()
+                try:
+                    config.load_incluster_config(client_configuration=configuration)
+                    logger.info("Kubernetes in cluster mode....")
+                except config.ConfigException:
+                    # Use local kubeconfig file if running locally
+                    await config.load_kube_config(config_file=config_app.k8s.kube_config,
+                                                  client_configuration=configuration)
+                    logger.info("Kubernetes load local kube config...")
+
+                configuration.connection_pool_maxsize = K8S_API_POOL_MAXSIZE
+                _api_client = client.ApiClient(configuration)
+
+    return _api_client
+
+
+async def close_api_client():
+    global _api_client
+
+    if _api_client is not None:
+        await _api_client.close()
+        _api_client = None
+
+
+async def custom_objects_api() -> client.CustomObjectsApi:
+    return client.CustomObjectsApi(await get_api_client())
+
+
+async def core_v1_api() -> client.CoreV1Api:
+    return client.CoreV1Api(await get_api_client())
+
+
+async def apps_v1_api() -> client.AppsV1Api:
+    return client.AppsV1Api(await get_api_client())
+
+
+async def batch_v1_api() -> client.BatchV1Api:
+    return client.BatchV1Api(await get_api_client())
+
+
+async def storage_v1_api() -> client.StorageV1Api:
+    return client.StorageV1Api(await get_api_client())
+
+
+async def apis_api() -> client.ApisApi:
+    return client.ApisApi(await get_api_client())
+
+
+async def apiextensions_v1_api() -> client.ApiextensionsV1Api:
+    return client.ApiextensionsV1Api(await get_api_client())
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from kubernetes_asyncio.client import ApiException
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+from constants.velero import VELERO
+from k8s.k8s_api_client import custom_objects_api
+from k8s.k8s_download_request_waiter import DOWNLOAD_REQUESTS_PLURAL
+from k8s.k8s_query import list_velero_resources
+
+# Seconds between two runs of the DownloadRequests collector
+DOWNLOAD_REQUEST_GC_INTERVAL_SEC = int(os.getenv('DOWNLOAD_REQUEST_GC_INTERVAL_SEC', 300))
+# Min age in seconds of a Processed DownloadRequest to be collected (its URL is read right after the processing)
+DOWNLOAD_REQUEST_GC_MIN_AGE_SEC = int(os.getenv('DOWNLOAD_REQUEST_GC_MIN_AGE_SEC', 120))
+# Max DELETE calls per second and per run
+DOWNLOAD_REQUEST_GC_RATE = float(os.getenv('DOWNLOAD_REQUEST_GC_RATE', 10))
+DOWNLOAD_REQUEST_GC_BATCH = int(os.getenv('DOWNLOAD_REQUEST_GC_BATCH', 500))
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Kubernetes timestamp as naive UTC datetime"""
+    return datetime.fromisoformat(value.replace('Z', '')) if value else None
+
+
+class K8sDownloadRequestCollector:
+    """
+    Periodic deletion of the DownloadRequests not needed anymore: the expired ones and the Processed ones
+    older than DOWNLOAD_REQUEST_GC_MIN_AGE_SEC (their signed URL does not depend on the object and
+    create_download_request keeps it in memory). Deletions are rate limited and counted in `info()`.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.reclaimed = 0
+        self.errors = 0
+        self.last_run: Optional[str] = None
+        self.last_reclaimed = 0
+
+    @staticmethod
+    def collectable(items: List[dict], now: datetime) -> List[str]:
+        names = []
+        min_created = now - timedelta(seconds=DOWNLOAD_REQUEST_GC_MIN_AGE_SEC)
+        for item in items:
+            status = item.get('status') or {}
+            expiration = _timestamp(status.get('expiration'))
+            created = _timestamp(item.get('metadata', {}).get('creationTimestamp'))
+            if ((expiration is not None and expiration <= now) or
+                    (status.get('phase') == 'Processed' and created is not None and created <= min_created)):
+                names.append(item['metadata']['name'])
+        return names
+
+    async def _delete(self, name: str) -> bool:
+        custom_objects = await custom_objects_api()
+        try:
+            await custom_objects.delete_namespaced_custom_object(
+                group=VELERO["GROUP"],
+                version=VELERO["VERSION"],
+                namespace=config_app.k8s.velero_namespace,
+                plural=DOWNLOAD_REQUESTS_PLURAL,
+                name=name
+            )
+            return True
+        except ApiException as e:
+            if e.status == 404:
+                return False
+            self.errors += 1
+            logger.error(f"Error while deleting DownloadRequest '{name}': {e}")
+            return False
+
+    async def collect(self) -> int:
+        """Delete the collectable DownloadRequests (at most DOWNLOAD_REQUEST_GC_BATCH), returns how many"""
+        now = datetime.utcnow()
+        items = await list_velero_resources(DOWNLOAD_REQUESTS_PLURAL)
+        names = self.collectable(items, now)[:DOWNLOAD_REQUEST_GC_BATCH]
+
+        reclaimed = 0
+        for index, name in enumerate(names):
+            if index:
+                await asyncio.sleep(1 / DOWNLOAD_REQUEST_GC_RATE)
+            reclaimed += await self._delete(name)
+
+        self.runs += 1
+        self.reclaimed += reclaimed
+        self.last_reclaimed = reclaimed
+        self.last_run = now.isoformat()
+        if reclaimed:
+            logger.info(f"DownloadRequests collector: {reclaimed} of {len(items)} DownloadRequests deleted")
+        return reclaimed
+
+    async def run(self, manager):
+        while manager.watch_running:
+            try:
+                await self.collect()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"⚠️ Error in the DownloadRequests collector: {e}")
+            await asyncio.sleep(DOWNLOAD_REQUEST_GC_INTERVAL_SEC)
+
+    def info(self) -> dict:
+        return {'runs': self.runs, 'reclaimed': self.reclaimed, 'last_run': self.last_run,
+                'last_reclaimed': self.last_reclaimed, 'errors': self.errors}
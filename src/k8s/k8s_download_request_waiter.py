@@ -0,0 +1,65 @@
+import asyncio
+from typing import Dict, List, Optional
+
+from k8s import k8s_watcher_proxy
+
+DOWNLOAD_REQUESTS_PLURAL = 'downloadrequests'
+
+
+def _processed(item: dict) -> bool:
+    status = item.get('status')
+    return isinstance(status, dict) and status.get('phase') == 'Processed'
+
+
+class K8sDownloadRequestWaiter:
+    """
+    Futures of the pending DownloadRequests, completed with the object by the watch events applied to
+    K8sResourceCache as soon as its phase becomes Processed. There is one future per DownloadRequest name,
+    shared by all the callers waiting for it.
+    """
+
+    def __init__(self):
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    def future(self, name: str) -> asyncio.Future:
+        """The future of a DownloadRequest, to be requested before creating it so no event is missed"""
+        future = self._futures.get(name)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._futures[name] = future
+        return future
+
+    def discard(self, name: str, future: Optional[asyncio.Future] = None):
+        if future is None or self._futures.get(name) is future:
+            self._futures.pop(name, None)
+
+    def resolve(self, item: dict):
+        """Complete the future of a processed DownloadRequest (from a watch event or a poll)"""
+        future = self._futures.get(item.get('metadata', {}).get('name'))
+        if future is not None and not future.done() and _processed(item):
+            future.set_result(item)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for future in self._futures.values() if not future.done())
+
+    # ------------------------------------------------------------------------------------------------
+    #             CACHE LISTENER
+    # ------------------------------------------------------------------------------------------------
+
+    def update(self, plural: str, old_item: Optional[dict], new_item: Optional[dict]):
+        if plural == DOWNLOAD_REQUESTS_PLURAL and new_item is not None:
+            self.resolve(new_item)
+
+    def reset(self, plural: str, items: List[dict]):
+        if plural == DOWNLOAD_REQUESTS_PLURAL and self._futures:
+            for item in items:
+                self.resolve(item)
+
+
+def get_download_request_waiter() -> Optional[K8sDownloadRequestWaiter]:
+    """The waiter of the watch manager, or None when the watch is not running"""
+    manager = k8s_watcher_proxy.k8s_watcher_manager
+    if manager is None or not manager.watch_running:
+        return None
+    return manager.download_requests
@@ -0,0 +1,71 @@
+import os
+from typing import AsyncIterator, List, Optional
+
+from vui_common.configs.config_proxy import config_app
+
+from constants.velero import VELERO
+from k8s.k8s_api_client import custom_objects_api
+
+# Number of objects requested for each page of a chunked LIST
+K8S_LIST_PAGE_SIZE = int(os.getenv('K8S_LIST_PAGE_SIZE', 500))
+
+
+class K8sListPager:
+    """
+    Chunked LIST of a Velero custom resource (limit/continue).
+
+    The API server serves all the pages from the snapshot of the first one, so the collection is consistent
+    and `resource_version` (available after the first page) can be used to start a watch without gaps.
+    Iterate with `async for item in pager` to consume the objects one page at a time, without keeping the
+    whole collection in memory.
+    """
+
+    def __init__(self, plural: str, namespace: Optional[str] = None, page_size: Optional[int] = None,
+                 **list_kwargs):
+        self.plural = plural
+        self.namespace = namespace or config_app.k8s.velero_namespace
+        self.page_size = page_size or K8S_LIST_PAGE_SIZE
+        self.list_kwargs = list_kwargs
+        self.resource_version: Optional[str] = None
+        self.pages_count = 0
+
+    async def pages(self) -> AsyncIterator[List[dict]]:
+        """Yield the items of each page as soon as it is received"""
+        custom_objects = await custom_objects_api()
+        continue_token = None
+        self.pages_count = 0
+
+        while True:
+            kwargs = dict(self.list_kwargs, limit=self.page_size)
+            if continue_token:
+                kwargs['_continue'] = continue_token
+
+            response = await custom_objects.list_namespaced_custom_object(
+                group=VELERO["GROUP"],
+                version=VELERO["VERSION"],
+                namespace=self.namespace,
+                plural=self.plural,
+                **kwargs
+            )
+            metadata = response.get("metadata", {})
+            if self.pages_count == 0:
+                self.resource_version = metadata.get("resourceVersion")
+            self.pages_count += 1
+
+            yield response.get("items", [])
+
+            continue_token = metadata.get("continue")
+            if not continue_token:
+                break
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        async for page in self.pages():
+            for item in page:
+                yield item
+
+    async def list_all(self) -> dict:
+        """Collect all the pages in a LIST-like response"""
+        items = []
+        async for page in self.pages():
+            items.extend(page)
+        return {'metadata': {'resourceVersion': self.resource_version}, 'items': items}
@@ -0,0 +1,138 @@
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from kubernetes_asyncio.client import ApiException
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+from constants.velero import VELERO
+from k8s.k8s_api_client import custom_objects_api
+from k8s.k8s_list_pager import K8sListPager
+from k8s.k8s_resource_cache import get_resource_cache
+
+# Field selectors supported by the API server for custom resources
+SERVER_FIELD_SELECTORS = ('metadata.name', 'metadata.namespace')
+
+
+class K8sQuery:
+    """
+    Filters of a Velero resources query.
+
+    Equality filters on labels and on the supported fields are sent to the API server as label_selector /
+    field_selector, a query by name becomes a direct GET. Whatever the API cannot express (other fields,
+    custom predicates) is applied client-side, so the result is always the same as a full LIST filtered
+    in Python.
+    """
+
+    def __init__(self, name: Optional[str] = None, labels: Optional[Dict[str, str]] = None,
+                 fields: Optional[Dict[str, str]] = None, predicate: Optional[Callable[[dict], bool]] = None):
+        self.name = name
+        self.labels = {k: v for k, v in (labels or {}).items() if v is not None}
+        self.fields = {k: v for k, v in (fields or {}).items() if v is not None}
+        self.predicate = predicate
+
+    @staticmethod
+    def _get_field(item: dict, path: str):
+        value = item
+        for key in path.split('.'):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    @property
+    def label_selector(self) -> Optional[str]:
+        return ','.join(f"{k}={v}" for k, v in self.labels.items()) or None
+
+    @property
+    def field_selector(self) -> Optional[str]:
+        fields = {k: v for k, v in self.fields.items() if k in SERVER_FIELD_SELECTORS}
+        if self.name:
+            fields['metadata.name'] = self.name
+        return ','.join(f"{k}={v}" for k, v in fields.items()) or None
+
+    def selectors(self) -> dict:
+        """Keyword arguments for a LIST call with the filters that can be pushed to the API server"""
+        kwargs = {}
+        if self.label_selector:
+            kwargs['label_selector'] = self.label_selector
+        if self.field_selector:
+            kwargs['field_selector'] = self.field_selector
+        return kwargs
+
+    def matches(self, item: dict) -> bool:
+        """Client-side evaluation of all the filters"""
+        metadata = item.get('metadata', {})
+        if self.name and metadata.get('name') != self.name:
+            return False
+        labels = metadata.get('labels') or {}
+        if any(labels.get(k) != v for k, v in self.labels.items()):
+            return False
+        if any(self._get_field(item, k) != v for k, v in self.fields.items()):
+            return False
+        return self.predicate is None or self.predicate(item)
+
+
+async def _get_velero_resource(plural: str, name: str, namespace: str) -> Optional[dict]:
+    custom_objects = await custom_objects_api()
+    try:
+        return await custom_objects.get_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=namespace,
+            plural=plural,
+            name=name
+        )
+    except ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+async def iter_velero_resources(plural: str, query: Optional[K8sQuery] = None,
+                                namespace: Optional[str] = None) -> AsyncIterator[dict]:
+    """
+    Yield the Velero resources of a plural selected by `query`.
+    The watch cache is used when synced, otherwise the filters are pushed to the API server
+    (GET by name or chunked LIST with selectors) and the rest is applied client-side.
+    """
+    query = query or K8sQuery()
+    namespace = namespace or config_app.k8s.velero_namespace
+
+    cache = get_resource_cache()
+    if cache is not None and cache.is_synced(plural) and namespace == config_app.k8s.velero_namespace:
+        items = [cache.get(plural, query.name)] if query.name else cache.list(plural)
+        for item in items:
+            if item is not None and query.matches(item):
+                yield item
+        return
+
+    if query.name:
+        item = await _get_velero_resource(plural, query.name, namespace)
+        if item is not None and query.matches(item):
+            yield item
+        return
+
+    selectors = query.selectors()
+    yielded = False
+    try:
+        async for page in K8sListPager(plural, namespace=namespace, **selectors).pages():
+            for item in page:
+                if query.matches(item):
+                    yielded = True
+                    yield item
+        return
+    except ApiException as e:
+        # Selector not accepted by the API server: fall back to a LIST filtered client-side
+        if e.status != 400 or not selectors or yielded:
+            raise
+        logger.warning(f"Selectors {selectors} rejected for {plural}, fall back to client-side filtering")
+
+    async for page in K8sListPager(plural, namespace=namespace).pages():
+        for item in page:
+            if query.matches(item):
+                yield item
+
+
+async def list_velero_resources(plural: str, query: Optional[K8sQuery] = None,
+                                namespace: Optional[str] = None) -> List[dict]:
+    return [item async for item in iter_velero_resources(plural, query, namespace)]
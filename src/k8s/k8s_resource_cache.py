@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from k8s import k8s_watcher_proxy
+
+
+class K8sResourceCache:
+    """
+    In-memory store of the Velero custom resources, fed by the list/watch loop of K8sWatchManager.
+
+    Objects are keyed by uid (with a name index for direct lookups) and every plural keeps track of
+    the last resourceVersion seen, so the watch can be resumed without losing events.
+    """
+
+    def __init__(self, plurals: List[str]):
+        self._items: Dict[str, Dict[str, dict]] = {plural: {} for plural in plurals}
+        self._names: Dict[str, Dict[str, str]] = {plural: {} for plural in plurals}
+        self._resource_versions: Dict[str, Optional[str]] = {plural: None for plural in plurals}
+        self._synced: Dict[str, bool] = {plural: False for plural in plurals}
+        self._unavailable: Dict[str, bool] = {plural: False for plural in plurals}
+        self._last_sync: Dict[str, Optional[str]] = {plural: None for plural in plurals}
+        self._listeners = []
+
+    @property
+    def plurals(self) -> List[str]:
+        return list(self._items.keys())
+
+    def add_listener(self, listener):
+        """
+        Register an object notified of every change of the cache: `listener.reset(plural, items)` after a LIST,
+        `listener.update(plural, old_item, new_item)` after a watch event (None for added/deleted objects)
+        """
+        self._listeners.append(listener)
+
+    @staticmethod
+    def _key(item: dict) -> str:
+        metadata = item.get("metadata", {})
+        return metadata.get("uid") or metadata.get("name")
+
+    def replace(self, plural: str, items: List[dict], resource_version: Optional[str]):
+        """Replace the whole content of a plural with the result of a LIST"""
+        store = {}
+        names = {}
+        for item in items:
+            key = self._key(item)
+            store[key] = item
+            names[item["metadata"]["name"]] = key
+
+        self._items[plural] = store
+        self._names[plural] = names
+        self._resource_versions[plural] = resource_version
+        self._synced[plural] = True
+        self._unavailable[plural] = False
+        self._last_sync[plural] = datetime.utcnow().isoformat()
+
+        for listener in self._listeners:
+            listener.reset(plural, items)
+
+    def apply_event(self, plural: str, event_type: str, item: dict):
+        """Apply a single ADDED/MODIFIED/DELETED watch event"""
+        metadata = item.get("metadata", {})
+        self._resource_versions[plural] = metadata.get("resourceVersion", self._resource_versions[plural])
+
+        if event_type == "BOOKMARK":
+            return
+
+        key = self._key(item)
+        old_item = self._items[plural].get(key)
+        if event_type == "DELETED":
+            self._items[plural].pop(key, None)
+            self._names[plural].pop(metadata.get("name"), None)
+            item = None
+        else:
+            self._items[plural][key] = item
+            self._names[plural][metadata.get("name")] = key
+
+        for listener in self._listeners:
+            listener.update(plural, old_item, item)
+
+    def invalidate(self, plural: str):
+        """Mark a plural as out of sync: readers fall back to a live LIST until the next relist"""
+        self._synced[plural] = False
+
+    def set_unavailable(self, plural: str):
+        """The resource is not served by the cluster (e.g. resticrepositories on recent Velero versions)"""
+        self._synced[plural] = False
+        self._unavailable[plural] = True
+
+    def is_synced(self, plural: str) -> bool:
+        return self._synced.get(plural, False)
+
+    def resource_version(self, plural: str) -> Optional[str]:
+        return self._resource_versions.get(plural)
+
+    def list(self, plural: str) -> List[dict]:
+        return list(self._items[plural].values())
+
+    def get(self, plural: str, name: str) -> Optional[dict]:
+        key = self._names[plural].get(name)
+        return self._items[plural].get(key) if key else None
+
+    @property
+    def ready(self) -> bool:
+        return all(self._synced[plural] for plural in self._items if not self._unavailable[plural])
+
+    def status(self) -> dict:
+        return {
+            'ready': self.ready,
+            'resources': {
+                plural: {
+                    'synced': self._synced[plural],
+                    'available': not self._unavailable[plural],
+                    'count': len(self._items[plural]),
+                    'resourceVersion': self._resource_versions[plural],
+                    'lastSync': self._last_sync[plural]
+                } for plural in self._items
+            }
+        }
+
+
+def get_resource_cache() -> Optional[K8sResourceCache]:
+    manager = k8s_watcher_proxy.k8s_watcher_manager
+    return manager.cache if manager is not None else None
+
+
+def get_cached_items(plural: str) -> Optional[List[dict]]:
+    """
+    Returns the cached objects of a plural or None when the cache is not synced yet,
+    in which case the caller is expected to fall back to a live LIST.
+    """
+    cache = get_resource_cache()
+    if cache is None or not cache.is_synced(plural):
+        return None
+    return cache.list(plural)
+
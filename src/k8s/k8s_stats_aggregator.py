@@ -0,0 +1,255 @@
+import asyncio
+import os
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from vui_common.logger.logger_proxy import logger
+
+from k8s import k8s_watcher_proxy
+
+# Seconds between two full recomputes used to verify the incremental counters
+STATS_DRIFT_CHECK_SEC = int(os.getenv('STATS_DRIFT_CHECK_SEC', 300))
+
+STATS_PLURALS = ('backups', 'restores', 'schedules')
+
+
+def _phase(item: dict) -> Optional[str]:
+    status = item.get('status')
+    return status.get('phase') if isinstance(status, dict) else None
+
+
+class K8sStatsAggregator:
+    """
+    Counters behind /v1/stats, kept up to date by the watch events applied to K8sResourceCache.
+
+    For backups it tracks the phase counters, the latest backup of each schedule and the completion
+    timestamps (for the top latest completions); for restores the phase counters; for schedules the
+    paused count and the reference count of the scheduled namespaces.
+    """
+
+    def __init__(self):
+        self._clear_backups()
+        self._clear_restores()
+        self._clear_schedules()
+
+    def _clear_backups(self):
+        self._backups: Dict[str, dict] = {}
+        self._backup_phases = Counter()
+        self._backup_scheduled_count = 0
+        self._unscheduled_phases = Counter()
+        self._schedule_backups: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self._latest: Dict[str, str] = {}
+        self._latest_phases = Counter()
+        self._completions: List[Tuple[str, str]] = []
+
+    def _clear_restores(self):
+        self._restore_phases: Dict[str, Optional[str]] = {}
+        self._restore_phase_counts = Counter()
+
+    def _clear_schedules(self):
+        self._schedules: Dict[str, Tuple[bool, List[str]]] = {}
+        self._paused_count = 0
+        self._namespaces = Counter()
+
+    @classmethod
+    def from_items(cls, items_by_plural: Dict[str, List[dict]]) -> 'K8sStatsAggregator':
+        aggregator = cls()
+        for plural, items in items_by_plural.items():
+            aggregator.reset(plural, items)
+        return aggregator
+
+    @staticmethod
+    def _key(item: dict) -> str:
+        metadata = item.get('metadata', {})
+        return metadata.get('uid') or metadata.get('name')
+
+    # ------------------------------------------------------------------------------------------------
+    #             BACKUPS
+    # ------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _schedule_name(item: dict) -> Optional[str]:
+        labels = item.get('metadata', {}).get('labels') or {}
+        return labels.get('velero.io/schedule-name') or None
+
+    @staticmethod
+    def _completion(item: dict) -> str:
+        status = item.get('status')
+        if not isinstance(status, dict):
+            return ''
+        return status.get('completionTimestamp') or ''
+
+    def _set_latest(self, schedule_name: str, key: Optional[str]):
+        previous = self._latest.pop(schedule_name, None)
+        if previous is not None:
+            self._latest_phases[_phase(self._backups[previous])] -= 1
+        if key is not None:
+            self._latest[schedule_name] = key
+            self._latest_phases[_phase(self._backups[key])] += 1
+
+    def _add_backup(self, key: str, item: dict, sort_completions: bool = True):
+        self._backups[key] = item
+        phase = _phase(item)
+        self._backup_phases[phase] += 1
+        if sort_completions:
+            insort(self._completions, (self._completion(item), key))
+        else:
+            self._completions.append((self._completion(item), key))
+
+        schedule_name = self._schedule_name(item)
+        if schedule_name is None:
+            self._unscheduled_phases[phase] += 1
+            return
+
+        self._backup_scheduled_count += 1
+        creation = item.get('metadata', {}).get('creationTimestamp') or ''
+        self._schedule_backups.setdefault(schedule_name, {})[key] = (creation, key)
+        # The latest backup of a schedule has the max creationTimestamp (uid as tie-breaker)
+        latest = self._latest.get(schedule_name)
+        if latest is None or (creation, key) > self._schedule_backups[schedule_name][latest]:
+            self._set_latest(schedule_name, key)
+
+    def _remove_backup(self, key: str):
+        item = self._backups.get(key)
+        if item is None:
+            return
+
+        phase = _phase(item)
+        self._backup_phases[phase] -= 1
+        index = bisect_left(self._completions, (self._completion(item), key))
+        if index < len(self._completions) and self._completions[index][1] == key:
+            self._completions.pop(index)
+
+        schedule_name = self._schedule_name(item)
+        if schedule_name is None:
+            self._unscheduled_phases[phase] -= 1
+        else:
+            self._backup_scheduled_count -= 1
+            backups = self._schedule_backups[schedule_name]
+            backups.pop(key, None)
+            if self._latest.get(schedule_name) == key:
+                self._set_latest(schedule_name, max(backups, key=backups.get) if backups else None)
+            if not backups:
+                del self._schedule_backups[schedule_name]
+
+        del self._backups[key]
+
+    # ------------------------------------------------------------------------------------------------
+    #             RESTORES / SCHEDULES
+    # ------------------------------------------------------------------------------------------------
+
+    def _add_restore(self, key: str, item: dict):
+        phase = _phase(item)
+        self._restore_phases[key] = phase
+        self._restore_phase_counts[phase] += 1
+
+    def _remove_restore(self, key: str):
+        if key in self._restore_phases:
+            self._restore_phase_counts[self._restore_phases.pop(key)] -= 1
+
+    def _add_schedule(self, key: str, item: dict):
+        spec = item.get('spec') or {}
+        paused = spec.get('paused') is True
+        namespaces = list((spec.get('template') or {}).get('includedNamespaces') or [])
+        self._schedules[key] = (paused, namespaces)
+        self._paused_count += paused
+        self._namespaces.update(set(namespaces))
+
+    def _remove_schedule(self, key: str):
+        if key in self._schedules:
+            paused, namespaces = self._schedules.pop(key)
+            self._paused_count -= paused
+            self._namespaces.subtract(set(namespaces))
+
+    # ------------------------------------------------------------------------------------------------
+    #             CACHE LISTENER
+    # ------------------------------------------------------------------------------------------------
+
+    def update(self, plural: str, old_item: Optional[dict], new_item: Optional[dict]):
+        """Apply a change of a single object (old_item None: added, new_item None: deleted)"""
+        if plural not in STATS_PLURALS:
+            return
+        add, remove = {
+            'backups': (self._add_backup, self._remove_backup),
+            'restores': (self._add_restore, self._remove_restore),
+            'schedules': (self._add_schedule, self._remove_schedule),
+        }[plural]
+        if old_item is not None:
+            remove(self._key(old_item))
+        if new_item is not None:
+            add(self._key(new_item), new_item)
+
+    def reset(self, plural: str, items: List[dict]):
+        """Rebuild the counters of a plural from a full LIST"""
+        if plural == 'backups':
+            self._clear_backups()
+            for item in items:
+                self._add_backup(self._key(item), item, sort_completions=False)
+            self._completions.sort()
+        elif plural == 'restores':
+            self._clear_restores()
+            for item in items:
+                self._add_restore(self._key(item), item)
+        elif plural == 'schedules':
+            self._clear_schedules()
+            for item in items:
+                self._add_schedule(self._key(item), item)
+
+    # ------------------------------------------------------------------------------------------------
+    #             READ
+    # ------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _positive(counter: Counter) -> Dict[Optional[str], int]:
+        return {phase: count for phase, count in counter.items() if count > 0}
+
+    def latest_completed(self, limit: int = 5) -> List[dict]:
+        """The backups with the most recent completionTimestamp"""
+        return [self._backups[key] for _, key in reversed(self._completions[-limit:])] if limit else []
+
+    def state(self) -> dict:
+        return {
+            'backups': {
+                'count': len(self._backups),
+                'phases': self._positive(self._backup_phases),
+                'from_schedule_count': self._backup_scheduled_count
+            },
+            'latest': {
+                'count': len(self._latest) + sum(self._unscheduled_phases.values()),
+                'phases': self._positive(self._latest_phases + self._unscheduled_phases)
+            },
+            'latest_completed': [self._key(item) for item in self.latest_completed()],
+            'restores': {
+                'count': len(self._restore_phases),
+                'phases': self._positive(self._restore_phase_counts)
+            },
+            'schedules': {
+                'count': len(self._schedules),
+                'paused': self._paused_count
+            },
+            'scheduled_namespaces': sorted(namespace for namespace, count in self._namespaces.items() if count > 0)
+        }
+
+
+def get_stats_aggregator() -> Optional[K8sStatsAggregator]:
+    """The aggregator of the watch manager, or None when the cached resources are not synced"""
+    manager = k8s_watcher_proxy.k8s_watcher_manager
+    if manager is None or not all(manager.cache.is_synced(plural) for plural in STATS_PLURALS):
+        return None
+    return manager.stats
+
+
+async def stats_drift_check(manager):
+    """Periodically rebuild the counters from the cache content and compare them with the incremental ones"""
+    while manager.watch_running:
+        await asyncio.sleep(STATS_DRIFT_CHECK_SEC)
+        if not all(manager.cache.is_synced(plural) for plural in STATS_PLURALS):
+            continue
+
+        items = {plural: manager.cache.list(plural) for plural in STATS_PLURALS}
+        expected = K8sStatsAggregator.from_items(items)
+        if expected.state() != manager.stats.state():
+            logger.warning("⚠️ Stats drift detected, counters rebuilt from the cache")
+            for plural in STATS_PLURALS:
+                manager.stats.reset(plural, items[plural])
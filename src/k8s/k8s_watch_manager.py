@@ -2,10 +2,21 @@ import asyncio
 import json
 from datetime import datetime
 
-from kubernetes_asyncio import client, config, watch
+from kubernetes_asyncio import client, watch
 from vui_common.logger.logger_proxy import logger
 from vui_common.configs.config_proxy import config_app
 
+from constants.resources import PLURALS
+from k8s.k8s_resource_cache import K8sResourceCache
+from k8s.k8s_download_request_gc import K8sDownloadRequestCollector
+from k8s.k8s_download_request_waiter import K8sDownloadRequestWaiter
+from k8s.k8s_stats_aggregator import K8sStatsAggregator, stats_drift_check
+from k8s.k8s_api_client import custom_objects_api
+from k8s.k8s_list_pager import K8sListPager
+
+# Resources whose watch events are also forwarded to the UI; the other plurals only feed the cache
+GLOBAL_WATCH_NOTIFY_PLURALS = ["backups", "restores", "serverstatusrequests", "downloadrequests", "deletebackuprequests"]
+
 
 class K8sWatchManager:
     def __init__(self, send_global_callback, send_user_callback):
@@ -13,6 +24,18 @@ class K8sWatchManager:
         self.watch_tasks = []
         self.user_watch_tasks = {}
 
+        self.cache = K8sResourceCache(PLURALS)
+        self.resync_requested = set()
+
+        # /v1/stats counters maintained by the cache events
+        self.stats = K8sStatsAggregator()
+        self.cache.add_listener(self.stats)
+
+        # Pending DownloadRequests completed by the watch events
+        self.download_requests = K8sDownloadRequestWaiter()
+        self.cache.add_listener(self.download_requests)
+        self.download_requests_gc = K8sDownloadRequestCollector()
+
         self.send_global_message = send_global_callback
         self.send_user_message = send_user_callback
 
@@ -21,12 +44,13 @@ class K8sWatchManager:
         if not self.watch_running:
             logger.watch("🟢 Starting Global Watch...")
             self.watch_running = True
-            resources = ["backups", "restores", "serverstatusrequests", "downloadrequests", "deletebackuprequests"]
 
             # Start a task for each resource and keep them in the list
             self.watch_tasks = [
                 asyncio.create_task(self.watch_velero_resource(resource, config_app.k8s.velero_namespace)) for resource
-                in resources]
+                in self.cache.plurals]
+            self.watch_tasks.append(asyncio.create_task(stats_drift_check(self)))
+            self.watch_tasks.append(asyncio.create_task(self.download_requests_gc.run(self)))
 
     async def stop_global_watch_tasks(self):
         """Stop all Global Watch."""
@@ -37,79 +61,99 @@ class K8sWatchManager:
                 task.cancel()
             self.watch_tasks.clear()
 
+    def request_resync(self, plural: str | None = None) -> list:
+        """
+        Force a relist of the cached resources: the watch of each plural drops its resourceVersion
+        and rebuilds the cache from a fresh LIST at the next reconnection.
+        """
+        plurals = [plural] if plural else self.cache.plurals
+        for item in plurals:
+            if item in self.cache.plurals:
+                self.resync_requested.add(item)
+        logger.watch(f"🔄 Resync requested for {plurals}")
+        return [item for item in plurals if item in self.resync_requested]
+
+    async def _list_velero_resource(self, plural, namespace):
+        """Fill the cache of a plural with a chunked LIST and return the resourceVersion to watch from"""
+        response = await K8sListPager(plural, namespace=namespace).list_all()
+        last_resource_version = response["metadata"]["resourceVersion"]
+        self.cache.replace(plural, response["items"], last_resource_version)
+        return last_resource_version
+
     async def watch_velero_resource(self, plural, namespace):
-        """Monitor a single Velero resource and send WebSocket notifications without blocking the loop"""
-        # Load Kubernetes configuration
-        try:
-            config.load_incluster_config()
-            # logger.info("Kubernetes in cluster mode....")
-        except config.ConfigException:
-            # Use local kubeconfig file if running locally
-            await config.load_kube_config(config_file=config_app.k8s.kube_config)
-            # logger.info("Kubernetes load local kube config...")
-
-        crd_api = client.CustomObjectsApi()
+        """
+        Keep the cache of a single Velero resource in sync (LIST + WATCH) and send WebSocket
+        notifications for the resources in GLOBAL_WATCH_NOTIFY_PLURALS without blocking the loop
+        """
+        # Shared API client (configuration is loaded once at first use)
+        crd_api = await custom_objects_api()
         w = watch.Watch()
+        last_resource_version = None
 
-        try:
-            # Get the latest version to avoid duplicate events
-            response = await crd_api.list_namespaced_custom_object(
-                group="velero.io",
-                version="v1",
-                namespace=namespace,
-                plural=plural
-            )
-            last_resource_version = response.get("metadata", {}).get("resourceVersion")
-
-            logger.watch(f"📌 Beginning monitoring of {plural} from resourceVersion: {last_resource_version}")
-
-            while self.watch_running:
-                try:
-                    async for event in w.stream(
-                            crd_api.list_namespaced_custom_object,
-                            group='velero.io',
-                            version='v1',
-                            namespace=namespace,
-                            plural=plural,
-                            resource_version=last_resource_version,
-                            timeout_seconds=10
-                    ):
-                        event_type = event["type"]
-                        resource_name = event["object"]["metadata"]["name"]
-
-                        # Update resourceVersion to avoid duplicate events
-                        last_resource_version = event["object"]["metadata"]["resourceVersion"]
-
-                        message = json.dumps({
-                            "type": "global_watch",
-                            "kind": "event",
-                            "payload": {
-                                "resources": plural,
-                                "resource": event["object"]
-                            },
-                            'timestamp': datetime.utcnow().isoformat(),
-                            'agent_name': config_app.k8s.cluster_id
-                        })
-
-                        logger.watch(f"📢 Event on {plural}: {message}")
-                        # await self.broadcast(message)
-                        await self.send_global_message(message)
-
-                except client.exceptions.ApiException as e:
-                    if e.status == 410:  # ResourceVersion troppo vecchio
-                        logger.watch(f"⚠️ ResourceVersion expired for {plural}, reset...")
-                        # return await self.watch_velero_resource(plural, namespace)  # Riavvia il watch
-                    else:
-                        logger.error(f"❌ API error in the watch of {plural}: {e}")
-                except Exception as e:
-                    logger.error(f"⚠️ General error in the watch of {plural}: {e}")
-                finally:
-                    # TODO: check why it disconnects
-                    # print(f"🔄 Reconnection to {plural} in 5 seconds...")
-                    await asyncio.sleep(5)
-
-        except Exception as e:
-            logger.error(f"⚠️ Watch startup error for {plural}: {e}")
+        while self.watch_running:
+            try:
+                if last_resource_version is None or plural in self.resync_requested:
+                    self.resync_requested.discard(plural)
+                    # Get the latest version to avoid duplicate events
+                    last_resource_version = await self._list_velero_resource(plural, namespace)
+                    logger.watch(f"📌 Beginning monitoring of {plural} from resourceVersion: {last_resource_version}")
+
+                async for event in w.stream(
+                        crd_api.list_namespaced_custom_object,
+                        group='velero.io',
+                        version='v1',
+                        namespace=namespace,
+                        plural=plural,
+                        resource_version=last_resource_version,
+                        allow_watch_bookmarks=True,
+                        timeout_seconds=10
+                ):
+                    event_type = event["type"]
+
+                    # Update resourceVersion to avoid duplicate events
+                    last_resource_version = event["object"]["metadata"]["resourceVersion"]
+                    self.cache.apply_event(plural, event_type, event["object"])
+
+                    if event_type == "BOOKMARK" or plural not in GLOBAL_WATCH_NOTIFY_PLURALS:
+                        continue
+
+                    message = json.dumps({
+                        "type": "global_watch",
+                        "kind": "event",
+                        "payload": {
+                            "resources": plural,
+                            "resource": event["object"]
+                        },
+                        'timestamp': datetime.utcnow().isoformat(),
+                        'agent_name': config_app.k8s.cluster_id
+                    })
+
+                    logger.watch(f"📢 Event on {plural}: {message}")
+                    # await self.broadcast(message)
+                    await self.send_global_message(message)
+
+            except asyncio.CancelledError:
+                raise
+            except client.exceptions.ApiException as e:
+                if e.status == 410:  # ResourceVersion troppo vecchio
+                    logger.watch(f"⚠️ ResourceVersion expired for {plural}, relist...")
+                    last_resource_version = None
+                    continue
+                if e.status == 404:
+                    logger.watch(f"ℹ️ Resource {plural} not served by the cluster, cache disabled")
+                    self.cache.set_unavailable(plural)
+                    return
+                logger.error(f"❌ API error in the watch of {plural}: {e}")
+                self.cache.invalidate(plural)
+                last_resource_version = None
+                await asyncio.sleep(5)
+            except Exception as e:
+                logger.error(f"⚠️ General error in the watch of {plural}: {e}")
+                self.cache.invalidate(plural)
+                last_resource_version = None
+                await asyncio.sleep(5)
+
+        self.cache.invalidate(plural)
 
     # User k8s watch
 
@@ -147,16 +191,8 @@ class K8sWatchManager:
             logger.watch(f"ℹ️ [{user_id}] Already watching {plural}. No action taken.")
             return
 
-        # 📌 Load Kubernetes configuration
-        try:
-            config.load_incluster_config()
-            # logger.info("Kubernetes in cluster mode....")
-        except config.ConfigException:
-            # Use local kubeconfig file if running locally
-            await config.load_kube_config(config_file=config_app.k8s.kube_config)
-            # logger.info("Kubernetes load local kube config...")
-
-        crd_api = client.CustomObjectsApi()
+        # 📌 Shared API client (configuration is loaded once at first use)
+        crd_api = await custom_objects_api()
         w = watch.Watch()
         last_resource_version = None
         watch_target = f"all resources of type {plural}"
@@ -7,12 +7,14 @@ from api.common.app_health import appAgentHealth
 from api.v1.api_v1 import v1
 
 from startup_watchers import init_watchers
+from k8s.k8s_api_client import close_api_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_watchers(app)
     yield
+    await close_api_client()
 
 
 app = create_base_app(component='agent', lifespan=lifespan)
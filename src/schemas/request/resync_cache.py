@@ -0,0 +1,6 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ResyncCacheRequestSchema(BaseModel):
+    plural: Optional[str] = Field(None, description="The plural of the resource to relist, all if omitted.")
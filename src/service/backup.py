@@ -3,8 +3,6 @@ from typing import List
 from datetime import datetime
 
 from fastapi import HTTPException
-from kubernetes import client
-
 from service.utils.download_request import create_download_request
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
@@ -17,74 +15,83 @@ from schemas.request.create_backup import CreateBackupRequestSchema
 
 from models.k8s.backup import BackupResponseSchema
 from vui_common.logger.logger_proxy import logger
-
-custom_objects = client.CustomObjectsApi()
+from k8s.k8s_api_client import custom_objects_api
+from k8s.k8s_query import K8sQuery, iter_velero_resources
+from service.utils.model_cache import ModelCache
+
+
+# Validated BackupResponseSchema reused while the resourceVersion of a backup does not change
+backup_model_cache = ModelCache(BackupResponseSchema)
+
+
+def _filter_backup(filtered_backups: dict, item: dict, now: datetime, schedule_name: str | None = None,
+                   latest_per_schedule: bool = False, in_progress: bool = False):
+    """Apply the get_backups_service filters to a single backup, adding it to `filtered_backups` if selected"""
+    metadata = item["metadata"]
+    labels = metadata.get("labels", {})
+    backup_schedule_name = labels.get("velero.io/schedule-name")
+    creation_timestamp = metadata.get("creationTimestamp")
+    status = item.get("status", {})
+    phase = status.get("phase", "").lower()
+    completion_timestamp = status.get("completionTimestamp")
+
+    # If a `schedule_name` filter is specified, it skips backups that do not match
+    if schedule_name and backup_schedule_name != schedule_name:
+        return
+
+    if in_progress:
+        has_completion_timestamp = completion_timestamp is not None
+        diff_in_seconds = None
+
+        if has_completion_timestamp:
+            datetime_completion_timestamp = datetime.strptime(completion_timestamp, '%Y-%m-%dT%H:%M:%SZ')
+            diff_in_seconds = (now - datetime_completion_timestamp).total_seconds()
+
+        if not (
+                phase.endswith("ing") or
+                phase == "inprogress" or
+                (has_completion_timestamp and diff_in_seconds is not None and diff_in_seconds < 180)
+        ):
+            return
+
+    # If `latest_per_schedule` is enabled, it saves only the last backup for each schedule
+    if latest_per_schedule and backup_schedule_name:
+        if backup_schedule_name in filtered_backups:
+            existing_timestamp = filtered_backups[backup_schedule_name]["metadata"]["creationTimestamp"]
+            if creation_timestamp > existing_timestamp:
+                filtered_backups[backup_schedule_name] = item
+        else:
+            filtered_backups[backup_schedule_name] = item
+    else:
+        # If `latest_per_schedule` is disabled, add all backups
+        filtered_backups[metadata["uid"]] = item
 
 
 # @trace_k8s_async_method(description="Get backups list")
 async def get_backups_service(schedule_name: str | None = None, latest_per_schedule: bool = False,
                               in_progress: bool = False) -> List[BackupResponseSchema]:
     """Retrieve all Velero backups"""
-    backups = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP].plural
-    )
-
     filtered_backups = {}
     now = datetime.utcnow()
+    filters = dict(schedule_name=schedule_name, latest_per_schedule=latest_per_schedule, in_progress=in_progress)
 
-    for item in backups.get("items", []):
-        metadata = item["metadata"]
-        labels = metadata.get("labels", {})
-        backup_schedule_name = labels.get("velero.io/schedule-name")
-        creation_timestamp = metadata.get("creationTimestamp")
-        status = item.get("status", {})
-        phase = status.get("phase", "").lower()
-        completion_timestamp = status.get("completionTimestamp")
-
-        # If a `schedule_name` filter is specified, it skips backups that do not match
-        if schedule_name and backup_schedule_name != schedule_name:
-            continue
-
-        if in_progress:
-            has_completion_timestamp = completion_timestamp is not None
-            diff_in_seconds = None
-
-            if has_completion_timestamp:
-                datetime_completion_timestamp = datetime.strptime(completion_timestamp, '%Y-%m-%dT%H:%M:%SZ')
-                diff_in_seconds = (now - datetime_completion_timestamp).total_seconds()
-
-            if not (
-                    phase.endswith("ing") or
-                    phase == "inprogress" or
-                    (has_completion_timestamp and diff_in_seconds is not None and diff_in_seconds < 180)
-            ):
-                continue
-
-        # If `latest_per_schedule` is enabled, it saves only the last backup for each schedule
-        if latest_per_schedule and backup_schedule_name:
-            if backup_schedule_name in filtered_backups:
-                existing_timestamp = filtered_backups[backup_schedule_name]["metadata"]["creationTimestamp"]
-                if creation_timestamp > existing_timestamp:
-                    filtered_backups[backup_schedule_name] = item
-            else:
-                filtered_backups[backup_schedule_name] = item
-        else:
-            # If `latest_per_schedule` is disabled, add all backups
-            filtered_backups[metadata["uid"]] = item
+    # The schedule filter is pushed to the API server as label selector, the others are applied page by page
+    # so only the selected backups are kept in memory
+    query = K8sQuery(labels={'velero.io/schedule-name': schedule_name})
+    async for item in iter_velero_resources(RESOURCES[ResourcesNames.BACKUP].plural, query):
+        _filter_backup(filtered_backups, item, now, **filters)
 
     # Let's build the backup list
-    backup_list = [BackupResponseSchema(**item) for item in filtered_backups.values()]
+    backup_list = backup_model_cache.validate(list(filtered_backups.values()))
     return backup_list
 
 
 @trace_k8s_async_method(description="Get backup details")
 async def get_backup_details_service(backup_name: str) -> BackupResponseSchema:
     """Retrieve details of a single backup"""
+    custom_objects = await custom_objects_api()
 
-    backup = custom_objects.get_namespaced_custom_object(
+    backup = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -92,12 +99,13 @@ async def get_backup_details_service(backup_name: str) -> BackupResponseSchema:
         name=backup_name
     )
 
-    return BackupResponseSchema(**backup)
+    return backup_model_cache.validate_one(backup)
 
 
 @trace_k8s_async_method(description="Delete backup")
 async def delete_backup_service(backup_name: str):
     """Delete a Velero backup using DeleteBackupRequest"""
+    custom_objects = await custom_objects_api()
 
     # Create a DeleteBackupRequest
     delete_request_body = {
@@ -112,7 +120,7 @@ async def delete_backup_service(backup_name: str):
         }
     }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -126,6 +134,7 @@ async def delete_backup_service(backup_name: str):
 @trace_k8s_async_method(description="Create backup")
 async def create_backup_service(backup_data: CreateBackupRequestSchema):
     """Create a Velero backup on Kubernetes"""
+    custom_objects = await custom_objects_api()
     spec = backup_data.model_dump(exclude_unset=True)
     spec.pop("name", None)
     spec.pop("namespace", None)
@@ -154,7 +163,7 @@ async def create_backup_service(backup_data: CreateBackupRequestSchema):
     if backup_data.resourcePolicy:
         backup_body['spec']["resourcePolicy"] = {'kind': 'configmap', 'name': backup_data.resourcePolicy}
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=backup_data.namespace,
@@ -167,8 +176,9 @@ async def create_backup_service(backup_data: CreateBackupRequestSchema):
 
 async def _get_schedule(schedule_name: str):
     """Retrieve Velero scheduling details"""
+    custom_objects = await custom_objects_api()
 
-    return custom_objects.get_namespaced_custom_object(
+    return await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -179,6 +189,7 @@ async def _get_schedule(schedule_name: str):
 @trace_k8s_async_method(description="Create backup from schedule name")
 async def create_backup_from_schedule_service(schedule_name: str):
     """Create a backup based on a Velero schedule"""
+    custom_objects = await custom_objects_api()
     namespace = config_app.k8s.velero_namespace
 
     # Retrieve scheduling details
@@ -236,7 +247,7 @@ async def create_backup_from_schedule_service(schedule_name: str):
         backup_body["spec"]["resourcePolicy"] = {"name": resource_policy.get("name")}
 
     # Create the backup using the Kubernetes API
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=namespace,
@@ -249,8 +260,10 @@ async def create_backup_from_schedule_service(schedule_name: str):
 
 @trace_k8s_async_method(description="Update backup expiration")
 async def update_backup_expiration_service(backup_name: str, expiration: str):
+    custom_objects = await custom_objects_api()
+
     # get backup object
-    backup = custom_objects.get_namespaced_custom_object(
+    backup = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -261,7 +274,7 @@ async def update_backup_expiration_service(backup_name: str, expiration: str):
     backup['status']['expiration'] = expiration
 
     # update ttl field
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -1,5 +1,6 @@
 import os
 import json
+import shutil
 from typing import List, Dict
 
 from fastapi import HTTPException
@@ -24,12 +25,16 @@ async def get_backup_storage_classes_service(backup_name: str) -> VeleroStorageC
         raise HTTPException(status_code=400, detail=f"Create a DownloadRequest to retrieve backup data")
 
     # Download and extract the file containing the Kubernetes manifest
-    extracted_path = await download_and_extract_backup(download_url)
+    extracted_path = await download_and_extract_backup(download_url,
+                                                        members=['resources/persistentvolumeclaims/*'])
     if not extracted_path:
         raise HTTPException(status_code=400, detail=f"Error while extracting backup '{backup_name}'")
 
     # Extracting StorageClasses from PVCs
-    storage_classes = await _extract_storage_classes_from_pvc_service(extracted_path)
+    try:
+        storage_classes = await _extract_storage_classes_from_pvc_service(extracted_path)
+    finally:
+        shutil.rmtree(extracted_path, ignore_errors=True)
 
     # Cleaning the DownloadRequest after use
     # cleanup_download_request(backup_name)
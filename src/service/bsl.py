@@ -4,27 +4,32 @@ from service.location_credentials import get_credential_service, get_default_cre
 
 from schemas.request.create_bsl import CreateBslRequestSchema
 
-from kubernetes import client
-
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_resource_cache import get_cached_items
 
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_api_client import custom_objects_api
+from service.utils.model_cache import ModelCache
 
-custom_objects = client.CustomObjectsApi()
+bsl_model_cache = ModelCache(BackupStorageLocationResponseSchema)
 
 
 @trace_k8s_async_method(description="Gets bsls service")
 async def get_bsls_service():
-    bsls = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural
-    )
-
-    bsl_list = [BackupStorageLocationResponseSchema(**item) for item in bsls.get("items", [])]
+    items = get_cached_items(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural)
+    if items is None:
+        custom_objects = await custom_objects_api()
+        bsls = await custom_objects.list_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural
+        )
+        items = bsls.get("items", [])
+
+    bsl_list = bsl_model_cache.validate(items)
     return bsl_list
 
 
@@ -33,8 +38,9 @@ async def get_bsl_service(name: str):
     """
     Retrieve an existing Backup Storage Location.
     """
+    custom_objects = await custom_objects_api()
 
-    bsl = custom_objects.get_namespaced_custom_object(
+    bsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -66,6 +72,7 @@ async def create_bsl_service(bsl_data: CreateBslRequestSchema):
     """
     Create a Backup Storage Location (BSL) in Kubernetes
     """
+    custom_objects = await custom_objects_api()
 
     # Creating the body of the request
     bsl_body = {
@@ -107,7 +114,7 @@ async def create_bsl_service(bsl_data: CreateBslRequestSchema):
             "key": bsl_data.credentialKey
         }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -124,7 +131,8 @@ async def create_bsl_service(bsl_data: CreateBslRequestSchema):
 @trace_k8s_async_method(description="Delete bsl")
 async def delete_bsl_service(bsl_name: str):
     """Delete a Velero BSL"""
-    response = custom_objects.delete_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -137,7 +145,8 @@ async def delete_bsl_service(bsl_name: str):
 @trace_k8s_async_method(description="Set default bsl")
 async def set_default_bsl_service(bsl_name: str):
     # Recupera tutti i BSL esistenti per trovare quello attualmente predefinito
-    bsl_list = custom_objects.list_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    bsl_list = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -162,7 +171,7 @@ async def set_default_bsl_service(bsl_name: str):
         }
     }
 
-    response = custom_objects.patch_namespaced_custom_object(
+    response = await custom_objects.patch_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -176,13 +185,14 @@ async def set_default_bsl_service(bsl_name: str):
 @trace_k8s_async_method(description="Remove default bsl")
 async def remove_default_bsl_service(bsl_name: str):
     # Patch per rimuovere il default
+    custom_objects = await custom_objects_api()
     patch_body = {
         "spec": {
             "default": False
         }
     }
 
-    response = custom_objects.patch_namespaced_custom_object(
+    response = await custom_objects.patch_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -198,8 +208,9 @@ async def update_bsl_service(bsl_data: UpdateBslRequestSchema):
     """
     Update a Backup Storage Location (BSL) in Kubernetes
     """
+    custom_objects = await custom_objects_api()
 
-    existing_bsl = custom_objects.get_namespaced_custom_object(
+    existing_bsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -247,7 +258,7 @@ async def update_bsl_service(bsl_data: UpdateBslRequestSchema):
         if "spec" in existing_bsl and isinstance(existing_bsl["spec"], dict) and 'credential' in existing_bsl["spec"]:
             existing_bsl['spec'].pop("credential")
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -0,0 +1,46 @@
+from fastapi import HTTPException
+
+from constants.resources import PLURALS
+from k8s import k8s_watcher_proxy
+from service.backup import backup_model_cache
+from service.bsl import bsl_model_cache
+from service.repo import repo_model_cache
+from service.restore import restore_model_cache
+from service.schedule import schedule_model_cache
+from service.vsl import vsl_model_cache
+from service.utils.download_request import download_url_cache
+from service.utils.log_cache import log_content_cache
+from service.utils.log_index import log_index_cache
+
+
+async def get_cache_status_service():
+    """Readiness of the watch-fed cache of the Velero resources"""
+    manager = k8s_watcher_proxy.k8s_watcher_manager
+    status = manager.cache.status() if manager is not None else {'ready': False, 'resources': {}}
+    status['models'] = {
+        'backups': backup_model_cache.info(),
+        'restores': restore_model_cache.info(),
+        'schedules': schedule_model_cache.info(),
+        'backup_storage_locations': bsl_model_cache.info(),
+        'volume_snapshot_locations': vsl_model_cache.info(),
+        'backup_repositories': repo_model_cache.info()
+    }
+    status['download_requests'] = {
+        'urls': download_url_cache.info(),
+        'collector': manager.download_requests_gc.info() if manager is not None else None
+    }
+    status['log_indexes'] = log_index_cache.info()
+    status['log_files'] = log_content_cache.info()
+    return status
+
+
+async def resync_cache_service(plural: str | None = None):
+    """Force a relist of the cached Velero resources (all of them if no plural is given)"""
+    if plural and plural not in PLURALS:
+        raise HTTPException(status_code=400, detail=f"Unsupported resource type: {plural}")
+
+    manager = k8s_watcher_proxy.k8s_watcher_manager
+    if manager is None:
+        raise HTTPException(status_code=400, detail="Watch manager not running")
+
+    return {'resync': manager.request_resync(plural)}
@@ -0,0 +1,181 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from fastapi import HTTPException
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_query import list_velero_resources
+from service.schedule_heatmap import MINUTES_PER_WEEK
+from vui_common.utils.k8s_tracer import trace_k8s_async_method
+
+# Default width of the analyzed range when no start is given
+CONCURRENCY_DEFAULT_DAYS = 7
+
+KINDS = ('backups', 'restores')
+
+
+def parse_time(value: str | None, name: str) -> datetime | None:
+    """ISO 8601 timestamp (Kubernetes 'Z' suffix accepted) as naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp: {value}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _run_intervals(items, kind, now):
+    """
+    (start, end, kind, name) of every run with a startTimestamp; runs without completionTimestamp
+    are considered still running at `now`
+    """
+    intervals = []
+    for item in items:
+        status = item.get('status') or {}
+        start = parse_time(status.get('startTimestamp'), 'startTimestamp')
+        if start is None:
+            continue
+        end = parse_time(status.get('completionTimestamp'), 'completionTimestamp') or now
+        if end > start:
+            intervals.append((start, end, kind, item.get('metadata', {}).get('name', '')))
+    return intervals
+
+
+def _endpoints(intervals, range_start, range_end):
+    """
+    Endpoints of the run intervals clipped to [range_start, range_end), sorted once by time with the ends
+    before the starts at the same instant (the intervals are half-open)
+    """
+    endpoints = []
+    for start, end, kind, name in intervals:
+        start, end = max(start, range_start), min(end, range_end)
+        if start < end:
+            endpoints.append((start, 1, kind, name))
+            endpoints.append((end, 0, kind, name))
+    endpoints.sort(key=lambda endpoint: (endpoint[0], endpoint[1]))
+    return endpoints
+
+
+def _sweep(endpoints, range_start, range_end):
+    """
+    Sweep-line over the sorted endpoints: yields the constant segments (start, end, counters by kind,
+    runs in progress) covering the range. The counters are a copy, the runs in progress the live
+    {(kind, name): count} of the sweep, to be copied only when needed.
+    """
+    counters = dict.fromkeys(KINDS, 0)
+    active = {}
+    position = range_start
+    for time, is_start, kind, name in [*endpoints, (range_end, 0, None, None)]:
+        if time > position:
+            yield position, time, dict(counters), active
+            position = time
+        if kind is None:
+            continue
+        key = (kind, name)
+        if is_start:
+            counters[kind] += 1
+            active[key] = active.get(key, 0) + 1
+        else:
+            counters[kind] -= 1
+            active[key] -= 1
+            if not active[key]:
+                del active[key]
+
+
+def _peak_windows(endpoints, range_start, range_end, peak):
+    """Maximal windows at the peak concurrency, with the runs in progress"""
+    windows = []
+    if peak == 0:
+        return windows
+
+    for start, end, counters, active in _sweep(endpoints, range_start, range_end):
+        if sum(counters.values()) != peak:
+            continue
+        runs = [{'kind': kind, 'name': name} for kind, name in sorted(active)]
+        if windows and windows[-1]['end'] == start and windows[-1]['runs'] == runs:
+            windows[-1]['end'] = end
+            continue
+        windows.append({'start': start, 'end': end, **counters, 'running': peak, 'runs': runs})
+
+    for window in windows:
+        window['start'] = window['start'].isoformat()
+        window['end'] = window['end'].isoformat()
+    return windows
+
+
+def _minute_of_week(time: datetime) -> int:
+    # weekday 0 for Sunday, 1 for Monday, ..., 6 for Saturday as in the schedules heatmap
+    return ((time.weekday() + 1) % 7) * 1440 + time.hour * 60 + time.minute
+
+
+def _week_matrix(segments):
+    """
+    7 days x 24 hours x 60 minutes matrix with the max number of concurrent runs observed in each
+    minute of the week (ranges longer than a week are folded on it). Every segment costs one
+    vectorized update, split in two when it wraps around the end of the week.
+    """
+    cells = np.zeros(MINUTES_PER_WEEK, dtype=np.int64)
+    for start, end, counters in segments:
+        running = sum(counters.values())
+        if running == 0:
+            continue
+        first = _minute_of_week(start)
+        # minutes touched by the segment, the last one included when partially covered
+        length = math.ceil((end - start.replace(second=0, microsecond=0)).total_seconds() / 60)
+        if length >= MINUTES_PER_WEEK:
+            np.maximum(cells, running, out=cells)
+            continue
+        last = first + length
+        head = cells[first:min(last, MINUTES_PER_WEEK)]
+        np.maximum(head, running, out=head)
+        if last > MINUTES_PER_WEEK:
+            tail = cells[:last - MINUTES_PER_WEEK]
+            np.maximum(tail, running, out=tail)
+
+    matrix = cells.reshape(7, 24, 60).tolist()
+    return {day: matrix[day] for day in range(7)}
+
+
+@trace_k8s_async_method(description="Get backups and restores concurrency")
+async def get_concurrency_service(start: str | None = None, end: str | None = None):
+    """
+    Actual concurrency of the backups and restores over [start, end) (default: the last week),
+    computed from the start/completion timestamps of the Velero objects.
+    """
+    now = datetime.utcnow().replace(microsecond=0)
+    range_end = parse_time(end, 'end') or now
+    range_start = parse_time(start, 'start') or range_end - timedelta(days=CONCURRENCY_DEFAULT_DAYS)
+    if range_start >= range_end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    intervals = []
+    for kind, resource in zip(KINDS, (ResourcesNames.BACKUP, ResourcesNames.RESTORE)):
+        items = await list_velero_resources(RESOURCES[resource].plural)
+        intervals += _run_intervals(items, kind, now)
+
+    # The endpoints are sorted once, so the cost is O(n log n) whatever the duration of the runs
+    endpoints = _endpoints(intervals, range_start, range_end)
+    segments = [segment[:3] for segment in _sweep(endpoints, range_start, range_end)]
+    peak = max((sum(counters.values()) for _, _, counters in segments), default=0)
+
+    # concurrency curve: the counters at every change
+    timeline = []
+    for segment_start, _, counters in segments:
+        if not timeline or any(timeline[-1][kind] != counters[kind] for kind in KINDS):
+            timeline.append({'time': segment_start.isoformat(), **counters, 'running': sum(counters.values())})
+
+    return {
+        'start': range_start.isoformat(),
+        'end': range_end.isoformat(),
+        'runs': {kind: sum(1 for run_start, run_end, run_kind, _ in intervals
+                           if run_kind == kind and run_start < range_end and run_end > range_start)
+                 for kind in KINDS},
+        'peak': peak,
+        'peak_windows': _peak_windows(endpoints, range_start, range_end, peak),
+        'timeline': timeline,
+        'week_heatmap': _week_matrix(segments)
+    }
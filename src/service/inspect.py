@@ -1,10 +1,48 @@
+import asyncio
 import json
 import os
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
 
-# from fastapi import HTTPException
+from fastapi import HTTPException
 
+from vui_common.configs.config_proxy import config_app
 from vui_common.logger.logger_proxy import logger
 
+from service.utils.inspect_workspace import inspect_workspace
+from service.utils.blob_store import BlobManifest, get_blob_manifest, is_manifest
+from service.utils.tar_index import TarIndex, get_tar_index, is_archive
+
+INSPECT_TREE_MAX_DEPTH = 5
+INSPECT_TREE_MAX_LIMIT = 1000
+
+# Summaries of the inspected backups kept in memory
+_SUMMARY_CACHE_SIZE = 64
+_summaries: OrderedDict = OrderedDict()
+
+
+def _packed_index(directory: str) -> Optional[Union[TarIndex, BlobManifest]]:
+    """Index of a backup inspected in 'archive' or 'dedupe' mode, None for an extracted backup"""
+    if is_archive(directory):
+        return get_tar_index(directory)
+    if is_manifest(directory):
+        return get_blob_manifest(directory)
+    return None
+
+
+def _packed_member(file_path: str) -> Optional[Tuple[Union[TarIndex, BlobManifest], str]]:
+    """(index, member name) of a path inside a backup of the inspect folder not extracted, None otherwise"""
+    file_path = os.path.abspath(file_path)
+    root = os.path.abspath(config_app.app.inspect_folder)
+    directory = os.path.dirname(file_path)
+    while directory.startswith(root) and directory != root:
+        index = _packed_index(directory)
+        if index is not None:
+            return index, os.path.relpath(file_path, directory).replace("\\", "/")
+        directory = os.path.dirname(directory)
+    return None
+
 
 async def get_folders_list(directory: str):
     """
@@ -14,8 +52,9 @@ async def get_folders_list(directory: str):
     :return: List of folders in the directory
     """
     try:
-        # Get the list of directories in the given path
-        return [{'name': f} for f in os.listdir(directory) if os.path.isdir(os.path.join(directory, f))]
+        # Get the list of directories in the given path (the hidden ones are the blob store)
+        return [{'name': f} for f in os.listdir(directory)
+                if not f.startswith('.') and os.path.isdir(os.path.join(directory, f))]
     except FileNotFoundError:
         # Handle the case where the directory does not exist
         logger.error(f"Error: The directory '{directory}' does not exist.")
@@ -59,7 +98,14 @@ async def read_json_file(file_path: str):
     :param file_path: Path to the JSON file
     :return: Parsed JSON data or None if an error occurs
     """
+    inspect_workspace.touch_path(file_path)
     try:
+        if not os.path.exists(file_path):
+            # member of a backup inspected in archive or dedupe mode, read without extraction
+            packed = _packed_member(file_path)
+            if packed is not None and packed[1] in packed[0]:
+                index, name = packed
+                return json.loads(index.read(name))
         with open(file_path, 'r', encoding='utf-8') as file:
             return json.load(file)
     except FileNotFoundError:
@@ -79,19 +125,196 @@ async def get_recursive_directory_contents(directory: str):
     :return: List of dictionaries formatted as required
     """
 
-    def build_tree(root_path):
+    def build_tree(root_path, parent):
         tree = []
         try:
-            for item in os.listdir(root_path):
-                item_path = os.path.join(root_path, item)
-                relative_path = os.path.relpath(item_path, directory).replace("\\", "/")
+            with os.scandir(root_path) as entries:
+                for entry in entries:
+                    relative_path = f"{parent}/{entry.name}" if parent else entry.name
 
-                if os.path.isdir(item_path):
-                    tree.append({"value": relative_path, "label": item, "children": build_tree(item_path)})
-                else:
-                    tree.append({"value": relative_path, "label": item})
+                    # the type comes from the directory entry, no stat per item
+                    if entry.is_dir(follow_symlinks=False):
+                        tree.append({"value": relative_path, "label": entry.name,
+                                     "children": build_tree(entry.path, relative_path)})
+                    else:
+                        tree.append({"value": relative_path, "label": entry.name})
         except PermissionError:
             print(f"Error: Permission denied to access '{root_path}'.")
         return tree
 
-    return build_tree(directory)
+    def build_archive_tree(node: dict, parent: str):
+        tree = []
+        for item, children in node.items():
+            relative_path = f"{parent}/{item}" if parent else item
+            if children is not None:
+                tree.append({"value": relative_path, "label": item,
+                             "children": build_archive_tree(children, relative_path)})
+            else:
+                tree.append({"value": relative_path, "label": item})
+        return tree
+
+    inspect_workspace.touch_path(directory)
+    index = _packed_index(directory)
+    if index is not None:
+        return build_archive_tree(index.tree(), '')
+    return build_tree(directory, '')
+
+
+def _relative_path(path: Optional[str]) -> str:
+    """Normalized path relative to the backup folder, refused if it leaves it"""
+    normalized = os.path.normpath(path or '.').replace("\\", "/").strip('/')
+    if normalized == '..' or normalized.startswith('../') or (path or '').startswith('/'):
+        raise HTTPException(status_code=400, detail=f"Invalid path: {path}")
+    return '' if normalized == '.' else normalized
+
+
+def backup_directory(backup: str) -> str:
+    """Folder of an inspected backup, refused if `backup` is not a single (not hidden) folder name"""
+    name = _relative_path(backup)
+    if not name or '/' in name or name.startswith('.'):
+        raise HTTPException(status_code=400, detail=f"Invalid backup: {backup}")
+    return os.path.join(config_app.app.inspect_folder, name)
+
+
+def _level(directory: str, archive_tree: Optional[dict], path: str) -> List[Tuple[str, bool]]:
+    """(name, is folder) of the entries of a folder of the backup, sorted by name"""
+    if archive_tree is not None:
+        node = archive_tree
+        for part in path.split('/') if path else []:
+            node = node.get(part) if node is not None else None
+            if node is None:
+                raise HTTPException(status_code=404, detail=f"Folder '{path}' not found")
+        return sorted((name, children is not None) for name, children in node.items())
+
+    try:
+        with os.scandir(os.path.join(directory, path)) as entries:
+            return sorted((entry.name, entry.is_dir(follow_symlinks=False)) for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail=f"Folder '{path}' not found")
+
+
+def _count(directory: str, archive_tree: Optional[dict], path: str) -> int:
+    if archive_tree is not None:
+        return len(_level(directory, archive_tree, path))
+    try:
+        with os.scandir(os.path.join(directory, path)) as entries:
+            return sum(1 for _ in entries)
+    except OSError:
+        return 0
+
+
+def _page(directory: str, archive_tree: Optional[dict], path: str, depth: int, cursor: Optional[str],
+          limit: int) -> dict:
+    entries = _level(directory, archive_tree, path)
+    start = bisect_right([name for name, _ in entries], cursor) if cursor else 0
+    page = entries[start:start + limit]
+
+    children = []
+    for name, folder in page:
+        relative_path = f"{path}/{name}" if path else name
+        item = {"value": relative_path, "label": name, "folder": folder}
+        if folder and depth > 1:
+            item.update(_page(directory, archive_tree, relative_path, depth - 1, None, limit))
+        elif folder:
+            item["children_count"] = _count(directory, archive_tree, relative_path)
+        children.append(item)
+
+    next_cursor = page[-1][0] if start + limit < len(entries) else None
+    return {"children": children, "children_count": len(entries), "next_cursor": next_cursor}
+
+
+async def get_directory_page(directory: str, path: Optional[str] = None, depth: int = 1,
+                             cursor: Optional[str] = None, limit: int = 200):
+    """
+    One page of the entries of a folder of an inspected backup, expanded on `depth` levels: the entries are
+    sorted by name, `cursor` is the `next_cursor` of the previous page. Folders report their number of
+    children, so a tree view can be expanded lazily.
+
+    :param directory: Path of the inspected backup
+    :param path: Folder relative to the backup, the backup root if empty
+    :return: Dictionary with 'path', 'children', 'children_count' and 'next_cursor'
+    """
+    if not 1 <= depth <= INSPECT_TREE_MAX_DEPTH:
+        raise HTTPException(status_code=400, detail=f"depth must be between 1 and {INSPECT_TREE_MAX_DEPTH}")
+    if not 1 <= limit <= INSPECT_TREE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {INSPECT_TREE_MAX_LIMIT}")
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail=f"Backup '{os.path.basename(directory)}' not found")
+
+    inspect_workspace.touch_path(directory)
+    path = _relative_path(path)
+    index = _packed_index(directory)
+    archive_tree = index.tree() if index is not None else None
+    page = await asyncio.to_thread(_page, directory, archive_tree, path, depth, cursor, limit)
+    return {"path": path, **page}
+
+
+def _summary(directory: str) -> dict:
+    summary = {"folders": 0, "files": 0, "bytes": 0, "resources": {}}
+
+    def add_file(relative_path: str, size: int):
+        summary["files"] += 1
+        summary["bytes"] += size
+        parts = relative_path.split('/')
+        if len(parts) > 2 and parts[0] == 'resources':
+            summary["resources"][parts[1]] = summary["resources"].get(parts[1], 0) + 1
+
+    index = _packed_index(directory)
+    if index is not None:
+        for name, (_, size) in index.members.items():
+            add_file(name, size)
+        stack = [index.tree()]
+        while stack:
+            for children in stack.pop().values():
+                if children is not None:
+                    summary["folders"] += 1
+                    stack.append(children)
+        return summary
+
+    stack = [('', directory)]
+    while stack:
+        parent, folder = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                relative_path = f"{parent}/{entry.name}" if parent else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    summary["folders"] += 1
+                    stack.append((relative_path, entry.path))
+                else:
+                    add_file(relative_path, entry.stat(follow_symlinks=False).st_size)
+    return summary
+
+
+async def get_directory_summary(directory: str):
+    """
+    Counters of an inspected backup (folders, files, bytes, files per resource type), computed once per
+    backup and kept in memory
+
+    :param directory: Path of the inspected backup
+    """
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail=f"Backup '{os.path.basename(directory)}' not found")
+
+    inspect_workspace.touch_path(directory)
+    summary = _summaries.get(directory)
+    if summary is not None:
+        _summaries.move_to_end(directory)
+        return summary
+
+    summary = await asyncio.to_thread(_summary, directory)
+    _summaries[directory] = summary
+    while len(_summaries) > _SUMMARY_CACHE_SIZE:
+        _summaries.popitem(last=False)
+    return summary
+
+
+def forget_directory_summary(directory: str):
+    """Drop the summary of a backup downloaded again"""
+    _summaries.pop(directory, None)
+
+
+async def get_workspace_usage():
+    """
+    Disk usage of the inspect folder: size and last access of each downloaded backup, budget and evictions
+    """
+    return await inspect_workspace.usage()
@@ -10,28 +10,55 @@ from vui_common.utils.k8s_tracer import trace_k8s_async_method
 # import shutil
 # from fastapi import HTTPException
 
+import asyncio
 import os
-import requests
 import shutil
-import tarfile
 from fastapi import HTTPException
 
+from service.inspect import forget_directory_summary
+from service.utils.inspect_workspace import inspect_workspace
+from service.utils.blob_store import blob_store
+from service.utils.tar_index import TarIndex, archive_path
+from service.utils.tar_stream import decompress_url, dedupe_url, extract_url, user_progress
+
+INSPECT_MODES = ('extract', 'archive', 'dedupe')
+
 
 @trace_k8s_async_method(description="Download backup")
-async def inspect_download_backup_service(backup_name: str) -> bool:
+async def inspect_download_backup_service(backup_name: str, mode: str = 'extract') -> bool:
+    """
+    Download the contents of a backup for the inspection: 'extract' explodes the manifests in the inspect
+    folder, 'archive' keeps them in one uncompressed tar with a member index (no small files), 'dedupe'
+    stores each manifest once in the content-addressed blob store shared by the backups
+    """
+    if mode not in INSPECT_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported inspect mode: {mode}")
     try:
         # Creation of the DownloadRequest or retrieval of the URL if already available
         backup_url = await create_download_request(backup_name, 'BackupContents')
         if not backup_url:
             raise HTTPException(status_code=408, detail=f"Unable to retrieve log download URL")
 
-        # Download and extract logs
-        await _download_and_extract_contents(backup_name, backup_url)
+        # Download and extract logs, the backup cannot be evicted meanwhile
+        async with inspect_workspace.lock(backup_name):
+            # a backup downloaded again starts from an empty folder, whatever the previous mode
+            await asyncio.to_thread(shutil.rmtree, os.path.join(config_app.app.inspect_folder, backup_name), True)
+            if mode == 'archive':
+                await _download_contents_archive(backup_name, backup_url)
+            elif mode == 'dedupe':
+                await _download_contents_dedupe(backup_name, backup_url)
+            else:
+                await _download_and_extract_contents(backup_name, backup_url)
+            await inspect_workspace.update(backup_name)
+        forget_directory_summary(os.path.join(config_app.app.inspect_folder, backup_name))
+        await inspect_workspace.enforce(keep=backup_name)
 
         # DownloadRequest cleanup to avoid buildup
         # cleanup_download_request(backup_name)
         return True
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
@@ -39,7 +66,8 @@ async def inspect_download_backup_service(backup_name: str) -> bool:
 async def _download_and_extract_contents(backup_name: str, log_url: str,
                                          extract_dir: str = config_app.app.inspect_folder) -> str:
     """
-    Scarica un file .tar.gz, lo estrae in una cartella specifica e restituisce il percorso della cartella estratta.
+    Scarica un file .tar.gz e lo estrae durante il download in una cartella specifica (senza salvare il tar.gz
+    su disco), inviando l'avanzamento via WebSocket, e restituisce il percorso della cartella estratta.
 
     :param backup_name: Nome del backup per creare una sottocartella.
     :param log_url: URL del file .tar.gz da scaricare.
@@ -49,32 +77,49 @@ async def _download_and_extract_contents(backup_name: str, log_url: str,
     try:
         # Creazione della cartella specifica per il backup
         backup_dir = os.path.join(extract_dir, backup_name)
-        os.makedirs(backup_dir, exist_ok=True)
 
-        # Percorso dove salvare il file tar.gz
-        tar_gz_path = os.path.join(backup_dir, f"{backup_name}.tar.gz")
+        # Download ed estrazione in streaming del contenuto del file .tar.gz
+        await extract_url(log_url, backup_dir, progress=user_progress('inspect_download', backup_name))
 
-        # Scaricare il file tar.gz
-        response = requests.get(log_url, stream=True)
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail=f"Download error: {response.status_code}")
+        return backup_dir
 
-        # Salvare il file tar.gz nella cartella specificata
-        with open(tar_gz_path, "wb") as file:
-            shutil.copyfileobj(response.raw, file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=408, detail=f"Request Timeout {str(e)}")
 
-        # Creazione della cartella di estrazione
-        extracted_dir = os.path.join(backup_dir, "./")
-        os.makedirs(extracted_dir, exist_ok=True)
 
-        # Estrarre il contenuto del file .tar.gz
-        with tarfile.open(tar_gz_path, "r:gz") as tar:
-            tar.extractall(path=extracted_dir)
+async def _download_contents_archive(backup_name: str, backup_url: str,
+                                     extract_dir: str = config_app.app.inspect_folder) -> str:
+    """
+    Download the backup tarball as an uncompressed tar in the backup folder and index its members,
+    the inspect endpoints read them in place (see TarIndex)
 
-        # Opzionale: rimuovere il file tar.gz dopo l'estrazione per risparmiare spazio
-        os.remove(tar_gz_path)
+    :return: Path of the backup folder
+    """
+    backup_dir = os.path.join(extract_dir, backup_name)
+    archive = archive_path(backup_dir)
+    await decompress_url(backup_url, archive, progress=user_progress('inspect_download', backup_name))
 
-        return extracted_dir
+    index = await asyncio.to_thread(TarIndex.build, archive)
+    await asyncio.to_thread(index.save)
+    return backup_dir
 
-    except Exception as e:
-        raise HTTPException(status_code=408, detail=f"Request Timeout {str(e)}")
+
+async def _download_contents_dedupe(backup_name: str, backup_url: str,
+                                    extract_dir: str = config_app.app.inspect_folder) -> str:
+    """
+    Download the backup tarball into the blob store: the manifests already stored by another backup are
+    not written again, the backup folder only gets its path -> blob manifest (see BlobManifest)
+
+    :return: Path of the backup folder
+    """
+    backup_dir = os.path.join(extract_dir, backup_name)
+    try:
+        await dedupe_url(backup_url, blob_store, backup_dir, progress=user_progress('inspect_download', backup_name))
+    except BaseException:
+        # the blobs written before the failure are referenced by no manifest
+        async with blob_store.lock:
+            await inspect_workspace.collect_blobs()
+        raise
+    return backup_dir
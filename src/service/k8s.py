@@ -1,21 +1,23 @@
 import sys
 from fastapi import HTTPException
-from kubernetes import client
-from kubernetes.client import ApiException
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client import ApiException
 from datetime import datetime
 
 from vui_common.configs.config_proxy import config_app
 from constants.resources import RESOURCES, ResourcesNames
-from constants.velero import VELERO
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 from vui_common.logger.logger_proxy import logger
+from k8s.k8s_api_client import get_api_client, core_v1_api, storage_v1_api
+from k8s.k8s_query import K8sQuery, list_velero_resources
 import re
 
 @trace_k8s_async_method(description="Get k8s namespaces")
 async def get_namespaces_service():
     # Get namespaces list
-    namespace_list = client.CoreV1Api().list_namespace()
+    core_v1 = await core_v1_api()
+    namespace_list = await core_v1.list_namespace()
     # Extract namespace list
     namespaces = [namespace.metadata.name for namespace in namespace_list.items]
     return namespaces
@@ -29,8 +31,8 @@ async def get_resources_service():
         valid_resources = []
 
         k8s_client = client
-        # Initialize the API client
-        api_client = k8s_client.ApiClient()
+        # Shared API client
+        api_client = await get_api_client()
 
         # # Retrieve the list of available API groups
         # discovery = k8s_client.ApisApi(api_client)
@@ -39,7 +41,7 @@ async def get_resources_service():
         # Retrieve the list of available API groups
         discovery = k8s_client.ApisApi(api_client)
         try:
-            api_groups = discovery.get_api_versions().groups
+            api_groups = (await discovery.get_api_versions()).groups
             logger.debug(f"Retrieved API groups with success")
         except ApiException as e:
             logger.error(f"Exception when retrieving API groups {str(e)}")
@@ -62,9 +64,9 @@ async def get_resources_service():
                     #             valid_resources.append(resource['name'])
                     # Use the Kubernetes client to get the resources
                     api_instance = k8s_client.CustomObjectsApi(api_client)
-                    api_resources = api_instance.list_cluster_custom_object(group=group.name,
-                                                                            version=version.version, plural='').get(
-                        'resources', [])
+                    api_resources = (await api_instance.list_cluster_custom_object(group=group.name,
+                                                                                   version=version.version,
+                                                                                   plural='')).get('resources', [])
 
                     for resource in api_resources:
                         if '/' not in resource['name']:  # Only include resource names, not sub-resources
@@ -78,7 +80,7 @@ async def get_resources_service():
 
         # Get core API resources
         core_api = k8s_client.CoreV1Api(api_client)
-        core_resources = core_api.get_api_resources().resources
+        core_resources = (await core_api.get_api_resources()).resources
         for resource in core_resources:
             if '/' not in resource.name:  # Only include resource names, not sub-resources
                 # valid_resources.append(resource.name)
@@ -103,7 +105,8 @@ async def get_resources_service():
 async def get_storage_classes_service():
     storage_classes = {}
 
-    storage_classes_list = client.StorageV1Api().list_storage_class()
+    storage_v1 = await storage_v1_api()
+    storage_classes_list = await storage_v1.list_storage_class()
 
     if storage_classes_list is not None:
         for sc in storage_classes_list.items:
@@ -135,25 +138,14 @@ def _to_snake_case(phrase):
 
 @trace_k8s_async_method(description="Get resource manifest")
 async def get_velero_resource_manifest_service(resource_type: str, resource_name: str, neat=False):
-    # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
-
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
-    # Group, version and plural to access Velero backups
-    group = VELERO['GROUP']
-    version = VELERO['VERSION']
+    # Plural to access Velero resources
     plural = RESOURCES[ResourcesNames[_to_snake_case(resource_type)]].plural
 
     try:
-        # API call to get backups
-        backups = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
-
-        # Filter objects by label velero.io/backup-uid
-        filtered_items = [
-            item for item in backups.get('items', [])
-            if item.get('metadata', {}).get('name') == resource_name
-        ] if resource_name else backups.get('items', [])
+        # Direct GET by name (or LIST when no name is given)
+        filtered_items = await list_velero_resources(plural, K8sQuery(name=resource_name or None), namespace)
 
         # Return only filtered objects
         manifest = filtered_items[0]
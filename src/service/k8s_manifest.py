@@ -2,11 +2,12 @@ import re
 from datetime import datetime
 
 from fastapi import HTTPException
-from kubernetes import client
-from kubernetes.client import ApiException
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client import ApiException
 
 from constants.k8s import K8S_PLURALS
 from service.k8s import _kubectl_neat
+from k8s.k8s_api_client import get_api_client, apiextensions_v1_api
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 
@@ -29,13 +30,13 @@ async def get_k8s_resource_manifest_service(kind: str,
     :return: The manifest of the resource as a dictionary.
     """
 
-    api_client = client.ApiClient()
+    api_client = await get_api_client()
 
     try:
         # CRD management (if apiVersion contains “/”)
         if "/" in api_version:
             group, version = api_version.split("/")
-            plural = _get_plural_from_crd(kind=kind, api_version=api_version)
+            plural = await _get_plural_from_crd(kind=kind, api_version=api_version)
             if not plural:
                 raise HTTPException(status_code=400,
                                     detail=f"For Custom Resources (CRD), the parameter 'plural' is mandatory")
@@ -43,14 +44,14 @@ async def get_k8s_resource_manifest_service(kind: str,
             api_instance = client.CustomObjectsApi(api_client)
 
             if is_cluster_resource:
-                response = api_instance.get_cluster_custom_object(
+                response = await api_instance.get_cluster_custom_object(
                     group=group,
                     version=version,
                     plural=plural,
                     name=name
                 )
             else:
-                response = api_instance.get_namespaced_custom_object(
+                response = await api_instance.get_namespaced_custom_object(
                     group=group,
                     version=version,
                     namespace=namespace,
@@ -61,10 +62,10 @@ async def get_k8s_resource_manifest_service(kind: str,
         else:
             kind = K8S_PLURALS[kind]
             # API Clients
-            core_api_instance = client.CoreV1Api()
-            app_api_instance = client.AppsV1Api()
-            batch_api_instance = client.BatchV1Api()
-            storage_api_instance = client.StorageV1Api()
+            core_api_instance = client.CoreV1Api(api_client)
+            app_api_instance = client.AppsV1Api(api_client)
+            batch_api_instance = client.BatchV1Api(api_client)
+            storage_api_instance = client.StorageV1Api(api_client)
 
             # Core API group (`v1`)
             core_resources = {
@@ -101,9 +102,9 @@ async def get_k8s_resource_manifest_service(kind: str,
             # Check API core (`v1`)
             if api_version == "v1":
                 if kind in core_resources:
-                    response = core_resources[kind](name=name, namespace=namespace).to_dict()
+                    response = (await core_resources[kind](name=name, namespace=namespace)).to_dict()
                 elif is_cluster_resource and kind in cluster_resources:
-                    response = cluster_resources[kind](name=name).to_dict()
+                    response = (await cluster_resources[kind](name=name)).to_dict()
                 else:
                     raise HTTPException(status_code=400,
                                         detail=f"Resource '{kind}' not found in core API group ('v1')")
@@ -111,7 +112,7 @@ async def get_k8s_resource_manifest_service(kind: str,
             # Check `apps/v1`
             elif api_version == "apps/v1":
                 if kind in apps_resources:
-                    response = apps_resources[kind](name=name, namespace=namespace).to_dict()
+                    response = (await apps_resources[kind](name=name, namespace=namespace)).to_dict()
                 else:
                     raise HTTPException(status_code=400,
                                         detail=f"Resource '{kind}' not found in 'apps/v1'")
@@ -119,7 +120,7 @@ async def get_k8s_resource_manifest_service(kind: str,
             # Check `batch/v1`
             elif api_version == "batch/v1":
                 if kind in batch_resources:
-                    response = batch_resources[kind](name=name, namespace=namespace).to_dict()
+                    response = (await batch_resources[kind](name=name, namespace=namespace)).to_dict()
                 else:
                     raise HTTPException(status_code=400,
                                         detail=f"Resource '{kind}' not found in 'batch/v1'")
@@ -156,7 +157,7 @@ def _convert_datetime(obj):
         return obj
 
 
-def _get_plural_from_crd(kind: str, api_version: str):
+async def _get_plural_from_crd(kind: str, api_version: str):
     """
     Gets the plural name of a Kubernetes resource.
     If it is a standard resource, it uses the K8S_PLURALS dictionary.
@@ -170,11 +171,10 @@ def _get_plural_from_crd(kind: str, api_version: str):
     if kind in K8S_PLURALS:
         return K8S_PLURALS[kind]
 
-    api_client = client.ApiClient()
-    crd_api = client.ApiextensionsV1Api(api_client)
+    crd_api = await apiextensions_v1_api()
 
     group, version = api_version.split("/")
-    crds = crd_api.list_custom_resource_definition()
+    crds = await crd_api.list_custom_resource_definition()
 
     for crd in crds.items:
         # print(kind, crd.spec.group, crd.spec.names.kind.lower(), crd.spec.names.plural )
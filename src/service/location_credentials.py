@@ -3,20 +3,21 @@ import configparser
 import os
 
 from fastapi import HTTPException
-from kubernetes import client
+from kubernetes_asyncio import client
 
 from vui_common.configs.config_proxy import config_app
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_api_client import core_v1_api
 
 
 @trace_k8s_async_method(description="get s3 credential")
 async def get_credential_service(secret_name, secret_key):
-    api_instance = client.CoreV1Api()
+    api_instance = await core_v1_api()
 
     # LS 2024.20.22 use env variable
     # secret = api_instance.read_namespaced_secret(name=secret_name, namespace='velero')
-    secret = api_instance.read_namespaced_secret(name=secret_name,
-                                                 namespace=os.getenv('K8S_VELERO_NAMESPACE', 'velero'))
+    secret = await api_instance.read_namespaced_secret(name=secret_name,
+                                                       namespace=os.getenv('K8S_VELERO_NAMESPACE', 'velero'))
     if secret.data and secret_key in secret.data:
         value = secret.data[secret_key]
         decoded_value = base64.b64decode(value)
@@ -29,10 +30,10 @@ async def get_credential_service(secret_name, secret_key):
 @trace_k8s_async_method(description="get default s3 credential")
 async def get_default_credential_service():
     label_selector = 'app.kubernetes.io/name=velero'
-    api_instance = client.CoreV1Api()
+    api_instance = await core_v1_api()
 
-    secret = api_instance.list_namespaced_secret(namespace=os.getenv('K8S_VELERO_NAMESPACE', 'velero'),
-                                                 label_selector=label_selector)
+    secret = await api_instance.list_namespaced_secret(namespace=os.getenv('K8S_VELERO_NAMESPACE', 'velero'),
+                                                       label_selector=label_selector)
 
     if secret.items[0].data:
         value = secret.items[0].data['cloud']
@@ -63,11 +64,11 @@ aws_secret_access_key={aws_secret_access_key}
                              data={f"""{secret_key}""": credentials_base64}, type="Opaque")
 
     # API client 4 Secrets
-    api_instance = client.CoreV1Api()
+    api_instance = await core_v1_api()
 
     try:
         # Create Secret
-        api_instance.create_namespaced_secret(namespace=namespace, body=secret)
+        await api_instance.create_namespaced_secret(namespace=namespace, body=secret)
         print(f"Secret '{secret_name}' create in '{namespace}' namespace.")
         return True
 
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Deque, List, Optional
+
+from fastapi import HTTPException
+from vui_common.logger.logger_proxy import logger
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_query import K8sQuery, list_velero_resources
+from service.concurrency import parse_time
+from service.logs import LOG_FINAL_PHASES, log_lines
+from service.utils.log_stream import LogQuery
+
+# Logs downloaded and scanned at the same time by a search
+LOG_SEARCH_WORKERS = int(os.getenv('LOG_SEARCH_WORKERS', 8))
+LOG_SEARCH_MAX_BACKUPS = int(os.getenv('LOG_SEARCH_MAX_BACKUPS', 500))
+LOG_SEARCH_DEFAULT_DAYS = 30
+
+# Matches buffered between the workers and the response: a slow client pauses the scans
+_RESULTS_BUFFER = 1000
+
+
+def _backup_time(item: dict) -> Optional[datetime]:
+    value = (item.get('status') or {}).get('startTimestamp') or item.get('metadata', {}).get('creationTimestamp')
+    return parse_time(value, 'backup') if value else None
+
+
+def _select_backups(items: List[dict], start: datetime, end: datetime, last: int) -> List[dict]:
+    """The `last` most recent backups started in [start, end)"""
+    selected = []
+    for item in items:
+        started = _backup_time(item)
+        if started is not None and start <= started < end:
+            selected.append((started, item))
+    selected.sort(key=lambda pair: pair[0], reverse=True)
+    return [item for _, item in selected[:last]]
+
+
+class _LogSearch:
+    """
+    Scan of the logs of a list of backups by a pool of workers: each worker takes the next backup, streams
+    its log (from the log cache when available) and pushes the matches to a bounded queue read by the
+    response. Closing the response cancels the workers, which stops their downloads.
+    """
+
+    def __init__(self, backups: List[dict], query: LogQuery, workers: int = LOG_SEARCH_WORKERS):
+        self.query = query
+        self.workers = max(1, min(workers, len(backups)))
+        self._backups: Deque[dict] = deque(backups)
+        self._results: asyncio.Queue = asyncio.Queue(maxsize=_RESULTS_BUFFER)
+        self.searched = 0
+        self.matched = 0
+        self.matches = 0
+        self.truncated: List[str] = []
+        self.errors: List[dict] = []
+
+    async def _search_backup(self, item: dict):
+        name = item['metadata']['name']
+        uid = item['metadata'].get('uid')
+        records = self.query.apply(await log_lines(name, 'backup', uid))
+        count = 0
+        try:
+            async for number, line in records:
+                await self._results.put({'backup': name, 'line': number, 'log': line})
+                count += 1
+        finally:
+            await records.aclose()
+
+        self.searched += 1
+        if count:
+            self.matched += 1
+            self.matches += count
+        if self.query.limit is not None and count >= self.query.limit:
+            self.truncated.append(name)
+
+    async def _worker(self):
+        while self._backups:
+            item = self._backups.popleft()
+            try:
+                await self._search_backup(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.warning(f"Log search: log of backup '{item['metadata']['name']}' not scanned: {detail}")
+                self.errors.append({'backup': item['metadata']['name'], 'error': detail})
+        await self._results.put(None)
+
+    async def run(self) -> AsyncIterator[dict]:
+        """The matches as they are found"""
+        tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        running = len(tasks)
+        try:
+            while running:
+                record = await self._results.get()
+                if record is None:
+                    running -= 1
+                    continue
+                yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _ndjson(search: _LogSearch, summary: dict) -> AsyncIterator[bytes]:
+    started = time.monotonic()
+    records = search.run()
+    try:
+        async for record in records:
+            yield (json.dumps(record) + '\n').encode()
+    finally:
+        await records.aclose()
+
+    summary.update(searched=search.searched, matched=search.matched, matches=search.matches,
+                   truncated=search.truncated, errors=search.errors,
+                   duration_sec=round(time.monotonic() - started, 3))
+    yield (json.dumps({'summary': summary}) + '\n').encode()
+
+
+async def search_backup_logs_service(pattern: str, regex: bool = False, start: Optional[str] = None,
+                                     end: Optional[str] = None, schedule_name: Optional[str] = None,
+                                     last: int = 100, level: Optional[str] = None,
+                                     limit: Optional[int] = 100) -> AsyncIterator[bytes]:
+    """
+    Search a pattern (substring or regex) in the logs of the `last` most recent completed backups started
+    in [start, end) (default: the last LOG_SEARCH_DEFAULT_DAYS days), optionally of one schedule.
+
+    NDJSON stream: {"backup", "line", "log"} for each match as found (at most `limit` per backup), then
+    {"summary": {...}} with the counters of the search.
+    """
+    if not pattern:
+        raise HTTPException(status_code=400, detail="pattern is required")
+    if not 1 <= last <= LOG_SEARCH_MAX_BACKUPS:
+        raise HTTPException(status_code=400, detail=f"last must be between 1 and {LOG_SEARCH_MAX_BACKUPS}")
+    query = LogQuery(limit=limit, level=level, search=None if regex else pattern, regex=pattern if regex else None)
+
+    range_end = parse_time(end, 'end') or datetime.utcnow()
+    range_start = parse_time(start, 'start') or range_end - timedelta(days=LOG_SEARCH_DEFAULT_DAYS)
+    if range_start >= range_end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    items = await list_velero_resources(RESOURCES[ResourcesNames.BACKUP].plural,
+                                        K8sQuery(labels={'velero.io/schedule-name': schedule_name}))
+    backups = _select_backups(items, range_start, range_end, last)
+    # the log of a backup is uploaded when the backup ends
+    completed = [item for item in backups if (item.get('status') or {}).get('phase') in LOG_FINAL_PHASES]
+
+    summary = {'pattern': pattern, 'start': range_start.isoformat(), 'end': range_end.isoformat(),
+               'schedule': schedule_name, 'backups': len(completed), 'skipped': len(backups) - len(completed)}
+    return _ndjson(_LogSearch(completed, query), summary)
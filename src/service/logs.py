@@ -1,11 +1,15 @@
-from fastapi import HTTPException
+import json
+from typing import AsyncIterator, Iterable, Optional, Tuple
 
-import requests
-import gzip
-import tempfile
+from fastapi import HTTPException
 
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_query import K8sQuery, list_velero_resources
 from schemas.velero_log import VeleroLog
 from service.utils.download_request import create_download_request, cleanup_download_request
+from service.utils.log_cache import log_content_cache
+from service.utils.log_index import LogIndex, log_index_cache
+from service.utils.log_stream import LogQuery, iter_gzip_lines, iter_url_chunks
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 VELERO_LOG_TYPES = {
@@ -13,58 +17,191 @@ VELERO_LOG_TYPES = {
     "restore": "RestoreLog"
 }
 
-ACCEPTED_MIME_TYPES = [
-    "application/gzip",
-    "binary/octet-stream",
-    "application/octet-stream"
-]
+VELERO_LOG_RESOURCES = {
+    "backup": ResourcesNames.BACKUP,
+    "restore": ResourcesNames.RESTORE
+}
 
-@trace_k8s_async_method(description="Get velero resource logs")
-async def get_velero_logs_service(resource_name: str, resource_type: str) -> VeleroLog:
-    """Retrieve logs from a Velero resource (Backup, Restore, etc.) using DownloadRequest"""
+# Phases after which the log of a backup / restore does not change anymore
+LOG_FINAL_PHASES = ('Completed', 'PartiallyFailed', 'Failed', 'FailedValidation')
+
+
+def _log_kind(resource_type: str) -> str:
     if resource_type not in VELERO_LOG_TYPES:
         raise HTTPException(status_code=400, detail=f"Unsupported resource type: {resource_type}")
+    return VELERO_LOG_TYPES[resource_type]
 
-    log_kind = VELERO_LOG_TYPES[resource_type]
 
-    try:
-        # Creation of the DownloadRequest or retrieval of the URL if already available
-        log_url = await create_download_request(resource_name, log_kind)
-        if not log_url:
-            raise HTTPException(status_code=408, detail=f"Unable to retrieve log download URL")
+async def _log_resource(resource_name: str, resource_type: str) -> Optional[str]:
+    """Uid of the resource once completed (its log does not change anymore), None otherwise"""
+    _log_kind(resource_type)
+    plural = RESOURCES[VELERO_LOG_RESOURCES[resource_type]].plural
+    items = await list_velero_resources(plural, K8sQuery(name=resource_name))
+    if not items:
+        return None
+
+    uid = items[0].get('metadata', {}).get('uid')
+    phase = (items[0].get('status') or {}).get('phase')
+    return uid if phase in LOG_FINAL_PHASES else None
+
+
+async def _log_chunks(resource_name: str, resource_type: str, uid: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Chunks of the gzip log of a Velero resource: from the log cache for a completed resource (`uid`),
+    else downloaded from the DownloadRequest URL and, for a completed resource, stored in the cache
+    """
+    log_kind = _log_kind(resource_type)
+    if uid and log_content_cache.enabled:
+        chunks = log_content_cache.read(uid, log_kind)
+        if chunks is not None:
+            return chunks
+
+    # Creation of the DownloadRequest or retrieval of the URL if already available
+    log_url = await create_download_request(resource_name, log_kind)
+    if not log_url:
+        raise HTTPException(status_code=408, detail=f"Unable to retrieve log download URL")
+
+    # DownloadRequest cleanup to avoid buildup
+    # cleanup_download_request(resource_name)
+    chunks = iter_url_chunks(log_url)
+    if uid and log_content_cache.enabled:
+        return log_content_cache.store(uid, log_kind, chunks)
+    return chunks
+
+
+async def log_lines(resource_name: str, resource_type: str, uid: Optional[str] = None) -> AsyncIterator[str]:
+    """Lines of the log of a Velero resource, decompressed while streamed"""
+    return iter_gzip_lines(await _log_chunks(resource_name, resource_type, uid))
+
+
+async def _log_index(resource_name: str, resource_type: str, uid: Optional[str]) -> Optional[LogIndex]:
+    """
+    Index of the log of a completed resource (built at the first request), None while the resource
+    is running or when the log is too large to be indexed
+    """
+    if not uid:
+        return None
+    return await log_index_cache.get((uid, _log_kind(resource_type)), lambda: log_lines(resource_name, resource_type, uid))
 
-        # Download and extract logs
-        logs = await _download_and_extract_logs(log_url)
 
-        # DownloadRequest cleanup to avoid buildup
-        # cleanup_download_request(resource_name)
-        return logs
+async def _log_records(resource_name: str, resource_type: str,
+                       query: LogQuery) -> AsyncIterator[Tuple[int, str]]:
+    """(line number, line) of the selected lines, from the log index or else from the download stream"""
+    uid = await _log_resource(resource_name, resource_type)
+    index = await _log_index(resource_name, resource_type, uid)
+    if index is not None:
+        return _iter_records(index.select(query))
+    return query.apply(await log_lines(resource_name, resource_type, uid))
 
+
+async def _iter_records(records: Iterable[Tuple[int, str]]) -> AsyncIterator[Tuple[int, str]]:
+    for record in records:
+        yield record
+
+
+@trace_k8s_async_method(description="Get velero resource logs")
+async def get_velero_logs_service(resource_name: str, resource_type: str, offset: int = 0,
+                                  limit: Optional[int] = None, tail: Optional[int] = None,
+                                  level: Optional[str] = None, search: Optional[str] = None,
+                                  regex: Optional[str] = None, resource: Optional[str] = None,
+                                  namespace: Optional[str] = None, error: Optional[str] = None) -> VeleroLog:
+    """Retrieve logs from a Velero resource (Backup, Restore, etc.) using DownloadRequest"""
+    query = LogQuery(offset=offset, limit=limit, tail=tail, level=level, search=search, regex=regex,
+                     resource=resource, namespace=namespace, error=error)
+
+    try:
+        records = await _log_records(resource_name, resource_type, query)
+        logs = [line async for _, line in records]
+        return VeleroLog(logs=logs)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
 
-async def _download_and_extract_logs(log_url: str) -> VeleroLog:
-    """Download the .gz file, check the format, and return logs"""
+async def _primed(items: AsyncIterator) -> AsyncIterator:
+    """Read the first item now, so download errors are raised before the response starts"""
     try:
-        response = requests.get(log_url, stream=True)
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail=f"Download error: {response.status_code}")
+        first = await anext(items, None)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error {str(e)}")
+    return _chain(first, items)
+
 
-        # Check the type of content
-        mime_type = response.headers.get("Content-Type", "").split(";")[0]
-        if mime_type not in ACCEPTED_MIME_TYPES:
-            raise HTTPException(status_code=400, detail=f"Invalid response: Unsupported mime type '{mime_type}'")
+async def _chain(first, items: AsyncIterator) -> AsyncIterator:
+    try:
+        if first is None:
+            return
+        yield first
+        async for item in items:
+            yield item
+    finally:
+        await items.aclose()
 
-        with tempfile.NamedTemporaryFile(delete=True) as temp_file:
-            temp_file.write(response.content)
-            temp_file.flush()
 
-            # Open the .gz file and read the contents
-            with gzip.open(temp_file.name, "rb") as gz_file:
-                log_content = gz_file.read().decode("utf-8").split("\n")
+async def _encode(records: AsyncIterator[Tuple[int, str]], ndjson: bool) -> AsyncIterator[bytes]:
+    try:
+        async for number, line in records:
+            yield (json.dumps({'line': number, 'log': line}) + '\n' if ndjson else line + '\n').encode()
+    finally:
+        await records.aclose()
 
-        return VeleroLog(success=True, logs=log_content)
 
+async def _selected_records(resource_name: str, resource_type: str,
+                            query: LogQuery) -> AsyncIterator[Tuple[int, str]]:
+    try:
+        return await _log_records(resource_name, resource_type, query)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=408, detail=f"Request Timeout {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error {str(e)}")
+
+
+@trace_k8s_async_method(description="Stream velero resource logs")
+async def stream_velero_logs_service(resource_name: str, resource_type: str, offset: int = 0,
+                                     limit: Optional[int] = None, tail: Optional[int] = None,
+                                     level: Optional[str] = None, search: Optional[str] = None,
+                                     regex: Optional[str] = None, resource: Optional[str] = None,
+                                     namespace: Optional[str] = None,
+                                     error: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Logs of a Velero resource as NDJSON ({"line": <line number>, "log": <text>} for each selected line),
+    produced while the log is downloaded and decompressed
+    """
+    query = LogQuery(offset=offset, limit=limit, tail=tail, level=level, search=search, regex=regex,
+                     resource=resource, namespace=namespace, error=error)
+
+    records = await _selected_records(resource_name, resource_type, query)
+    return _encode(await _primed(records), ndjson=True)
+
+
+@trace_k8s_async_method(description="Stream velero resource logs as text")
+async def stream_velero_text_logs_service(resource_name: str, resource_type: str, gzip: bool = False,
+                                          offset: int = 0, limit: Optional[int] = None,
+                                          tail: Optional[int] = None, level: Optional[str] = None,
+                                          search: Optional[str] = None, regex: Optional[str] = None,
+                                          resource: Optional[str] = None, namespace: Optional[str] = None,
+                                          error: Optional[str] = None) -> Tuple[AsyncIterator[bytes], bool]:
+    """
+    Logs of a Velero resource as plain text and whether the content is gzip encoded. With `gzip` and no
+    line selection, the .gz object stored by Velero is passed through as is (from the log cache or the
+    signed URL) and never decompressed here; otherwise the selected lines are streamed decompressed.
+    """
+    query = LogQuery(offset=offset, limit=limit, tail=tail, level=level, search=search, regex=regex,
+                     resource=resource, namespace=namespace, error=error)
+
+    if gzip and query.selects_all:
+        try:
+            uid = await _log_resource(resource_name, resource_type)
+            chunks = await _log_chunks(resource_name, resource_type, uid)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error {str(e)}")
+        return await _primed(chunks), True
+
+    records = await _selected_records(resource_name, resource_type, query)
+    return _encode(await _primed(records), ndjson=False), False
@@ -1,23 +1,24 @@
 from fastapi import HTTPException
-from kubernetes import client
 from vui_common.configs.config_proxy import config_app
+from k8s.k8s_resource_cache import get_cached_items
+from k8s.k8s_list_pager import K8sListPager
+from k8s.k8s_query import K8sQuery, list_velero_resources
 
 
 async def get_pod_volume_backups_service():
-    # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
-
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
 
     # Get Velero's backup items
-    group = "velero.io"
-    version = "v1"
     plural = "podvolumebackups"
 
     try:
-        # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        # Serve from the watch cache when available, otherwise chunked API calls to get backups
+        cached_items = get_cached_items(plural)
+        if cached_items is not None:
+            pvb = {'items': cached_items}
+        else:
+            pvb = await K8sListPager(plural, namespace=namespace).list_all()
 
         return pvb
     except Exception as e:
@@ -26,26 +27,16 @@ async def get_pod_volume_backups_service():
 
 
 async def get_pod_volume_backup_details_service(backup_name=None):
-    # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
-
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
 
-    # Group, version and plural to access Velero backups
-    group = "velero.io"
-    version = "v1"
+    # Plural to access Velero backups
     plural = "podvolumebackups"
 
     try:
-        # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
-
-        # Filter objects by label velero.io/backup-uid
-        filtered_items = [
-            item for item in pvb.get('items', [])
-            if item.get('metadata', {}).get('labels', {}).get('velero.io/backup-name') == backup_name
-        ] if backup_name else pvb.get('items', [])
+        # Filter objects by label velero.io/backup-name (label selector, client-side on the watch cache)
+        query = K8sQuery(labels={'velero.io/backup-name': backup_name})
+        filtered_items = await list_velero_resources(plural, query, namespace=namespace)
 
         # Return only filtered objects
         return filtered_items
@@ -54,20 +45,19 @@ async def get_pod_volume_backup_details_service(backup_name=None):
         raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
 async def get_pod_volume_restore_service():
-    # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
-
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
 
     # Get Velero's backup items
-    group = "velero.io"
-    version = "v1"
     plural = "podvolumerestores"
 
     try:
-        # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        # Serve from the watch cache when available, otherwise chunked API calls to get backups
+        cached_items = get_cached_items(plural)
+        if cached_items is not None:
+            pvb = {'items': cached_items}
+        else:
+            pvb = await K8sListPager(plural, namespace=namespace).list_all()
 
         return pvb
     except Exception as e:
@@ -75,26 +65,16 @@ async def get_pod_volume_restore_service():
         raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
 async def get_pod_volume_restore_details_service(restore_name=None):
-    # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
-
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
 
-    # Group, version and plural to access Velero backups
-    group = "velero.io"
-    version = "v1"
+    # Plural to access Velero backups
     plural = "podvolumerestores"
 
     try:
-        # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
-
-        # Filter objects by label velero.io/backup-uid
-        filtered_items = [
-            item for item in pvb.get('items', [])
-            if item.get('metadata', {}).get('labels', {}).get('velero.io/restore-name') == restore_name
-        ] if restore_name else pvb.get('items', [])
+        # Filter objects by label velero.io/restore-name (label selector, client-side on the watch cache)
+        query = K8sQuery(labels={'velero.io/restore-name': restore_name})
+        filtered_items = await list_velero_resources(plural, query, namespace=namespace)
 
         # Return only filtered objects
         return filtered_items
@@ -4,29 +4,34 @@ from fastapi import HTTPException
 
 from models.k8s.repo import BackupRepositoryResponseSchema
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_resource_cache import get_cached_items
 
 from utils.minio_wrapper import MinioInterface
 from utils.process import run_check_output_process
 
-from kubernetes import client
-
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_api_client import custom_objects_api
+from service.utils.model_cache import ModelCache
 
-custom_objects = client.CustomObjectsApi()
+repo_model_cache = ModelCache(BackupRepositoryResponseSchema)
 
 
 @trace_k8s_async_method(description="Get repositories list")
 async def get_repos_service():
-    repos = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural
-    )
-
-    bsl_list = [BackupRepositoryResponseSchema(**item) for item in repos.get("items", [])]
+    items = get_cached_items(RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural)
+    if items is None:
+        custom_objects = await custom_objects_api()
+        repos = await custom_objects.list_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural
+        )
+        items = repos.get("items", [])
+
+    bsl_list = repo_model_cache.validate(items)
 
     return bsl_list
 
@@ -1,16 +1,14 @@
-from kubernetes import client
-
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from schemas.request.delete_resource import DeleteResourceRequestSchema
 from service.utils.download_request import cleanup_download_request
-
-custom_objects = client.CustomObjectsApi()
+from k8s.k8s_api_client import custom_objects_api
 
 
 async def get_server_status_requests_service():
-    ssr = custom_objects.list_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    ssr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -21,7 +19,8 @@ async def get_server_status_requests_service():
 
 
 async def get_download_requests_service():
-    dr = custom_objects.list_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    dr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -32,7 +31,8 @@ async def get_download_requests_service():
 
 
 async def get_delete_backup_requests_service():
-    dbr = custom_objects.list_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    dbr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -42,4 +42,4 @@ async def get_delete_backup_requests_service():
     return dbr
 
 async def delete_download_requests_service(request: DeleteResourceRequestSchema):
-    cleanup_download_request(request.name)
+    await cleanup_download_request(request.name)
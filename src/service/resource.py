@@ -14,7 +14,7 @@ async def get_resource_creation_settings_service():
     bsls = [bsl.model_dump() for bsl in bsls]
     vsls = [vsl.model_dump() for vsl in vsls]
 
-    resource_policy = list_configmaps_service()
+    resource_policy = await list_configmaps_service()
 
     backup_location_list = [item['metadata']['name'] for item in bsls if
                             'metadata' in item and 'name' in item['metadata']]
@@ -1,33 +1,38 @@
 from typing import List
 
-from kubernetes import client
-
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_resource_cache import get_cached_items
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from datetime import datetime
 from schemas.request.create_restore import CreateRestoreRequestSchema
 from models.k8s.restore import RestoreResponseSchema
 from vui_common.configs.config_proxy import config_app
+from k8s.k8s_api_client import custom_objects_api
+from service.utils.model_cache import ModelCache
 
-custom_objects = client.CustomObjectsApi()
+# Validated RestoreResponseSchema reused while the resourceVersion of a restore does not change
+restore_model_cache = ModelCache(RestoreResponseSchema)
 
 
 # @trace_k8s_async_method(description="get a restores list")
 async def get_restores_service(in_progress: bool = False) -> List[RestoreResponseSchema]:
     """Retrieve all Velero schedules"""
-
-    restores = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.RESTORE].plural
-    )
+    items = get_cached_items(RESOURCES[ResourcesNames.RESTORE].plural)
+    if items is None:
+        custom_objects = await custom_objects_api()
+        restores = await custom_objects.list_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.RESTORE].plural
+        )
+        items = restores.get("items", [])
 
     filtered_restores = {}
     now = datetime.utcnow()
 
-    for item in restores.get("items", []):
+    for item in items:
         metadata = item["metadata"]
         status = item.get("status", {})
         phase = status.get("phase", "").lower()
@@ -50,7 +55,7 @@ async def get_restores_service(in_progress: bool = False) -> List[RestoreRespons
 
         filtered_restores[metadata["uid"]] = item
 
-    restore_list = [RestoreResponseSchema(**item) for item in filtered_restores.values()]
+    restore_list = restore_model_cache.validate(list(filtered_restores.values()))
 
     return restore_list
 
@@ -58,19 +63,21 @@ async def get_restores_service(in_progress: bool = False) -> List[RestoreRespons
 @trace_k8s_async_method(description="Get a restore details")
 async def get_restore_details_service(restore_name: str) -> RestoreResponseSchema:
     """Retrieve details of a single schedule"""
-    restore = custom_objects.get_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    restore = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
         plural=RESOURCES[ResourcesNames.RESTORE].plural,
         name=restore_name
     )
-    return RestoreResponseSchema(**restore)
+    return restore_model_cache.validate_one(restore)
 
 
 @trace_k8s_async_method(description="Create a restore")
 async def create_restore_service(restore_data: CreateRestoreRequestSchema):
     """Create a Velero restore on Kubernetes"""
+    custom_objects = await custom_objects_api()
     spec = restore_data.model_dump(exclude_unset=True)
     spec.pop("name", None)
     spec.pop("namespace", None)
@@ -95,7 +102,7 @@ async def create_restore_service(restore_data: CreateRestoreRequestSchema):
         'writeSparseFiles': restore_data.writeSparseFiles,
     }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=restore_data.namespace,
@@ -111,8 +118,9 @@ async def delete_restore_service(restore_name: str):
     """
     Delete an existing Restore from Kubernetes.
     """
+    custom_objects = await custom_objects_api()
 
-    response = custom_objects.delete_namespaced_custom_object(
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -1,15 +1,12 @@
 import os
 
 from fastapi import HTTPException
-from kubernetes import client
-from kubernetes.client.exceptions import ApiException
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client.exceptions import ApiException
 
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from vui_common.logger.logger_proxy import logger
-
-core_v1 = client.CoreV1Api()
-custom_object = client.CustomObjectsApi()
-storage_v1 = client.StorageV1Api()
+from k8s.k8s_api_client import core_v1_api
 
 
 @trace_k8s_async_method(description="Set storage class map")
@@ -24,6 +21,7 @@ async def __set_storages_classes_map(namespace=os.getenv('K8S_VELERO_NAMESPACE',
             tmp[item['oldStorageClass']] = item['newStorageClass']
         data_list = tmp
     try:
+        core_v1 = await core_v1_api()
 
         # ConfigMap metadata
         config_map_metadata = client.V1ObjectMeta(
@@ -37,23 +35,23 @@ async def __set_storages_classes_map(namespace=os.getenv('K8S_VELERO_NAMESPACE',
 
         # Check if the ConfigMap already exists
         try:
-            existing_config_map = core_v1.read_namespaced_config_map(name=config_map_name,
-                                                                     namespace=namespace)
+            existing_config_map = await core_v1.read_namespaced_config_map(name=config_map_name,
+                                                                           namespace=namespace)
 
             # If it exists, update the ConfigMap
             existing_config_map.data = data_list
-            core_v1.replace_namespaced_config_map(name=config_map_name, namespace=namespace,
-                                                  body=existing_config_map)
+            await core_v1.replace_namespaced_config_map(name=config_map_name, namespace=namespace,
+                                                        body=existing_config_map)
             logger.info(
                 "ConfigMap 'change-storage-class-config' in namespace 'velero' updated successfully.")
-        except client.rest.ApiException as e:
+        except ApiException as e:
             # If it doesn't exist, create the ConfigMap
             if e.status == 404:
                 config_map_body = client.V1ConfigMap(
                     metadata=config_map_metadata,
                     data=data_list
                 )
-                core_v1.create_namespaced_config_map(namespace=namespace, body=config_map_body)
+                await core_v1.create_namespaced_config_map(namespace=namespace, body=config_map_body)
                 logger.info(
                     "ConfigMap 'change-storage-class-config' in namespace 'velero' created successfully.")
             else:
@@ -66,11 +64,12 @@ async def __set_storages_classes_map(namespace=os.getenv('K8S_VELERO_NAMESPACE',
 async def get_storages_classes_map_service(config_map_name='change-storage-classes-config',
                                            namespace=os.getenv('K8S_VELERO_NAMESPACE', 'velero')):
     # Create an instance of the Kubernetes core API
+    core_v1 = await core_v1_api()
 
     # Get the ConfigMap
     try:
-        config_map = core_v1.read_namespaced_config_map(name=config_map_name,
-                                                        namespace=namespace)  # Extract data from the ConfigMap
+        config_map = await core_v1.read_namespaced_config_map(name=config_map_name,
+                                                              namespace=namespace)  # Extract data from the ConfigMap
         data = config_map.data or {}
     except ApiException as e:
         if e.status == 404:
@@ -1,7 +1,5 @@
 from typing import List
 
-from kubernetes import client
-
 from models.k8s.schedule import ScheduleResponseSchema
 from schemas.request.create_schedule import CreateScheduleRequestSchema
 
@@ -9,26 +7,35 @@ from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_resource_cache import get_cached_items
+from k8s.k8s_api_client import custom_objects_api
+from service.utils.model_cache import ModelCache
 
-custom_objects = client.CustomObjectsApi()
+# Validated ScheduleResponseSchema reused while the resourceVersion of a schedule does not change
+schedule_model_cache = ModelCache(ScheduleResponseSchema)
 
 
 @trace_k8s_async_method(description="Get velero schedules")
 async def get_schedules_service() -> List[ScheduleResponseSchema]:
-    schedules = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.SCHEDULE].plural
-    )
-
-    schedule_list = [ScheduleResponseSchema(**item) for item in schedules.get("items", [])]
+    items = get_cached_items(RESOURCES[ResourcesNames.SCHEDULE].plural)
+    if items is None:
+        custom_objects = await custom_objects_api()
+        schedules = await custom_objects.list_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.SCHEDULE].plural
+        )
+        items = schedules.get("items", [])
+
+    schedule_list = schedule_model_cache.validate(items)
     return schedule_list
 
 
 @trace_k8s_async_method(description="Set pause schedule")
 async def pause_schedule_service(schedule_name, paused=True):
-    schedule = custom_objects.get_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    schedule = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -38,7 +45,7 @@ async def pause_schedule_service(schedule_name, paused=True):
 
     schedule["spec"]["paused"] = paused
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -50,9 +57,31 @@ async def pause_schedule_service(schedule_name, paused=True):
     return response
 
 
+@trace_k8s_async_method(description="Set schedule cron")
+async def set_schedule_cron_service(schedule_name: str, cron_string: str):
+    """Change only spec.schedule of a schedule (merge patch), the rest of its spec is left untouched"""
+    custom_objects = await custom_objects_api()
+    patch_body = {
+        "spec": {
+            "schedule": cron_string
+        }
+    }
+
+    response = await custom_objects.patch_namespaced_custom_object(
+        group=VELERO["GROUP"],
+        version=VELERO["VERSION"],
+        namespace=config_app.k8s.velero_namespace,
+        plural=RESOURCES[ResourcesNames.SCHEDULE].plural,
+        name=schedule_name,
+        body=patch_body
+    )
+    return response
+
+
 @trace_k8s_async_method(description="Create schedule")
 async def create_schedule_service(schedule_data: CreateScheduleRequestSchema):
     """Create a Velero schedule on Kubernetes"""
+    custom_objects = await custom_objects_api()
     template = schedule_data.model_dump(exclude_unset=True)
     template.pop("name", None)
     template.pop("namespace", None)
@@ -89,7 +118,7 @@ async def create_schedule_service(schedule_data: CreateScheduleRequestSchema):
     if schedule_data.resourcePolicy:
         schedule_body['spec']['template']["resourcePolicy"] = {'kind': 'configmap', 'name': schedule_data.resourcePolicy}
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -103,7 +132,8 @@ async def create_schedule_service(schedule_data: CreateScheduleRequestSchema):
 @trace_k8s_async_method(description="Delete schedule")
 async def delete_schedule_service(schedule_name: str):
     """Delete a Velero schedule"""
-    response = custom_objects.delete_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -115,7 +145,8 @@ async def delete_schedule_service(schedule_name: str):
 
 @trace_k8s_async_method(description="Update schedule")
 async def update_schedule_service(schedule_data):
-    existing_schedule = custom_objects.get_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    existing_schedule = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -156,7 +187,7 @@ async def update_schedule_service(schedule_data):
     existing_schedule['spec'] = new_spec
 
     #  Update the Schedule with the new settings
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
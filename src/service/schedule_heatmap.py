@@ -1,12 +1,22 @@
+import heapq
 import math
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+import numpy as np
 from croniter import croniter
+from fastapi import HTTPException
 
-from service.backup import get_backups_service
-from service.schedule import get_schedules_service
+from service.backup import get_backups_service, backup_model_cache
+from service.schedule import get_schedules_service, schedule_model_cache
+from service.utils.cron_expansion import cron_expansion_cache
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
+MINUTES_PER_WEEK = 7 * 1440
+
+# Max number of runs returned by the upcoming runs timeline
+UPCOMING_RUNS_MAX = 1000
+
 
 def _find_backup(backups, backup_name):
     return next(
@@ -16,6 +26,47 @@ def _find_backup(backups, backup_name):
     )
 
 
+def _cron_runs(cron_string, start_time, end_time=None):
+    """
+    Lazy iterator over the fire times of a cron in (start_time, end_time], unbounded without end_time.
+    Windows up to a week are served by the cron expansion cache.
+    """
+    if cron_string == '':
+        return
+    if end_time is not None and end_time - start_time <= timedelta(days=7):
+        yield from cron_expansion_cache.get(cron_string, start_time, 7).times(start_time, end_time)
+        return
+
+    cron = croniter(cron_string, start_time)
+    while True:
+        event_time = cron.get_next(datetime)
+        if end_time is not None and event_time > end_time:
+            return
+        yield event_time
+
+
+def _indexed_runs(cron_string, index, start_time, end_time):
+    for event_time in _cron_runs(cron_string, start_time, end_time):
+        yield event_time, index
+
+
+def _merge_runs(crons, start_time, end_time=None):
+    """
+    k-way merge of the fire times of several crons: yields (time, index of the cron) sorted by time,
+    producing only the runs actually consumed
+    """
+    return heapq.merge(*[_indexed_runs(cron_string, index, start_time, end_time)
+                         for index, cron_string in enumerate(crons)])
+
+
+def _run_slots(event_times):
+    """Distinct start hour, minute and weekday of the runs, in order of first occurrence"""
+    # Convert weekday: 0 for Sunday, 1 for Monday, ..., 6 for Saturday
+    slots = dict.fromkeys((event_time.hour, event_time.minute, (event_time.weekday() + 1) % 7)
+                          for event_time in event_times)
+    return [{'start_hour': hour, 'start_minute': minute, 'weekday': weekday} for hour, minute, weekday in slots]
+
+
 def _get_cron_events(cron_string, days=7):
     """
     Returns a list of events where the cron is triggered with hours, minutes and day of the week.
@@ -24,31 +75,28 @@ def _get_cron_events(cron_string, days=7):
     :param days:
     :return: List of dictionaries with 'hour', 'minute' and 'weekday'
     """
-    if cron_string == '':
-        return []
     start_time = datetime.now()
-    end_time = start_time + timedelta(days=days)
+    return _run_slots(_cron_runs(cron_string, start_time, start_time + timedelta(days=days)))
 
-    cron = croniter(cron_string, start_time)
-    events = []
 
-    while True:
-        event_time = cron.get_next(datetime)
-        if event_time > end_time:
-            break
-        # Convert weekday: 0 for Sunday, 1 for Monday, ..., 6 for Saturday
-        weekday = (event_time.weekday() + 1) % 7
-        new_event = {
-            'start_hour': event_time.hour,
-            'start_minute': event_time.minute,
-            'weekday': weekday
-        }
-        events.append(new_event) if new_event not in events else events
+def _last_backup_duration(schedule, backups):
+    """Start, completion and duration in minutes of the last backup of a schedule, None if not available"""
+    last_backup = _find_backup(backups, schedule.get('metadata', {}).get('name', ''))
+    if (schedule.get('status', {}).get('lastBackup', '') and last_backup and
+            last_backup.get('status', {}).get('startTimestamp') and
+            last_backup.get('status', {}).get('completionTimestamp')):
+        last_started = last_backup['status']['startTimestamp']
+        last_finished = last_backup['status']['completionTimestamp']
 
-    return events
+        time1 = datetime.fromisoformat(last_started.replace("Z", "+00:00"))
+        time2 = datetime.fromisoformat(last_finished.replace("Z", "+00:00"))
+        time_difference = time2 - time1
+        difference_in_minutes = time_difference.total_seconds() / 60
+        return last_started, last_finished, math.ceil(difference_in_minutes)
+    return None
 
 
-def _cron_heatmap_data(schedules, backups):
+def _cron_heatmap_data(schedules, backups, days=7):
     data = []
     for sc in schedules:
         tmp = {
@@ -57,67 +105,138 @@ def _cron_heatmap_data(schedules, backups):
             'last': sc.get('status', {}).get('lastBackup', '')
         }
 
-        last_backup = _find_backup(backups, tmp['schedule_name'])
-        if (tmp['last'] and last_backup and
-                last_backup.get('status', {}).get('startTimestamp') and
-                last_backup.get('status', {}).get('completionTimestamp')):
+        last_duration = _last_backup_duration(sc, backups)
+        if last_duration is not None:
+            tmp['last_started'], tmp['last_finished'], tmp['duration'] = last_duration
+            tmp['events'] = []
 
-            tmp['last_started'] = last_backup['status']['startTimestamp']
-            tmp['last_finished'] = last_backup['status']['completionTimestamp']
+        data.append(tmp)
+
+    # The runs of all the schedules with a known duration come from a single merge over the window
+    projected = [tmp for tmp in data if 'events' in tmp]
+    start_time = datetime.now()
+    runs = defaultdict(list)
+    for event_time, index in _merge_runs([tmp['cron'] for tmp in projected], start_time,
+                                         start_time + timedelta(days=days)):
+        runs[index].append(event_time)
+
+    for index, tmp in enumerate(projected):
+        events = _run_slots(runs[index])
+        for event in events:
+            event['duration'] = tmp['duration']
+            event['schedule_name'] = tmp['schedule_name']
+        tmp['events'] = events
 
-            time1 = datetime.fromisoformat(tmp['last_started'].replace("Z", "+00:00"))
-            time2 = datetime.fromisoformat(tmp['last_finished'].replace("Z", "+00:00"))
-            time_difference = time2 - time1
-            difference_in_minutes = time_difference.total_seconds() / 60
-            tmp['duration'] = math.ceil(difference_in_minutes)
+    return data
 
-            events = _get_cron_events(tmp['cron'])
-            for event in events:
-                event['duration'] = math.ceil(difference_in_minutes)
-                event['schedule_name'] = tmp['schedule_name']
 
-            tmp['events'] = events
+def _schedule_name_cells(starts, durations, names):
+    """
+    Comma separated schedule names of every minute of the week.
 
-        data.append(tmp)
-    return data
+    The week is split at the start/end of every event interval: inside each segment the covering events
+    don't change, so the names are joined once per segment (in event order, repeated for overlapping
+    runs of the same event) and assigned to all its minutes.
+    """
+    changes = defaultdict(list)
+    for index, (start, duration) in enumerate(zip(starts, durations)):
+        full_weeks, remainder = divmod(duration, MINUTES_PER_WEEK)
+        pieces = []
+        if full_weeks:
+            pieces.append((0, MINUTES_PER_WEEK, full_weeks))
+        if remainder:
+            end = start + remainder
+            if end <= MINUTES_PER_WEEK:
+                pieces.append((start, end, 1))
+            else:
+                pieces += [(start, MINUTES_PER_WEEK, 1), (0, end - MINUTES_PER_WEEK, 1)]
+        for piece_start, piece_end, multiplicity in pieces:
+            changes[piece_start].append((index, multiplicity))
+            changes[piece_end].append((index, -multiplicity))
+
+    cells = np.full(MINUTES_PER_WEEK, '', dtype=object)
+    active = {}
+    positions = sorted(changes)
+    for position, next_position in zip(positions, positions[1:]):
+        for index, delta in changes[position]:
+            count = active.get(index, 0) + delta
+            if count:
+                active[index] = count
+            else:
+                active.pop(index, None)
+        if active:
+            cells[position:next_position] = ','.join(names[index] for index in sorted(active)
+                                                     for _ in range(active[index]))
+    return cells
 
 
 def _create_event_matrix(events):
-    # Create a 3D matrix of dimensions 7 days x 24 hours x 60 minutes, initially with zeros
-    matrix = [[[0 for _ in range(60)] for _ in range(24)] for _ in range(7)]
-    matrix_schedule_name = [[['' for _ in range(60)] for _ in range(24)] for _ in range(7)]
-
-    for event in events:
-        start_hour = event['start_hour']
-        start_minute = event['start_minute']
-        weekday = event['weekday']
-        duration_minute = event['duration'] if 'duration' in event else 0
-
-        # Calculates the total minutes since the beginning of the day
-        start_time_in_minutes = start_hour * 60 + start_minute
-
-        for minute in range(duration_minute):
-            # Calculates the total time in minutes since the beginning of the week
-            total_minutes = (weekday * 1440) + start_time_in_minutes + minute
-            current_weekday = (total_minutes // 1440) % 7
-            current_hour = (total_minutes % 1440) // 60
-            current_minute = total_minutes % 60
-
-            # Increases the counter in the array
-            matrix[current_weekday][current_hour][current_minute] += 1
-            matrix_schedule_name[current_weekday][current_hour][current_minute] += (',' if matrix_schedule_name[
-                current_weekday][current_hour][current_minute] else '') + event['schedule_name']
-
+    """
+    Build the 7 days x 24 hours x 60 minutes matrix of the running backups and the matrix with
+    the names of their schedules, using minute-of-week interval arithmetic.
+    """
+    starts = np.array([event['weekday'] * 1440 + event['start_hour'] * 60 + event['start_minute']
+                       for event in events], dtype=np.int64)
+    durations = np.array([max(event['duration'] if 'duration' in event else 0, 0) for event in events],
+                         dtype=np.int64)
+
+    # Every event covers the minutes [start, start + duration) wrapped on the week:
+    # whole weeks add to all the minutes, the remainder is a difference array over two weeks folded back
+    full_weeks, remainder = np.divmod(durations, MINUTES_PER_WEEK)
+    diff = np.zeros(2 * MINUTES_PER_WEEK + 1, dtype=np.int64)
+    np.add.at(diff, starts, 1)
+    np.add.at(diff, starts + remainder, -1)
+    coverage = np.cumsum(diff[:-1])
+    counts = coverage[:MINUTES_PER_WEEK] + coverage[MINUTES_PER_WEEK:] + full_weeks.sum()
+
+    names = [event['schedule_name'] for event in events]
+    cells = _schedule_name_cells(starts.tolist(), durations.tolist(), names)
+
+    matrix = counts.reshape(7, 24, 60).tolist()
+    matrix_schedule_name = cells.reshape(7, 24, 60).tolist()
     return matrix, matrix_schedule_name
 
 
+def _sparse_heatmap(matrix, matrix_schedule_name):
+    """
+    Run-length encoding of the heatmap: for every weekday the list of [start_minute, end_minute, count, schedules]
+    runs of consecutive minutes (of the day, end excluded) with the same running backups, omitting the idle ones.
+    `schedules` holds the indexes of the names in the `schedules` table, repeated for overlapping runs
+    of the same schedule as in the dense format.
+    """
+    schedule_ids = {}
+    week_heatmap = {}
+
+    for day in range(7):
+        runs = []
+        previous = None
+        for minute_of_day in range(1440):
+            count = matrix[day][minute_of_day // 60][minute_of_day % 60]
+            names = matrix_schedule_name[day][minute_of_day // 60][minute_of_day % 60]
+            if count == 0:
+                previous = None
+                continue
+            if previous == (count, names):
+                runs[-1][1] = minute_of_day + 1
+                continue
+            ids = [schedule_ids.setdefault(name, len(schedule_ids)) for name in names.split(',')] if names else []
+            runs.append([minute_of_day, minute_of_day + 1, count, ids])
+            previous = (count, names)
+        week_heatmap[day] = runs
+
+    return week_heatmap, list(schedule_ids)
+
+
 @trace_k8s_async_method(description="Get schedules heatmap")
-async def get_schedules_heatmap_service():
+async def get_schedules_heatmap_service(format: str = 'dense'):
+    if format not in ('dense', 'sparse'):
+        raise HTTPException(status_code=400, detail=f"Unsupported heatmap format: {format}")
+
     schedules = await get_schedules_service()
-    schedules = [schedule.model_dump(exclude_unset=True) for schedule in schedules]
+    schedules = schedule_model_cache.dump_many(schedules, exclude_unset=True)
 
     backups = await get_backups_service(latest_per_schedule=True)
-    backups = [backup.model_dump(exclude_unset=True) for backup in backups]
+    backups = backup_model_cache.dump_many(backups, exclude_unset=True)
     next_schedule = _cron_heatmap_data(schedules, backups)
 
     events = []
@@ -128,6 +247,15 @@ async def get_schedules_heatmap_service():
 
     matrix, matrix_schedule_name = _create_event_matrix(events)
 
+    if format == 'sparse':
+        week_heatmap, schedule_names = _sparse_heatmap(matrix, matrix_schedule_name)
+        return {
+            'format': 'sparse',
+            'cron_heatmap': next_schedule,
+            'week_heatmap': week_heatmap,
+            'schedules': schedule_names
+        }
+
     heatmap = {0: matrix[0],
                1: matrix[1],
                2: matrix[2],
@@ -160,3 +288,53 @@ async def get_schedules_heatmap_service():
     }
 
     return output
+
+
+@trace_k8s_async_method(description="Get upcoming backup runs")
+async def get_upcoming_runs_service(limit: int = 50, hours: int | None = None):
+    """
+    Next backup runs of all the (not paused) schedules sorted by time, limited to `limit` runs
+    and optionally to the next `hours` hours.
+    Every run reports the expected duration (from the last backup of the schedule) and the number of
+    the previous projected runs still in progress when it starts.
+    """
+    if limit < 1 or limit > UPCOMING_RUNS_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {UPCOMING_RUNS_MAX}")
+    if hours is not None and hours < 1:
+        raise HTTPException(status_code=400, detail="hours must be greater than 0")
+
+    schedules = await get_schedules_service()
+    schedules = schedule_model_cache.dump_many(schedules, exclude_unset=True)
+    schedules = [sc for sc in schedules if sc.get('spec', {}).get('paused') is not True]
+
+    backups = await get_backups_service(latest_per_schedule=True)
+    backups = backup_model_cache.dump_many(backups, exclude_unset=True)
+
+    durations = []
+    for sc in schedules:
+        last_duration = _last_backup_duration(sc, backups)
+        durations.append(last_duration[2] if last_duration is not None else None)
+
+    start_time = datetime.now()
+    end_time = start_time + timedelta(hours=hours) if hours is not None else None
+
+    runs = []
+    running = []  # projected end times of the runs already produced
+    for event_time, index in _merge_runs([sc.get('spec', {}).get('schedule', '') for sc in schedules],
+                                         start_time, end_time):
+        if len(runs) >= limit:
+            break
+        while running and running[0] <= event_time:
+            heapq.heappop(running)
+
+        duration = durations[index]
+        runs.append({
+            'schedule_name': schedules[index].get('metadata', {}).get('name', ''),
+            'time': event_time.isoformat(),
+            'duration': duration,
+            'overlap': len(running)
+        })
+        if duration:
+            heapq.heappush(running, event_time + timedelta(minutes=duration))
+
+    return runs
@@ -0,0 +1,177 @@
+import numpy as np
+from fastapi import HTTPException
+
+from kubernetes_asyncio.client import ApiException
+
+from service.backup import get_backups_service, backup_model_cache
+from service.schedule import get_schedules_service, schedule_model_cache, set_schedule_cron_service
+from service.schedule_heatmap import MINUTES_PER_WEEK, _get_cron_events, _last_backup_duration
+from vui_common.logger.logger_proxy import logger
+from vui_common.utils.k8s_tracer import trace_k8s_async_method
+
+# Max shift in minutes of a schedule proposed by the optimizer
+STAGGER_MAX_WINDOW = 720
+
+
+def _fixed_value(field: str, low: int, high: int) -> int | None:
+    return int(field) if field.isdigit() and low <= int(field) <= high else None
+
+
+def _shift_range(cron_string: str, window: int) -> tuple[int, int] | None:
+    """
+    Allowed (min, max) shift in minutes of a cron that keeps its frequency: the time of day of a fixed
+    minute/hour cron moves inside the same day, a fixed minute with any hour field moves inside the hour.
+    None if the cron cannot be moved (e.g. minute step or list).
+    """
+    fields = cron_string.split()
+    if len(fields) != 5:
+        return None
+    minute = _fixed_value(fields[0], 0, 59)
+    if minute is None:
+        return None
+    hour = _fixed_value(fields[1], 0, 23)
+    if hour is None:
+        return max(-window, -minute), min(window, 59 - minute)
+    time_of_day = hour * 60 + minute
+    return max(-window, -time_of_day), min(window, 1439 - time_of_day)
+
+
+def _shift_cron(cron_string: str, shift: int) -> str:
+    fields = cron_string.split()
+    minute = int(fields[0]) + shift
+    if fields[1].isdigit():
+        time_of_day = int(fields[1]) * 60 + minute
+        fields[0], fields[1] = str(time_of_day % 60), str(time_of_day // 60)
+    else:
+        fields[0] = str(minute)
+    return ' '.join(fields)
+
+
+def _coverage(starts, duration):
+    """Minutes of the week (with repetitions) covered by runs of `duration` minutes starting at `starts`"""
+    return ((np.asarray(starts)[:, None] + np.arange(duration)[None, :]) % MINUTES_PER_WEEK).ravel()
+
+
+class _StaggerItem:
+    __slots__ = ('name', 'cron', 'duration', 'starts', 'low', 'high', 'shift')
+
+    def __init__(self, name, cron, duration, starts, shift_range):
+        self.name = name
+        self.cron = cron
+        self.duration = duration
+        self.starts = np.array(starts, dtype=np.int64)
+        self.low, self.high = shift_range or (0, 0)
+        self.shift = 0
+
+    def cells(self, shift=None):
+        return _coverage(self.starts + (self.shift if shift is None else shift), self.duration)
+
+
+def _best_shift(load, item):
+    """
+    Shift of `item` minimizing, over the minutes it would cover, first the max load (the peak it would
+    raise) then the total load (the overlap minutes), then the distance from the original time.
+    All the candidates are scored at once with sliding windows over the load of each run.
+    """
+    shifts = np.arange(item.low, item.high + 1)
+    span = len(shifts) + item.duration - 1
+    peak = np.zeros(len(shifts), dtype=np.int64)
+    total = np.zeros(len(shifts), dtype=np.int64)
+    for start in item.starts:
+        segment = load[(start + item.low + np.arange(span)) % MINUTES_PER_WEEK]
+        windows = np.lib.stride_tricks.sliding_window_view(segment, item.duration)
+        np.maximum(peak, windows.max(axis=1), out=peak)
+        total += windows.sum(axis=1)
+    return int(shifts[np.lexsort((np.abs(shifts), total, peak))[0]])
+
+
+def _stagger(items, rounds=2):
+    """
+    Greedy staggering: the movable schedules (longest runs first) are placed one at a time at their best
+    shift over the load of all the others; a second round revisits every choice with the final load.
+    """
+    load = np.zeros(MINUTES_PER_WEEK, dtype=np.int64)
+    for item in items:
+        np.add.at(load, item.cells(), 1)
+
+    movable = sorted((item for item in items if item.high > item.low),
+                     key=lambda item: -item.duration * len(item.starts))
+    for _ in range(rounds):
+        for item in movable:
+            np.add.at(load, item.cells(), -1)
+            item.shift = _best_shift(load, item)
+            np.add.at(load, item.cells(), 1)
+    return load
+
+
+@trace_k8s_async_method(description="Stagger schedules")
+async def stagger_schedules_service(window: int = 120, apply: bool = False):
+    """
+    Propose new start times for the (not paused) schedules to minimize the peak of concurrent backups
+    of the week, moving each one by at most `window` minutes without changing its frequency.
+    The durations are the ones of the last backups, as in the schedules heatmap; with `apply` the
+    proposed crons are saved (only spec.schedule is patched) and peak_after is the one of the schedules
+    actually moved.
+    """
+    if window < 0 or window > STAGGER_MAX_WINDOW:
+        raise HTTPException(status_code=400, detail=f"window must be between 0 and {STAGGER_MAX_WINDOW}")
+
+    schedules = await get_schedules_service()
+    schedules = schedule_model_cache.dump_many(schedules, exclude_unset=True)
+    schedules = {sc['metadata']['name']: sc for sc in schedules if sc.get('spec', {}).get('paused') is not True}
+
+    backups = await get_backups_service(latest_per_schedule=True)
+    backups = backup_model_cache.dump_many(backups, exclude_unset=True)
+
+    items = []
+    for name, sc in schedules.items():
+        cron_string = sc.get('spec', {}).get('schedule', '')
+        last_duration = _last_backup_duration(sc, backups)
+        if last_duration is None or last_duration[2] <= 0:
+            continue
+        starts = [event['weekday'] * 1440 + event['start_hour'] * 60 + event['start_minute']
+                  for event in _get_cron_events(cron_string)]
+        if starts:
+            items.append(_StaggerItem(name, cron_string, min(last_duration[2], MINUTES_PER_WEEK), starts,
+                                      _shift_range(cron_string, window)))
+
+    load_before = np.zeros(MINUTES_PER_WEEK, dtype=np.int64)
+    for item in items:
+        np.add.at(load_before, item.cells(), 1)
+    load_after = _stagger(items)
+
+    proposals = []
+    for item in sorted(items, key=lambda item: item.name):
+        proposal = {
+            'schedule_name': item.name,
+            'cron': item.cron,
+            'proposed_cron': _shift_cron(item.cron, item.shift) if item.shift else item.cron,
+            'shift': item.shift,
+            'duration': item.duration,
+            'movable': item.high > item.low
+        }
+        if apply and item.shift:
+            try:
+                await set_schedule_cron_service(item.name, proposal['proposed_cron'])
+                proposal['applied'] = True
+                logger.info(f"Schedule {item.name} moved from '{item.cron}' to '{proposal['proposed_cron']}'")
+            except ApiException as e:
+                proposal['applied'] = False
+                proposal['reason'] = f"update failed: {e.status} {e.reason}"
+                # the schedule keeps its cron
+                item.shift = 0
+        proposals.append(proposal)
+
+    if apply:
+        load_after = np.zeros(MINUTES_PER_WEEK, dtype=np.int64)
+        for item in items:
+            np.add.at(load_after, item.cells(), 1)
+
+    return {
+        'window': window,
+        'applied': apply,
+        'peak_before': int(load_before.max()),
+        'peak_after': int(load_after.max()),
+        'schedules': proposals,
+        'skipped': sorted(set(schedules) - {item.name for item in items})
+    }
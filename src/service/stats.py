@@ -1,11 +1,12 @@
 from models.k8s.backup import BackupPhase
-from service.backup import get_backups_service
-from service.restore import get_restores_service
+from service.backup import get_backups_service, backup_model_cache
+from service.restore import get_restores_service, restore_model_cache
 from collections import Counter
 from service.k8s import get_namespaces_service
 
-from service.schedule import get_schedules_service
+from service.schedule import get_schedules_service, schedule_model_cache
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_stats_aggregator import K8sStatsAggregator, get_stats_aggregator
 
 
 def _build_data(phase, counter, total_count):
@@ -39,6 +40,12 @@ def _resources_stats(resources, count_from_schedule=False):
         'velero.io/schedule-name' in x['metadata']['labels']
     )
 
+    return _phases_stats(total_count, phase_counts, scheduled_count if count_from_schedule else None)
+
+
+def _phases_stats(total_count, phase_counts, scheduled_count=None):
+    """Format the phase counters, excluding phases with a count of 0."""
+
     # Prepare response dictionary
     res = {'count': total_count, 'stats': []}
 
@@ -55,7 +62,7 @@ def _resources_stats(resources, count_from_schedule=False):
             )
 
     # Add scheduled backups count if requested
-    if count_from_schedule:
+    if scheduled_count is not None:
         res['from_schedule_count'] = scheduled_count
 
     return res
@@ -66,8 +73,10 @@ def _schedules_stats(resources):
 
     paused = [x for x in resources if x.get('spec').get('paused') is True]
 
-    paused_count = len(paused)
+    return _paused_stats(count, len(paused))
 
+
+def _paused_stats(count, paused_count):
     unpaused_count = count - paused_count
 
     res = {'count': count,
@@ -111,31 +120,62 @@ def _get_completion_timestamp(item):
     return ''
 
 
-@trace_k8s_async_method(description="Get service stats")
-async def get_stats_service():
+def _stats_from_aggregator(aggregator: K8sStatsAggregator):
+    """Stats served by the counters maintained from the watch events"""
+    state = aggregator.state()
+
+    all_backups_stats = _phases_stats(state['backups']['count'], state['backups']['phases'],
+                                      state['backups']['from_schedule_count'])
+    last_schedule_backup_stats = _phases_stats(state['latest']['count'], state['latest']['phases'])
+    all_restores_stats = _phases_stats(state['restores']['count'], state['restores']['phases'])
+    schedules_stats = _paused_stats(state['schedules']['count'], state['schedules']['paused'])
+
+    last_backup_sorted = backup_model_cache.dump_many(backup_model_cache.validate(aggregator.latest_completed(5)))
+
+    return (all_backups_stats, last_schedule_backup_stats, last_backup_sorted, all_restores_stats, schedules_stats,
+            state['scheduled_namespaces'])
+
+
+async def _stats_from_resources():
+    """Stats computed from the full lists of backups, restores and schedules"""
     backups = await get_backups_service()
-    backups = [backup.model_dump() for backup in backups]
+    backups = backup_model_cache.dump_many(backups)
 
     all_backups_stats = _resources_stats(backups, count_from_schedule=True)
 
     last_backup = await get_backups_service(latest_per_schedule=True)
-    last_backup = [backup.model_dump() for backup in last_backup]
+    last_backup = backup_model_cache.dump_many(last_backup)
 
     last_schedule_backup_stats = _resources_stats(last_backup)
 
     restores = await get_restores_service()
-    restores = [restore.model_dump() for restore in restores]
+    restores = restore_model_cache.dump_many(restores)
 
     all_restores_stats = _resources_stats(restores)
 
     schedules = await get_schedules_service()
-    schedules = [schedule.model_dump() for schedule in schedules]
+    schedules = schedule_model_cache.dump_many(schedules)
 
     schedules_stats = _schedules_stats(schedules)
 
     last_backup_sorted = sorted(backups, key=_get_completion_timestamp, reverse=True)[:5]
 
     scheduled_namespace = _get_all_scheduled_namespace(schedules)
+
+    return (all_backups_stats, last_schedule_backup_stats, last_backup_sorted, all_restores_stats, schedules_stats,
+            scheduled_namespace)
+
+
+@trace_k8s_async_method(description="Get service stats")
+async def get_stats_service():
+    aggregator = get_stats_aggregator()
+    if aggregator is not None:
+        stats = _stats_from_aggregator(aggregator)
+    else:
+        stats = await _stats_from_resources()
+    (all_backups_stats, last_schedule_backup_stats, last_backup_sorted, all_restores_stats, schedules_stats,
+     scheduled_namespace) = stats
+
     all_ns = await get_namespaces_service()
     unscheduled_ns = list(set(all_ns) - set(scheduled_namespace))
 
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from vui_common.configs.config_proxy import config_app
+
+from service.utils.tar_index import members_tree
+
+# Content-addressed store of the manifests of the backups inspected in 'dedupe' mode, in the inspect folder
+BLOBS_DIR_NAME = '.blobs'
+# path -> blob of a backup inspected in 'dedupe' mode, in the backup folder
+MANIFEST_NAME = '.manifest.json'
+
+# Loaded manifests kept in memory
+_MANIFEST_CACHE_SIZE = 64
+
+
+class BlobStore:
+    """
+    Files stored once by SHA-256 of their content under <inspect folder>/.blobs/<2 hex>/<digest>:
+    consecutive backups of a schedule share most of their manifests.
+    A running download claims the blobs it writes or reuses, collect() keeps them until its manifest is saved;
+    `lock` is held by the save of a manifest and by a whole collection (scan of the manifests + removal),
+    so a collection never misses a manifest saved meanwhile.
+    """
+
+    def __init__(self, root: str = config_app.app.inspect_folder):
+        self.directory = os.path.join(root, BLOBS_DIR_NAME)
+        self.lock = asyncio.Lock()
+        # claims of the running downloads, guarded (with the removals) by _mutex: puts and collect run in threads
+        self._claims: Dict[int, Set[str]] = {}
+        self._mutex = threading.Lock()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    @contextmanager
+    def claim(self) -> Iterator[Set[str]]:
+        """Digests written or reused by a download (see put), not collected while the claim is held"""
+        claimed = set()
+        with self._mutex:
+            self._claims[id(claimed)] = claimed
+        try:
+            yield claimed
+        finally:
+            with self._mutex:
+                del self._claims[id(claimed)]
+
+    def put(self, data: bytes, claimed: Optional[Set[str]] = None) -> Tuple[str, bool]:
+        """Store a content, returns its digest and whether it was new"""
+        digest = hashlib.sha256(data).hexdigest()
+        if claimed is not None:
+            # claimed before the existence check: a blob removed before the claim is written again
+            with self._mutex:
+                claimed.add(digest)
+        path = self.path(digest)
+        if os.path.exists(path):
+            return digest, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+        return digest, True
+
+    def read(self, digest: str) -> bytes:
+        with open(self.path(digest), 'rb') as file:
+            return file.read()
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as folders:
+                for folder in folders:
+                    if folder.is_dir(follow_symlinks=False):
+                        with os.scandir(folder.path) as entries:
+                            # the .tmp files are the blobs being written
+                            yield from (entry for entry in entries if not entry.name.endswith('.tmp'))
+        except FileNotFoundError:
+            return
+
+    def usage(self) -> Tuple[int, int]:
+        """(blobs, bytes allocated on disk)"""
+        count = size = 0
+        for entry in self._entries():
+            count += 1
+            size += entry.stat(follow_symlinks=False).st_blocks * 512
+        return count, size
+
+    def collect(self, referenced: Set[str]) -> int:
+        """Remove the blobs not in `referenced` nor claimed by a running download, returns the bytes freed"""
+        freed = 0
+        for entry in list(self._entries()):
+            if entry.name in referenced:
+                continue
+            with self._mutex:
+                if any(entry.name in claimed for claimed in self._claims.values()):
+                    continue
+                freed += entry.stat(follow_symlinks=False).st_blocks * 512
+                os.remove(entry.path)
+        return freed
+
+
+class BlobManifest:
+    """
+    Files of a backup inspected in 'dedupe' mode: path -> (digest, size), with the same read interface
+    as TarIndex
+    """
+
+    def __init__(self, directory: str, members: Dict[str, Tuple[str, int]], store: BlobStore):
+        self.directory = directory
+        self.members = members
+        self.store = store
+        self._tree: Optional[dict] = None
+
+    @staticmethod
+    def manifest_path(directory: str) -> str:
+        return os.path.join(directory, MANIFEST_NAME)
+
+    def save(self):
+        path = self.manifest_path(self.directory)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+            json.dump({'members': self.members}, file)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, directory: str, store: BlobStore) -> 'BlobManifest':
+        with open(cls.manifest_path(directory), 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(directory, {name: tuple(value) for name, value in data['members'].items()}, store)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def names(self) -> Iterator[str]:
+        return iter(self.members)
+
+    def digests(self) -> Set[str]:
+        return {digest for digest, _ in self.members.values()}
+
+    def tree(self) -> dict:
+        """Folders of the files (see members_tree), computed once"""
+        if self._tree is None:
+            self._tree = members_tree(self.members)
+        return self._tree
+
+    def read(self, name: str) -> bytes:
+        return self.store.read(self.members[name][0])
+
+
+blob_store = BlobStore()
+
+_manifests: OrderedDict = OrderedDict()
+
+
+def is_manifest(directory: str) -> bool:
+    """Whether an inspected backup is stored in the blob store (see BlobManifest)"""
+    return os.path.isfile(BlobManifest.manifest_path(directory))
+
+
+def get_blob_manifest(directory: str) -> BlobManifest:
+    path = BlobManifest.manifest_path(directory)
+    key = (path, os.path.getmtime(path))
+    manifest = _manifests.get(key)
+    if manifest is not None:
+        _manifests.move_to_end(key)
+        return manifest
+
+    manifest = BlobManifest.load(directory, blob_store)
+    _manifests[key] = manifest
+    while len(_manifests) > _MANIFEST_CACHE_SIZE:
+        _manifests.popitem(last=False)
+    return manifest
+
+
+def referenced_blobs(directories: Iterable[str]) -> Set[str]:
+    """Digests used by the backups of the given folders stored in 'dedupe' mode"""
+    referenced = set()
+    for directory in directories:
+        if is_manifest(directory):
+            referenced |= get_blob_manifest(directory).digests()
+    return referenced
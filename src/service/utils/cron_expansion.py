@@ -0,0 +1,82 @@
+import os
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from croniter import croniter
+
+# Width in minutes of the window start buckets: expansions are shared by all the requests in the same bucket
+CRON_CACHE_BUCKET_MIN = int(os.getenv('CRON_CACHE_BUCKET_MIN', 60))
+
+
+class CronExpansion:
+    """Fire times of a cron over a window, stored as sorted minute offsets from the window start"""
+
+    def __init__(self, cron_string: str, window_start: datetime, minutes: int):
+        self.window_start = window_start
+        self.offsets: List[int] = []
+        # (hour, minute, weekday) of every offset, weekday 0 for Sunday ... 6 for Saturday
+        self.slots: List[Tuple[int, int, int]] = []
+
+        end_time = window_start + timedelta(minutes=minutes)
+        cron = croniter(cron_string, window_start)
+        while True:
+            event_time = cron.get_next(datetime)
+            if event_time > end_time:
+                break
+            self.offsets.append(int((event_time - window_start).total_seconds() // 60))
+            self.slots.append((event_time.hour, event_time.minute, (event_time.weekday() + 1) % 7))
+
+    def _range(self, start_time: datetime, end_time: datetime) -> Tuple[int, int]:
+        """Indexes of the fire times in (start_time, end_time]"""
+        start = (start_time - self.window_start).total_seconds() / 60
+        end = (end_time - self.window_start).total_seconds() / 60
+        return bisect_right(self.offsets, start), bisect_right(self.offsets, end)
+
+    def times(self, start_time: datetime, end_time: datetime) -> List[datetime]:
+        low, high = self._range(start_time, end_time)
+        return [self.window_start + timedelta(minutes=offset) for offset in self.offsets[low:high]]
+
+    def slots_between(self, start_time: datetime, end_time: datetime) -> List[Tuple[int, int, int]]:
+        """Distinct (hour, minute, weekday) of the fire times in (start_time, end_time], in order of first occurrence"""
+        low, high = self._range(start_time, end_time)
+        return list(dict.fromkeys(self.slots[low:high]))
+
+
+class CronExpansionCache:
+    """
+    Memoized cron expansions keyed by (cron string, window start bucket, days).
+
+    A window starting in the current bucket is expanded from the bucket start for `days` plus one bucket,
+    so it covers any request issued during the bucket; entries of the past buckets are evicted as soon as
+    the window rolls over.
+    """
+
+    def __init__(self, bucket_minutes: int = CRON_CACHE_BUCKET_MIN):
+        self.bucket_minutes = bucket_minutes
+        self._bucket: Optional[datetime] = None
+        self._expansions: Dict[Tuple[str, datetime, int], CronExpansion] = {}
+
+    def _bucket_start(self, start_time: datetime) -> datetime:
+        minute_of_day = start_time.hour * 60 + start_time.minute
+        bucket_minute = minute_of_day - minute_of_day % self.bucket_minutes
+        return start_time.replace(hour=bucket_minute // 60, minute=bucket_minute % 60, second=0, microsecond=0)
+
+    def get(self, cron_string: str, start_time: datetime, days: int = 7) -> CronExpansion:
+        bucket = self._bucket_start(start_time)
+        if self._bucket is None or bucket > self._bucket:
+            # window rolled over: the expansions of the previous buckets are not needed anymore
+            self._bucket = bucket
+            self._expansions = {key: expansion for key, expansion in self._expansions.items() if key[1] >= bucket}
+
+        key = (cron_string, bucket, days)
+        if key not in self._expansions:
+            self._expansions[key] = CronExpansion(cron_string, bucket, days * 1440 + self.bucket_minutes)
+        return self._expansions[key]
+
+    def clear(self):
+        self._bucket = None
+        self._expansions = {}
+
+
+cron_expansion_cache = CronExpansionCache()
@@ -1,35 +1,152 @@
-import time
+import asyncio
+import os
 import requests
+import shutil
 import tempfile
-import tarfile
 
 from fastapi import HTTPException
-from kubernetes import client
-from typing import Optional
+from kubernetes_asyncio import client
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from vui_common.configs.config_proxy import config_app
 from vui_common.logger.logger_proxy import logger
+from k8s.k8s_api_client import custom_objects_api
+from k8s.k8s_download_request_waiter import get_download_request_waiter
+from service.utils.tar_stream import extract_url
+
+
+# Max seconds to wait for a DownloadRequest to be processed by Velero
+DOWNLOAD_REQUEST_TIMEOUT_SEC = float(os.getenv('DOWNLOAD_REQUEST_TIMEOUT_SEC', 20))
+# Seconds between two reads of a pending DownloadRequest, fallback for the watch events
+DOWNLOAD_REQUEST_POLL_SEC = float(os.getenv('DOWNLOAD_REQUEST_POLL_SEC', 4))
+
+# Seconds before status.expiration after which a signed URL is not handed out anymore
+DOWNLOAD_URL_EXPIRY_MARGIN_SEC = int(os.getenv('DOWNLOAD_URL_EXPIRY_MARGIN_SEC', 30))
+
+# In-flight create_download_request by DownloadRequest name, shared by concurrent callers
+_pending_requests: Dict[str, asyncio.Task] = {}
+
 
-custom_objects = client.CustomObjectsApi()
+def _expiration(download_request: dict) -> Optional[datetime]:
+    expiration = download_request.get("status", {}).get("expiration")
+    return datetime.fromisoformat(expiration.replace("Z", "")) if expiration else None
+
+
+def _is_usable(download_request: dict) -> bool:
+    """Processed and with a signed URL not (about to be) expired"""
+    if download_request.get("status", {}).get("phase") != "Processed":
+        return False
+    expiration = _expiration(download_request)
+    return expiration is None or expiration > datetime.utcnow() + timedelta(seconds=DOWNLOAD_URL_EXPIRY_MARGIN_SEC)
+
+
+class DownloadUrlCache:
+    """
+    Signed URLs of the processed DownloadRequests by (resource name, kind), handed out until their
+    status.expiration (minus DOWNLOAD_URL_EXPIRY_MARGIN_SEC) without reading or creating any object.
+    """
+
+    def __init__(self):
+        self._urls: Dict[Tuple[str, str], Tuple[str, datetime]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, resource_name: str, resource_kind: str) -> Optional[str]:
+        key = (resource_name, resource_kind)
+        entry = self._urls.get(key)
+        if entry is not None and entry[1] > datetime.utcnow() + timedelta(seconds=DOWNLOAD_URL_EXPIRY_MARGIN_SEC):
+            self.hits += 1
+            return entry[0]
+        self._urls.pop(key, None)
+        self.misses += 1
+        return None
+
+    def put(self, resource_name: str, resource_kind: str, download_request: dict):
+        url = download_request.get("status", {}).get("downloadURL")
+        expiration = _expiration(download_request)
+        if not url or expiration is None:
+            return
+        now = datetime.utcnow()
+        self._urls = {key: entry for key, entry in self._urls.items() if entry[1] > now}
+        self._urls[(resource_name, resource_kind)] = (url, expiration)
+
+    def info(self) -> dict:
+        return {'size': len(self._urls), 'hits': self.hits, 'misses': self.misses}
+
+
+download_url_cache = DownloadUrlCache()
 
 
 async def create_download_request(resource_name: str, resource_kind: str) -> Optional[str]:
     """
     Creates a Velero DownloadRequest to download the requested data.
     If a request already exists, reuses or deletes it and creates a new one.
+    Concurrent calls for the same resource and kind share the same request.
 
     :param resource_name: Name of the resource (e.g., backup_name).
     :param resource_kind: Type of the resource (BackupLog, BackupContents, etc.).
     :return: URL for download or None if it fails
     """
-    logger.info(f"Create download request download-{resource_name}-{resource_kind.lower()}")
+    download_url = download_url_cache.get(resource_name, resource_kind)
+    if download_url is not None:
+        return download_url
+
     download_request_name = f"download-{resource_name}-{resource_kind.lower()}"
+    task = _pending_requests.get(download_request_name)
+    if task is None or task.done():
+        task = asyncio.ensure_future(_resolve_download_request(resource_name, resource_kind, download_request_name))
+        _pending_requests[download_request_name] = task
+        task.add_done_callback(
+            lambda done: _pending_requests.pop(download_request_name)
+            if _pending_requests.get(download_request_name) is done else None)
+    else:
+        logger.info(f"Waiting for the pending download request {download_request_name}")
+
+    # shield: a cancelled caller must not cancel the request of the others
+    return await asyncio.shield(task)
+
+
+async def _wait_processed(download_request_name: str, future: asyncio.Future) -> Optional[dict]:
+    """
+    Wait for the DownloadRequest to be Processed: the future is completed by the watch events, the object is
+    also read every DOWNLOAD_REQUEST_POLL_SEC in case the watch is not running or an event is missed.
+    Returns None after DOWNLOAD_REQUEST_TIMEOUT_SEC.
+    """
+    custom_objects = await custom_objects_api()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DOWNLOAD_REQUEST_TIMEOUT_SEC
+
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), min(DOWNLOAD_REQUEST_POLL_SEC, remaining))
+        except asyncio.TimeoutError:
+            pass
+
+        download_request = await custom_objects.get_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
+            name=download_request_name
+        )
+        if download_request.get("status", {}).get("phase") == "Processed":
+            return download_request
+
+
+async def _resolve_download_request(resource_name: str, resource_kind: str,
+                                    download_request_name: str) -> Optional[str]:
+    logger.info(f"Create download request {download_request_name}")
+    custom_objects = await custom_objects_api()
 
     try:
         # Check if a DownloadRequest already exists
-        existing_request = custom_objects.get_namespaced_custom_object(
+        existing_request = await custom_objects.get_namespaced_custom_object(
             group=VELERO["GROUP"],
             version=VELERO["VERSION"],
             namespace=config_app.k8s.velero_namespace,
@@ -37,14 +154,17 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
             name=download_request_name
         )
 
-        # If it exists and is Processed, we reuse its URL
-        if existing_request.get("status", {}).get("phase") == "Processed":
+        # If it exists and is Processed (with the URL not expired), we reuse its URL
+        if _is_usable(existing_request):
             logger.info(f"Download request from existing url {existing_request.get('status', {}).get('downloadURL')}")
+            download_url_cache.put(resource_name, resource_kind, existing_request)
             return existing_request.get("status", {}).get("downloadURL")
 
-        # If it exists but is not Processed, we delete it and recreate it
-        logger.info(f"DownloadRequest ‘{download_request_name}’ already exists but is not Processed. By deleting it...")
-        cleanup_download_request(resource_name)
+        # If it exists but is not Processed or expired, we delete it and recreate it
+        logger.info(f"DownloadRequest ‘{download_request_name}’ already exists but is not Processed or is expired. "
+                    f"By deleting it...")
+        # the garbage collector may have deleted it meanwhile
+        await cleanup_download_request(download_request_name, ignore_missing=True)
 
     except client.exceptions.ApiException as e:
         if e.status != 404:  # Ignoriamo l'errore 404 (not found)
@@ -52,6 +172,11 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
             raise HTTPException(status_code=400,
                                 detail=f"Error while checking DownloadRequest ‘{download_request_name}’: {e}")
 
+    # The future is registered before the creation, so the Processed event cannot be missed
+    waiter = get_download_request_waiter()
+    future = waiter.future(download_request_name) if waiter is not None else \
+        asyncio.get_running_loop().create_future()
+
     try:
         # Creating the new DownloadRequest
         logger.info("Creating the new DownloadRequest")
@@ -70,7 +195,7 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
             }
         }
 
-        custom_objects.create_namespaced_custom_object(
+        await custom_objects.create_namespaced_custom_object(
             group=VELERO["GROUP"],
             version=VELERO["VERSION"],
             namespace=config_app.k8s.velero_namespace,
@@ -78,24 +203,21 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
             body=download_request_body
         )
 
-        # Wait up to 5 attempts for the request to be processed
-        for _ in range(5):
-            time.sleep(4)
-            download_request = custom_objects.get_namespaced_custom_object(
-                group=VELERO["GROUP"],
-                version=VELERO["VERSION"],
-                namespace=config_app.k8s.velero_namespace,
-                plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
-                name=download_request_name
-            )
-
-            if download_request.get("status", {}).get("phase") == "Processed":
-                return download_request.get("status", {}).get("downloadURL")
+        download_request = await _wait_processed(download_request_name, future)
+        if download_request is None:
+            logger.warning(f"DownloadRequest ‘{download_request_name}’ not processed in "
+                           f"{DOWNLOAD_REQUEST_TIMEOUT_SEC} seconds")
+            return None
+        download_url_cache.put(resource_name, resource_kind, download_request)
+        return download_request.get("status", {}).get("downloadURL")
 
     except Exception as e:
         logger.error(f"Error in DownloadRequest for ‘{resource_name}’: {e}")
         raise HTTPException(status_code=400,
                             detail=f"Error in DownloadRequest for ‘{resource_name}’: {e}")
+    finally:
+        if waiter is not None:
+            waiter.discard(download_request_name, future)
 
 # async def download_and_extract_backup(download_url: str) -> Optional[str]:
 #     """
@@ -132,17 +254,19 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
 #                             detail=f"Error while downloading and extracting backup: {e}")
 
 
-def cleanup_download_request(resource_name: str):
+async def cleanup_download_request(resource_name: str, ignore_missing: bool = False):
     """
     Deletes the DownloadRequest after use to avoid accumulation in the cluster.
 
     :param resource_name: Name of the resource associated with the DownloadRequest.
+    :param ignore_missing: A DownloadRequest already deleted (e.g. by the garbage collector) is not an error.
     """
     logger.info(f"Cleanup download request {resource_name}")
     # download_request_name = f"download-{resource_name}"
     download_request_name = f"{resource_name}"
+    custom_objects = await custom_objects_api()
     try:
-        custom_objects.delete_namespaced_custom_object(
+        await custom_objects.delete_namespaced_custom_object(
             group=VELERO["GROUP"],
             version=VELERO["VERSION"],
             namespace=config_app.k8s.velero_namespace,
@@ -151,7 +275,9 @@ def cleanup_download_request(resource_name: str):
         )
         logger.info(f"DownloadRequest '{download_request_name}' successfully deleted.")
     except client.exceptions.ApiException as e:
-        if e.status == 404:
+        if e.status == 404 and ignore_missing:
+            logger.info(f"DownloadRequest '{download_request_name}' already deleted.")
+        elif e.status == 404:
             logger.error(f"DownloadRequest '{download_request_name}' does not exist, no deletion required.")
             raise HTTPException(status_code=400,
                                 detail=f"DownloadRequest '{download_request_name}' does not exist, no deletion "
@@ -163,44 +289,25 @@ def cleanup_download_request(resource_name: str):
                                 detail=f"Error while deleting DownloadRequest '{download_request_name}': {e}")
 
 
-import aiohttp
-import aiofiles
-import asyncio
+async def download_and_extract_backup(download_url: str, members: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Download the backup tarball and extract it (only the `members` glob patterns if given) into a temporary
+    folder while it is downloaded, without an intermediate .tar.gz on disk.
 
-async def download_and_extract_backup(download_url: str) -> Optional[str]:
+    :param download_url: URL of the file generated by Velero.
+    :param members: glob patterns of the members to extract, e.g. 'resources/persistentvolumeclaims/*'
+    :return: Path to the extracted folder
+    """
     logger.info(f"Download and extract backup from {download_url}")
+    extract_folder = tempfile.mkdtemp()
     try:
-        # Download the file asynchronously
-        async with aiohttp.ClientSession() as session:
-            async with session.get(download_url) as response:
-                if response.status != 200:
-                    logger.error(f"Backup download error: {response.status}")
-                    raise HTTPException(status_code=400,
-                                        detail=f"Backup download error: {response.status}")
-
-                # Writes the contents to a temporary file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".tar.gz")
-                temp_file_path = temp_file.name
-                temp_file.close()  # Chiudi per scrivere async
-
-                async with aiofiles.open(temp_file_path, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(1024 * 1024):
-                        await f.write(chunk)
-
-        # Creates a temporary folder for extraction
-        extract_folder = tempfile.mkdtemp()
-
-        # Extract the .tar.gz file in a separate thread (to avoid blockages)
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, extract_tarfile, temp_file_path, extract_folder)
-
+        await extract_url(download_url, extract_folder, members=members)
         return extract_folder
 
     except Exception as e:
+        shutil.rmtree(extract_folder, ignore_errors=True)
         logger.error(f"Error while downloading and extracting backup: {e}")
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=400,
                             detail=f"Error while downloading and extracting backup: {e}")
-
-def extract_tarfile(tar_path: str, extract_to: str):
-    with tarfile.open(tar_path, "r:gz") as tar:
-        tar.extractall(path=extract_to)
\ No newline at end of file
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+from service.utils.blob_store import blob_store, get_blob_manifest, is_manifest, referenced_blobs
+
+# Budget of the inspect folder, 0 for no limit: the least recently used backups are removed beyond it
+INSPECT_WORKSPACE_MAX_MB = int(os.getenv('INSPECT_WORKSPACE_MAX_MB', 10240))
+INSPECT_WORKSPACE_MAX_BACKUPS = int(os.getenv('INSPECT_WORKSPACE_MAX_BACKUPS', 50))
+
+
+def _disk_usage(directory: str) -> int:
+    """Bytes allocated on disk by a folder (blocks, so the many small manifests are not underestimated)"""
+    total = 0
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_blocks * 512
+        except FileNotFoundError:
+            pass
+    return total
+
+
+class InspectWorkspace:
+    """
+    Size and last access of the backups downloaded in the inspect folder, with LRU eviction beyond
+    INSPECT_WORKSPACE_MAX_MB / INSPECT_WORKSPACE_MAX_BACKUPS. The blob store of the deduplicated backups
+    counts in the budget, its unused blobs are removed with the backups. The last access is the modification
+    time of the backup folder (refreshed at each access), so it survives a restart. A backup is never evicted
+    while its lock is held by a download.
+    """
+
+    def __init__(self, root: str = config_app.app.inspect_folder,
+                 max_bytes: int = INSPECT_WORKSPACE_MAX_MB * 1024 * 1024,
+                 max_backups: int = INSPECT_WORKSPACE_MAX_BACKUPS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_backups = max_backups
+        self._sizes: Dict[str, int] = {}
+        self._blobs: Optional[Tuple[int, int]] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.evictions = 0
+
+    def _path(self, backup: str) -> str:
+        return os.path.join(self.root, backup)
+
+    def lock(self, backup: str) -> asyncio.Lock:
+        """Lock held while a backup is downloaded / extracted"""
+        return self._locks.setdefault(backup, asyncio.Lock())
+
+    def touch(self, backup: str):
+        try:
+            os.utime(self._path(backup))
+        except OSError:
+            pass
+
+    def touch_path(self, path: str):
+        """Record an access to a path of the inspect folder"""
+        relative_path = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root)).replace('\\', '/')
+        backup = relative_path.split('/')[0]
+        if backup not in ('.', '..'):
+            self.touch(backup)
+
+    def _backups(self) -> Dict[str, float]:
+        """Backup folders with their last access"""
+        try:
+            with os.scandir(self.root) as entries:
+                return {entry.name: entry.stat().st_mtime for entry in entries
+                        if entry.is_dir() and not entry.name.startswith('.')}
+        except FileNotFoundError:
+            return {}
+
+    async def _scan(self) -> Dict[str, float]:
+        backups = await asyncio.to_thread(self._backups)
+        for backup in list(self._sizes):
+            if backup not in backups:
+                del self._sizes[backup]
+        for backup in backups:
+            if backup not in self._sizes and not self.lock(backup).locked():
+                self._sizes[backup] = await asyncio.to_thread(_disk_usage, self._path(backup))
+        if self._blobs is None:
+            self._blobs = await asyncio.to_thread(blob_store.usage)
+        return backups
+
+    async def collect_blobs(self, backups: Optional[Iterable[str]] = None) -> int:
+        """
+        Remove the blobs not used by the backups (all the backup folders by default), returns the bytes freed.
+        The caller holds blob_store.lock, so no manifest is saved between the scan and the removal.
+        """
+        if backups is None:
+            backups = await asyncio.to_thread(self._backups)
+        referenced = await asyncio.to_thread(referenced_blobs, [self._path(backup) for backup in backups])
+        freed = await asyncio.to_thread(blob_store.collect, referenced)
+        self._blobs = await asyncio.to_thread(blob_store.usage)
+        return freed
+
+    async def update(self, backup: str):
+        """Measure a backup again after a download"""
+        self._sizes[backup] = await asyncio.to_thread(_disk_usage, self._path(backup))
+        self._blobs = await asyncio.to_thread(blob_store.usage)
+        self.touch(backup)
+
+    async def evict(self, backup: str) -> bool:
+        """Remove a backup, unless it is being downloaded"""
+        lock = self.lock(backup)
+        if lock.locked():
+            return False
+        async with lock:
+            await asyncio.to_thread(shutil.rmtree, self._path(backup), True)
+        self._sizes.pop(backup, None)
+        self.evictions += 1
+        logger.info(f"Inspect workspace: backup '{backup}' evicted")
+        return True
+
+    async def enforce(self, keep: Optional[str] = None) -> List[str]:
+        """Evict the least recently used backups (never `keep`) until the workspace is within the budget"""
+        backups = await self._scan()
+        total = sum(self._sizes.get(backup, 0) for backup in backups) + self._blobs[1]
+        count = len(backups)
+        evicted = []
+        for backup in sorted(backups, key=backups.get):
+            if ((not self.max_bytes or total <= self.max_bytes) and
+                    (not self.max_backups or count <= self.max_backups)):
+                break
+            size = self._sizes.get(backup, 0)
+            deduplicated = is_manifest(self._path(backup))
+            if backup != keep and await self.evict(backup):
+                evicted.append(backup)
+                total -= size
+                count -= 1
+                if deduplicated:
+                    # the backup folder is only its manifest, the space is freed in the blob store
+                    async with blob_store.lock:
+                        # scanned again under the lock: a dedupe download may have completed meanwhile
+                        total -= await self.collect_blobs()
+        return evicted
+
+    async def usage(self) -> dict:
+        backups = await self._scan()
+        items = [{'name': backup, 'bytes': self._sizes.get(backup), 'last_access':
+                  datetime.utcfromtimestamp(backups[backup]).isoformat(), 'locked': self.lock(backup).locked()}
+                 for backup in sorted(backups, key=backups.get, reverse=True)]
+        blobs, blob_bytes = self._blobs
+        # bytes of the files of the deduplicated backups / bytes stored for them
+        logical_bytes = await asyncio.to_thread(self._logical_bytes, backups)
+        return {'backups': items, 'count': len(items),
+                'bytes': sum(item['bytes'] or 0 for item in items) + blob_bytes,
+                'blobs': {'count': blobs, 'bytes': blob_bytes, 'logical_bytes': logical_bytes,
+                          'dedupe_ratio': round(logical_bytes / blob_bytes, 2) if blob_bytes else None},
+                'max_bytes': self.max_bytes or None, 'max_backups': self.max_backups or None,
+                'evictions': self.evictions}
+
+    def _logical_bytes(self, backups: Iterable[str]) -> int:
+        total = 0
+        for backup in backups:
+            if is_manifest(self._path(backup)):
+                total += sum(size for _, size in get_blob_manifest(self._path(backup)).members.values())
+        return total
+
+
+inspect_workspace = InspectWorkspace()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import tempfile
+import uuid
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+from vui_common.logger.logger_proxy import logger
+
+from service.utils.log_stream import LOG_CHUNK_SIZE
+
+# Directory of the cached .gz logs of the completed backups / restores, empty to disable the cache
+LOG_CACHE_DIR = os.getenv('LOG_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'velero-ui-logs'))
+LOG_CACHE_MB = int(os.getenv('LOG_CACHE_MB', 1024))
+
+# Log kind of the resources whose deletion invalidates the cached logs
+_PLURAL_LOG_KINDS = {
+    'backups': 'BackupLog',
+    'restores': 'RestoreLog'
+}
+
+
+class LogContentCache:
+    """
+    Original .gz logs of the completed backups and restores stored under LOG_CACHE_DIR, keyed by resource uid
+    and log kind, so a log is downloaded once. The files are evicted in LRU order (modification time,
+    refreshed at each hit) beyond LOG_CACHE_MB, and removed when the resource is deleted: the cache is
+    a listener of K8sResourceCache.
+    """
+
+    def __init__(self, directory: str = LOG_CACHE_DIR, max_bytes: int = LOG_CACHE_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # files and bytes in the cache, counted by each scan (trim, reset) and kept up to date by the removals,
+        # so info() does not scan the directory; None before the first scan
+        self._count: Optional[int] = None
+        self._bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.max_bytes > 0
+
+    def _path(self, uid: str, log_kind: str) -> str:
+        return os.path.join(self.directory, f"{uid}-{log_kind.lower()}.gz")
+
+    def _files(self) -> List[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.gz')]
+        except FileNotFoundError:
+            return []
+
+    def _scan(self) -> List[os.DirEntry]:
+        entries = self._files()
+        self._count, self._bytes = len(entries), sum(entry.stat().st_size for entry in entries)
+        return entries
+
+    def _discount(self, size: int):
+        if self._count is not None:
+            self._count -= 1
+            self._bytes -= size
+
+    def _trim(self):
+        entries = sorted(self._scan(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            self._discount(size)
+            self.evictions += 1
+
+    def _remove(self, path: str):
+        try:
+            size = os.stat(path).st_size
+            os.remove(path)
+            self._discount(size)
+            self.invalidations += 1
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------------------------------------
+    #             READ / STORE
+    # ------------------------------------------------------------------------------------------------
+
+    def read(self, uid: str, log_kind: str) -> Optional[AsyncIterator[bytes]]:
+        """Chunks of the cached log, None on a miss"""
+        path = self._path(uid, log_kind)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._read_file(path)
+
+    @staticmethod
+    async def _read_file(path: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(path, 'rb') as file:
+            while chunk := await file.read(LOG_CHUNK_SIZE):
+                yield chunk
+
+    async def store(self, uid: str, log_kind: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Pass the downloaded chunks through while writing them to the cache; the file is published only
+        when the download is complete, a partial one (consumer stopped early or error) is discarded
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(uid, log_kind)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        complete = False
+        try:
+            async with aiofiles.open(temp_path, 'wb') as file:
+                async for chunk in chunks:
+                    await file.write(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if hasattr(chunks, 'aclose'):
+                await chunks.aclose()
+            if complete:
+                os.replace(temp_path, path)
+                self.stores += 1
+                try:
+                    await asyncio.to_thread(self._trim)
+                except OSError as e:
+                    logger.warning(f"Log cache trim failed: {e}")
+            elif os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    # ------------------------------------------------------------------------------------------------
+    #             CACHE LISTENER
+    # ------------------------------------------------------------------------------------------------
+
+    def update(self, plural: str, old_item: Optional[dict], new_item: Optional[dict]):
+        if not self.enabled or plural not in _PLURAL_LOG_KINDS or new_item is not None or old_item is None:
+            return
+        uid = old_item.get('metadata', {}).get('uid')
+        if uid:
+            self._remove(self._path(uid, _PLURAL_LOG_KINDS[plural]))
+
+    def reset(self, plural: str, items: List[dict]):
+        """Remove the logs of the resources deleted while the watch was not running"""
+        if not self.enabled or plural not in _PLURAL_LOG_KINDS:
+            return
+        suffix = f"-{_PLURAL_LOG_KINDS[plural].lower()}.gz"
+        uids = {item.get('metadata', {}).get('uid') for item in items}
+        for entry in self._scan():
+            if entry.name.endswith(suffix) and entry.name[:-len(suffix)] not in uids:
+                self._remove(entry.path)
+
+    def info(self) -> dict:
+        return {'enabled': self.enabled, 'files': self._count if self.enabled else 0,
+                'bytes': self._bytes if self.enabled else 0,
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses, 'stores': self.stores,
+                'evictions': self.evictions, 'invalidations': self.invalidations}
+
+
+log_content_cache = LogContentCache()
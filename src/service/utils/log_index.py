@@ -0,0 +1,275 @@
+import asyncio
+import os
+import pickle
+import sys
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vui_common.logger.logger_proxy import logger
+
+from service.utils.log_stream import LogQuery, error_words, parse_log_line
+
+# Memory budget of the indexed logs (LRU), a log bigger than the budget is not indexed
+LOG_INDEX_MEMORY_MB = int(os.getenv('LOG_INDEX_MEMORY_MB', 256))
+# Directory of the indexes evicted from memory, empty to disable the disk tier
+LOG_INDEX_DIR = os.getenv('LOG_INDEX_DIR', '')
+LOG_INDEX_DISK_MB = int(os.getenv('LOG_INDEX_DISK_MB', 2048))
+
+# Lines parsed in a worker thread at a time while building an index
+_BUILD_BATCH = 10000
+
+INDEXED_FIELDS = ('level', 'resource', 'namespace')
+
+
+class LogTooLarge(Exception):
+    pass
+
+
+class LogIndex:
+    """
+    Columnar store of an immutable Velero log with inverted indexes.
+
+    The lines are kept in a single string with their start offsets; the level, resource and namespace
+    fields of the logrus key=value lines and the words of the error text are indexed as sorted arrays of
+    line indexes, so a query only reads the candidate lines of the intersection of its posting lists.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.text = ''
+        self.offsets = array('Q', [0])
+        self.postings: Dict[str, Dict[str, array]] = {field: {} for field in (*INDEXED_FIELDS, 'error')}
+        self._lines: List[str] = []
+        self._max_size = max_size
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getstate__(self):
+        return {'text': self.text, 'offsets': self.offsets, 'postings': self.postings}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, _lines=[], _max_size=None)
+
+    # ------------------------------------------------------------------------------------------------
+    #             BUILD
+    # ------------------------------------------------------------------------------------------------
+
+    def _add_lines(self, lines: List[str]):
+        for line in lines:
+            index = len(self.offsets) - 1
+            self.offsets.append(self.offsets[-1] + len(line) + 1)
+            if self._max_size is not None and self.offsets[-1] > self._max_size:
+                raise LogTooLarge()
+            self._lines.append(line)
+
+            fields = parse_log_line(line)
+            for field in INDEXED_FIELDS:
+                value = fields.get(field)
+                if value:
+                    self.postings[field].setdefault(value.lower() if field == 'level' else value,
+                                                    array('I')).append(index)
+            for word in error_words(fields):
+                self.postings['error'].setdefault(word, array('I')).append(index)
+
+    @classmethod
+    async def build(cls, lines: AsyncIterator[str], max_size: Optional[int] = None) -> 'LogIndex':
+        """Index the lines of a log, parsing them in a worker thread one batch at a time"""
+        index = cls(max_size)
+        batch = []
+        try:
+            async for line in lines:
+                batch.append(line)
+                if len(batch) >= _BUILD_BATCH:
+                    await asyncio.to_thread(index._add_lines, batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(index._add_lines, batch)
+        finally:
+            if hasattr(lines, 'aclose'):
+                await lines.aclose()
+
+        index.text = '\n'.join(index._lines) + '\n' if index._lines else ''
+        index._lines = []
+        return index
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes"""
+        postings = sum(len(values) * 4 + 100 for field in self.postings.values() for values in field.values())
+        return sys.getsizeof(self.text) + len(self.offsets) * 8 + postings
+
+    # ------------------------------------------------------------------------------------------------
+    #             QUERY
+    # ------------------------------------------------------------------------------------------------
+
+    def line(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1] - 1]
+
+    def _candidates(self, query: LogQuery) -> Iterable[int]:
+        """Sorted indexes of the lines satisfying the indexed filters of the query"""
+        lists = []
+        if query.levels:
+            lists.append(sorted(index for level in query.levels
+                                for index in self.postings['level'].get(level, ())))
+        for field in ('resource', 'namespace'):
+            value = getattr(query, field)
+            if value:
+                lists.append(self.postings[field].get(value, ()))
+        for word in query.error_words or ():
+            lists.append(self.postings['error'].get(word, ()))
+
+        if not lists:
+            return range(len(self))
+        lists.sort(key=len)
+        selected = set(lists[0])
+        for values in lists[1:]:
+            selected.intersection_update(values)
+            if not selected:
+                break
+        return sorted(selected)
+
+    def _matching(self, indexes: Iterable[int], query: LogQuery) -> Iterator[Tuple[int, str]]:
+        for index in indexes:
+            line = self.line(index)
+            if query.search and query.search not in line:
+                continue
+            if query.regex is not None and query.regex.search(line) is None:
+                continue
+            yield index + 1, line
+
+    def select(self, query: LogQuery) -> List[Tuple[int, str]]:
+        """(line number, line) of the lines selected by the query, same result as LogQuery.apply on the log"""
+        if query.limit == 0:
+            return []
+        candidates = self._candidates(query)
+        if query.tail is not None:
+            # the last matching lines, scanning the candidates backwards
+            records = list(islice(self._matching(reversed(candidates), query), query.tail))[::-1]
+        else:
+            records = self._matching(candidates, query)
+        stop = None if query.limit is None else query.offset + query.limit
+        return list(islice(records, query.offset, stop))
+
+
+class LogIndexCache:
+    """
+    LRU of the log indexes within LOG_INDEX_MEMORY_MB, keyed by (resource uid, log kind): logs are
+    immutable once the resource is completed. With LOG_INDEX_DIR set, the indexes are also saved on disk
+    (LRU on the file modification time within LOG_INDEX_DISK_MB) and reloaded instead of rebuilt.
+    Concurrent requests for the same log share the same build.
+    """
+
+    def __init__(self, memory_bytes: int = LOG_INDEX_MEMORY_MB * 1024 * 1024, directory: str = LOG_INDEX_DIR,
+                 disk_bytes: int = LOG_INDEX_DISK_MB * 1024 * 1024):
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self._indexes: OrderedDict = OrderedDict()
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._building: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def memory_size(self) -> int:
+        return sum(self._sizes.values())
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.directory, f"{key[0]}-{key[1].lower()}.idx")
+
+    def _keep(self, key: Tuple[str, str], index: LogIndex):
+        self._indexes[key] = index
+        self._sizes[key] = index.size
+        while self.memory_size > self.memory_bytes and len(self._indexes) > 1:
+            evicted, _ = self._indexes.popitem(last=False)
+            del self._sizes[evicted]
+            self.evictions += 1
+
+    # ------------------------------------------------------------------------------------------------
+    #             DISK
+    # ------------------------------------------------------------------------------------------------
+
+    def _load(self, key: Tuple[str, str]) -> Optional[LogIndex]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                index = pickle.load(file)
+            os.utime(path)
+            return index
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Log index {path} not readable, rebuilding it: {e}")
+            return None
+
+    def _save(self, key: Tuple[str, str], index: LogIndex):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        with open(f"{path}.tmp", 'wb') as file:
+            pickle.dump(index, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+
+        entries = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith('.idx')),
+                         key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries[:-1]:
+            if total <= self.disk_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    # ------------------------------------------------------------------------------------------------
+    #             READ
+    # ------------------------------------------------------------------------------------------------
+
+    async def get(self, key: Tuple[str, str],
+                  lines_factory: Callable[[], Awaitable[AsyncIterator[str]]]) -> Optional[LogIndex]:
+        """The index of a log, built from `lines_factory()` if needed; None if the log exceeds the budget"""
+        index = self._indexes.get(key)
+        if index is not None:
+            self.hits += 1
+            self._indexes.move_to_end(key)
+            return index
+
+        task = self._building.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._load_or_build(key, lines_factory))
+            self._building[key] = task
+            task.add_done_callback(lambda done: self._building.pop(key) if self._building.get(key) is done else None)
+        return await asyncio.shield(task)
+
+    async def _load_or_build(self, key: Tuple[str, str],
+                             lines_factory: Callable[[], Awaitable[AsyncIterator[str]]]) -> Optional[LogIndex]:
+        if self.directory:
+            index = await asyncio.to_thread(self._load, key)
+            if index is not None:
+                self.disk_hits += 1
+                self._keep(key, index)
+                return index
+
+        self.misses += 1
+        try:
+            index = await LogIndex.build(await lines_factory(), max_size=self.memory_bytes)
+        except LogTooLarge:
+            logger.info(f"Log {key} larger than the log index budget, not indexed")
+            return None
+
+        self._keep(key, index)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._save, key, index)
+            except OSError as e:
+                logger.warning(f"Log index {key} not saved on disk: {e}")
+        return index
+
+    def info(self) -> dict:
+        return {'size': len(self._indexes), 'memory_bytes': self.memory_size, 'max_memory_bytes': self.memory_bytes,
+                'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'evictions': self.evictions,
+                'directory': self.directory or None}
+
+
+log_index_cache = LogIndexCache()
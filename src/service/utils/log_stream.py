@@ -0,0 +1,192 @@
+import codecs
+import os
+import re
+import zlib
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+from fastapi import HTTPException
+
+# Size of the chunks read from the download
+LOG_CHUNK_SIZE = int(os.getenv('LOG_CHUNK_SIZE', 256 * 1024))
+
+ACCEPTED_MIME_TYPES = [
+    "application/gzip",
+    "binary/octet-stream",
+    "application/octet-stream"
+]
+
+LOG_LEVELS = ('trace', 'debug', 'info', 'warning', 'error', 'fatal', 'panic')
+
+_LEVEL_RE = re.compile(r'\blevel=(\w+)')
+# logrus text format: key=value or key="quoted value"
+_FIELD_RE = re.compile(r'([\w.]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_WORD_RE = re.compile(r'\w+')
+
+ERROR_LEVELS = ('error', 'fatal', 'panic')
+
+
+async def iter_url_chunks(url: str, mime_types: Optional[List[str]] = ACCEPTED_MIME_TYPES) -> AsyncIterator[bytes]:
+    """
+    Chunked download of a gzip object: the bytes are yielded as received, never decompressed by the client
+    (a storage serving the object with Content-Encoding: gzip would make aiohttp inflate it otherwise).
+    The Content-Type is checked against `mime_types` unless None.
+    """
+    async with aiohttp.ClientSession(auto_decompress=False) as session:
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise HTTPException(status_code=400, detail=f"Download error: {response.status}")
+
+            # Check the type of content
+            mime_type = response.headers.get("Content-Type", "").split(";")[0]
+            if mime_types is not None and mime_type not in mime_types:
+                raise HTTPException(status_code=400, detail=f"Invalid response: Unsupported mime type '{mime_type}'")
+
+            async for chunk in response.content.iter_chunked(LOG_CHUNK_SIZE):
+                yield chunk
+
+
+async def iter_gzip_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Lines of a gzip stream, decompressed and decoded incrementally: only one chunk and the current partial
+    line are kept in memory. Concatenated gzip members are supported.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+
+    try:
+        async for chunk in chunks:
+            data = decompressor.decompress(chunk)
+            while decompressor.eof and decompressor.unused_data:
+                unused_data = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                data += decompressor.decompress(unused_data)
+
+            lines = (pending + decoder.decode(data)).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line
+    finally:
+        # stop the download when the consumer stops early
+        if hasattr(chunks, 'aclose'):
+            await chunks.aclose()
+
+    pending += decoder.decode(decompressor.flush(), final=True)
+    if pending:
+        yield pending
+
+
+def log_level(line: str) -> Optional[str]:
+    match = _LEVEL_RE.search(line)
+    return match.group(1).lower() if match else None
+
+
+def parse_log_line(line: str) -> Dict[str, str]:
+    """Fields of a logrus key=value line (time, level, msg, backup, resource, namespace, error...)"""
+    fields = {}
+    for key, value in _FIELD_RE.findall(line):
+        if value.startswith('"') and len(value) > 1:
+            value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        fields[key] = value
+    return fields
+
+
+def error_words(fields: Dict[str, str]) -> Set[str]:
+    """Lowercase words of the error text of a line: the error field and the message of the error lines"""
+    text = fields.get('error') or fields.get('err') or ''
+    if (fields.get('level') or '').lower() in ERROR_LEVELS:
+        text = f"{fields.get('msg', '')} {text}"
+    return set(_WORD_RE.findall(text.lower()))
+
+
+class LogQuery:
+    """
+    Selection of the lines of a log: the filters first (level, resource, namespace, words of the error
+    text, substring, regex), then `tail` (the last matching lines) and the `offset` / `limit` window over
+    the matching lines.
+    """
+
+    def __init__(self, offset: int = 0, limit: Optional[int] = None, tail: Optional[int] = None,
+                 level: Optional[str] = None, search: Optional[str] = None, regex: Optional[str] = None,
+                 resource: Optional[str] = None, namespace: Optional[str] = None, error: Optional[str] = None):
+        if offset < 0 or (limit is not None and limit < 0) or (tail is not None and tail < 0):
+            raise HTTPException(status_code=400, detail="offset, limit and tail must be positive")
+        self.offset = offset
+        self.limit = limit
+        self.tail = tail
+
+        self.levels = {item.strip().lower() for item in level.split(',') if item.strip()} if level else None
+        if self.levels and not self.levels <= set(LOG_LEVELS):
+            raise HTTPException(status_code=400, detail=f"Unsupported log level: {level}")
+        self.resource = resource or None
+        self.namespace = namespace or None
+        self.error_words = set(_WORD_RE.findall(error.lower())) if error else None
+        self.search = search or None
+        try:
+            self.regex = re.compile(regex) if regex else None
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid regex '{regex}': {e}")
+
+    @property
+    def selects_all(self) -> bool:
+        """True when every line of the log is selected"""
+        return (not self.offset and self.limit is None and self.tail is None and not self.levels and
+                not self.resource and not self.namespace and not self.error_words and not self.search and
+                self.regex is None)
+
+    def matches(self, line: str) -> bool:
+        if self.search and self.search not in line:
+            return False
+        if self.levels and log_level(line) not in self.levels:
+            return False
+        if self.resource or self.namespace or self.error_words:
+            fields = parse_log_line(line)
+            if self.resource and fields.get('resource') != self.resource:
+                return False
+            if self.namespace and fields.get('namespace') != self.namespace:
+                return False
+            if self.error_words and not self.error_words <= error_words(fields):
+                return False
+        return self.regex is None or self.regex.search(line) is not None
+
+    async def apply(self, lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield (line number starting from 1, line) of the selected lines. Without `tail` the iteration
+        stops (closing the source) as soon as `limit` lines are produced.
+        """
+        if self.limit == 0:
+            return
+
+        selected = self._matching(lines)
+        if self.tail is not None:
+            last = deque(maxlen=self.tail)
+            async for item in selected:
+                last.append(item)
+            for index, item in enumerate(last):
+                if index >= self.offset and (self.limit is None or index < self.offset + self.limit):
+                    yield item
+            return
+
+        index = 0
+        try:
+            async for item in selected:
+                if index >= self.offset:
+                    yield item
+                index += 1
+                if self.limit is not None and index >= self.offset + self.limit:
+                    break
+        finally:
+            await selected.aclose()
+
+    async def _matching(self, lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, str]]:
+        number = 0
+        try:
+            async for line in lines:
+                number += 1
+                if self.matches(line):
+                    yield number, line
+        finally:
+            if hasattr(lines, 'aclose'):
+                await lines.aclose()
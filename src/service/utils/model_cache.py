@@ -0,0 +1,88 @@
+import os
+from typing import Generic, List, Optional, Tuple, Type, TypeVar
+
+from cachetools import LRUCache
+from pydantic import BaseModel, TypeAdapter
+
+# Max number of validated objects kept for each resource kind
+MODEL_CACHE_MAXSIZE = int(os.getenv('MODEL_CACHE_MAXSIZE', 50000))
+
+ModelType = TypeVar('ModelType', bound=BaseModel)
+
+
+class _Entry:
+    __slots__ = ('model', 'dumps')
+
+    def __init__(self, model: BaseModel):
+        self.model = model
+        self.dumps = {}
+
+
+class ModelCache(Generic[ModelType]):
+    """
+    Memoized conversion of Kubernetes objects to pydantic models.
+
+    A validated model (and its model_dump output) is reused while the (uid, resourceVersion) of the object
+    does not change; the entries are evicted in LRU order. The returned models and dicts are shared,
+    callers must treat them as read-only.
+    """
+
+    def __init__(self, model: Type[ModelType], maxsize: int = MODEL_CACHE_MAXSIZE):
+        self.model = model
+        self._adapter = TypeAdapter(List[model])
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(metadata) -> Optional[Tuple[str, str]]:
+        if isinstance(metadata, dict):
+            uid, resource_version = metadata.get('uid'), metadata.get('resourceVersion')
+        else:
+            uid, resource_version = getattr(metadata, 'uid', None), getattr(metadata, 'resourceVersion', None)
+        return (uid, resource_version) if uid and resource_version else None
+
+    def validate(self, items: List[dict]) -> List[ModelType]:
+        """Convert a list of objects, validating only the ones not cached in one TypeAdapter call"""
+        models: List[Optional[ModelType]] = [None] * len(items)
+        missing = []
+        for index, item in enumerate(items):
+            key = self._key(item.get('metadata'))
+            entry = self._entries.get(key) if key else None
+            if entry is not None:
+                self.hits += 1
+                models[index] = entry.model
+            else:
+                self.misses += 1
+                missing.append((index, key))
+
+        if missing:
+            validated = self._adapter.validate_python([items[index] for index, _ in missing])
+            for (index, key), model in zip(missing, validated):
+                models[index] = model
+                if key:
+                    self._entries[key] = _Entry(model)
+
+        return models
+
+    def validate_one(self, item: dict) -> ModelType:
+        return self.validate([item])[0]
+
+    def dump(self, model: ModelType, **kwargs) -> dict:
+        """model.model_dump(**kwargs), reusing the output computed for the same object version"""
+        key = self._key(getattr(model, 'metadata', None))
+        entry = self._entries.get(key) if key else None
+        if entry is None or entry.model is not model:
+            return model.model_dump(**kwargs)
+
+        dump_key = tuple(sorted(kwargs.items()))
+        if dump_key not in entry.dumps:
+            entry.dumps[dump_key] = model.model_dump(**kwargs)
+        return entry.dumps[dump_key]
+
+    def dump_many(self, models: List[ModelType], **kwargs) -> List[dict]:
+        return [self.dump(model, **kwargs) for model in models]
+
+    def info(self) -> dict:
+        return {'size': len(self._entries), 'maxsize': self._entries.maxsize, 'hits': self.hits,
+                'misses': self.misses}
@@ -0,0 +1,123 @@
+import json
+import os
+import tarfile
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Uncompressed backup contents kept by the inspect 'archive' mode, with its index next to it
+ARCHIVE_NAME = '.contents.tar'
+INDEX_NAME = '.contents.tar.index.json'
+
+# Loaded indexes kept in memory
+_INDEX_CACHE_SIZE = 16
+
+
+def member_name(name: str) -> str:
+    return name[2:] if name.startswith('./') else name
+
+
+class TarIndex:
+    """
+    Random access to the members of an uncompressed tar: member name -> (offset, size) of its data, built
+    with one scan of the headers and persisted next to the archive, so members are read with a single
+    pread instead of being extracted.
+    """
+
+    def __init__(self, archive: str, members: Dict[str, Tuple[int, int]]):
+        self.archive = archive
+        self.members = members
+        self._tree: Optional[dict] = None
+
+    @classmethod
+    def build(cls, archive: str) -> 'TarIndex':
+        members = {}
+        with tarfile.open(archive, mode='r:') as tar:
+            for member in tar:
+                if member.isfile():
+                    members[member_name(member.name)] = (member.offset_data, member.size)
+        return cls(archive, members)
+
+    @staticmethod
+    def index_path(archive: str) -> str:
+        return os.path.join(os.path.dirname(archive), INDEX_NAME)
+
+    def save(self):
+        path = self.index_path(self.archive)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+            json.dump({'archive_size': os.path.getsize(self.archive), 'members': self.members}, file)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, archive: str) -> Optional['TarIndex']:
+        """The persisted index of an archive, None if missing or not matching the archive anymore"""
+        try:
+            with open(cls.index_path(archive), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get('archive_size') != os.path.getsize(archive):
+            return None
+        return cls(archive, {name: tuple(value) for name, value in data['members'].items()})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def names(self) -> Iterator[str]:
+        return iter(self.members)
+
+    def tree(self) -> dict:
+        """Folders of the members (see members_tree), computed once"""
+        if self._tree is None:
+            self._tree = members_tree(self.members)
+        return self._tree
+
+    def read(self, name: str) -> bytes:
+        offset, size = self.members[name]
+        with open(self.archive, 'rb') as file:
+            return os.pread(file.fileno(), size, offset)
+
+
+_indexes: OrderedDict = OrderedDict()
+
+
+def archive_path(directory: str) -> str:
+    return os.path.join(directory, ARCHIVE_NAME)
+
+
+def is_archive(directory: str) -> bool:
+    """Whether an inspected backup is kept as an archive (see TarIndex)"""
+    return os.path.isfile(archive_path(directory))
+
+
+def get_tar_index(directory: str) -> TarIndex:
+    """
+    Index of the archive of an inspected backup: from memory, else the persisted one, else rebuilt
+    (a restart does not rescan the archive)
+    """
+    archive = archive_path(directory)
+    key = (archive, os.path.getmtime(archive))
+    index = _indexes.get(key)
+    if index is not None:
+        _indexes.move_to_end(key)
+        return index
+
+    index = TarIndex.load(archive)
+    if index is None:
+        index = TarIndex.build(archive)
+        index.save()
+    _indexes[key] = index
+    while len(_indexes) > _INDEX_CACHE_SIZE:
+        _indexes.popitem(last=False)
+    return index
+
+
+def members_tree(names: Iterable[str]) -> dict:
+    """Nested dict of the member paths: directory name -> children, file name -> None"""
+    tree = {}
+    for name in names:
+        node = tree
+        *folders, file_name = name.split('/')
+        for folder in folders:
+            node = node.setdefault(folder, {})
+        node[file_name] = None
+    return tree
@@ -0,0 +1,298 @@
+import asyncio
+import gzip
+import io
+import json
+import os
+import tarfile
+import time
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi import HTTPException
+from vui_common.configs.config_proxy import config_app
+from vui_common.contexts.context import current_user_var, cp_user
+from vui_common.logger.logger_proxy import logger
+from vui_common.ws import ws_manager_proxy
+
+from integrations import nats_manager_proxy
+from service.utils.blob_store import BlobManifest, BlobStore
+from service.utils.tar_index import member_name
+from service.utils.log_stream import iter_url_chunks
+
+# Max bytes extracted from a backup tarball, 0 for no limit
+BACKUP_EXTRACT_MAX_MB = int(os.getenv('BACKUP_EXTRACT_MAX_MB', 0))
+# Min seconds between two progress events of an extraction
+BACKUP_EXTRACT_PROGRESS_SEC = float(os.getenv('BACKUP_EXTRACT_PROGRESS_SEC', 1))
+
+# Size of the uncompressed blocks written when the archive is kept as a tar
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+
+class ExtractQuotaExceeded(Exception):
+    pass
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    Read-only file object over an async iterator of bytes, read by tarfile in a worker thread: each read
+    pulls the next chunk from the event loop, so the download advances only as fast as the extraction.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = b''
+        self._pending = None
+        self._aborted = False
+        self.downloaded = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            if self._aborted:
+                raise OSError("extraction aborted")
+            self._pending = asyncio.run_coroutine_threadsafe(anext(self._chunks, b''), self._loop)
+            chunk = self._pending.result()
+            if not chunk:
+                return 0
+            self.downloaded += len(chunk)
+            self._buffer = chunk
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def abort(self):
+        """Stop the reads of the worker thread (called from the event loop)"""
+        self._aborted = True
+        if self._pending is not None:
+            self._pending.cancel()
+
+
+def _selected(name: str, members: Optional[List[str]]) -> bool:
+    """Whether a member matches one of the glob patterns (`*` also matches '/')"""
+    return not members or any(fnmatchcase(name, pattern) for pattern in members)
+
+
+def _extract(reader: _ChunkReader, destination: str, members: Optional[List[str]], max_bytes: Optional[int],
+             report: Callable[[dict], None]) -> dict:
+    stats = {'members': 0, 'bytes': 0, 'downloaded': 0}
+    # the 'data' filter rejects absolute paths, links out of the destination and special files
+    extract_filter = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+        for member in tar:
+            if not _selected(member_name(member.name), members):
+                continue
+            if member.isfile():
+                stats['bytes'] += member.size
+                if max_bytes and stats['bytes'] > max_bytes:
+                    raise ExtractQuotaExceeded(f"extraction exceeds {max_bytes} bytes")
+            tar.extract(member, destination, **extract_filter)
+            stats['members'] += 1
+            stats['downloaded'] = reader.downloaded
+            report(stats)
+    stats['downloaded'] = reader.downloaded
+    return stats
+
+
+async def _read_in_thread(chunks: AsyncIterator[bytes], work: Callable[[_ChunkReader], dict]) -> dict:
+    """Run `work` on a reader of the chunks in a worker thread; a cancelled request stops it and the download"""
+    reader = _ChunkReader(chunks, asyncio.get_running_loop())
+    task = asyncio.ensure_future(asyncio.to_thread(work, reader))
+    try:
+        return await asyncio.shield(task)
+    finally:
+        reader.abort()
+        await asyncio.gather(task, return_exceptions=True)
+        await chunks.aclose()
+
+
+def _reporter(progress: Optional[ProgressCallback]) -> Callable[[dict], None]:
+    """Thread-safe wrapper of a progress callback, throttled to one event every BACKUP_EXTRACT_PROGRESS_SEC"""
+    loop = asyncio.get_running_loop()
+    last_report = [0.0]
+
+    def report(stats: dict):
+        now = time.monotonic()
+        if progress is not None and now - last_report[0] >= BACKUP_EXTRACT_PROGRESS_SEC:
+            last_report[0] = now
+            asyncio.run_coroutine_threadsafe(progress({**stats, 'completed': False}), loop)
+
+    return report
+
+
+async def extract_stream(chunks: AsyncIterator[bytes], destination: str, members: Optional[List[str]] = None,
+                         max_bytes: Optional[int] = None, progress: Optional[ProgressCallback] = None) -> dict:
+    """
+    Extract a .tar.gz stream into `destination` while it is downloaded: tarfile reads the chunks in stream
+    mode ('r|gz') in a worker thread, so no tarball is written on disk and the event loop is never blocked.
+
+    :param members: glob patterns of the members to extract (e.g. 'resources/persistentvolumeclaims/*'), all if None
+    :param max_bytes: max size of the extracted files, ExtractQuotaExceeded beyond it
+    :param progress: coroutine called with the counters at most every BACKUP_EXTRACT_PROGRESS_SEC seconds
+    :return: counters of the extraction (members, bytes, downloaded)
+    """
+    os.makedirs(destination, exist_ok=True)
+    report = _reporter(progress)
+    stats = await _read_in_thread(chunks, lambda reader: _extract(reader, destination, members, max_bytes, report))
+
+    if progress is not None:
+        await progress({**stats, 'completed': True})
+    return stats
+
+
+def _decompress(reader: _ChunkReader, path: str, max_bytes: Optional[int], report: Callable[[dict], None]) -> dict:
+    stats = {'bytes': 0, 'downloaded': 0}
+    with gzip.GzipFile(fileobj=reader, mode='rb') as source, open(path, 'wb') as target:
+        while data := source.read(DECOMPRESS_CHUNK_SIZE):
+            target.write(data)
+            stats['bytes'] += len(data)
+            if max_bytes and stats['bytes'] > max_bytes:
+                raise ExtractQuotaExceeded(f"archive exceeds {max_bytes} bytes")
+            stats['downloaded'] = reader.downloaded
+            report(stats)
+    stats['downloaded'] = reader.downloaded
+    return stats
+
+
+async def decompress_stream(chunks: AsyncIterator[bytes], path: str, max_bytes: Optional[int] = None,
+                            progress: Optional[ProgressCallback] = None) -> dict:
+    """
+    Write a .tar.gz stream to `path` as an uncompressed tar while it is downloaded (see extract_stream),
+    the file is replaced only once complete
+
+    :return: counters of the decompression (bytes, downloaded)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    report = _reporter(progress)
+    temp_path = f"{path}.tmp"
+    try:
+        stats = await _read_in_thread(chunks, lambda reader: _decompress(reader, temp_path, max_bytes, report))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    if progress is not None:
+        await progress({**stats, 'completed': True})
+    return stats
+
+
+async def extract_url(url: str, destination: str, members: Optional[List[str]] = None,
+                      max_bytes: Optional[int] = BACKUP_EXTRACT_MAX_MB * 1024 * 1024,
+                      progress: Optional[ProgressCallback] = None) -> dict:
+    """Download a .tar.gz from a (signed) URL and extract it on the fly, see extract_stream"""
+    try:
+        return await extract_stream(iter_url_chunks(url, mime_types=None), destination, members=members,
+                                    max_bytes=max_bytes or None, progress=progress)
+    except ExtractQuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=f"Backup too large: {e}")
+    except tarfile.TarError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid backup archive: {e}")
+
+
+async def decompress_url(url: str, path: str, max_bytes: Optional[int] = BACKUP_EXTRACT_MAX_MB * 1024 * 1024,
+                         progress: Optional[ProgressCallback] = None) -> dict:
+    """Download a .tar.gz from a (signed) URL into an uncompressed tar, see decompress_stream"""
+    try:
+        return await decompress_stream(iter_url_chunks(url, mime_types=None), path, max_bytes=max_bytes or None,
+                                       progress=progress)
+    except ExtractQuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=f"Backup too large: {e}")
+    except (gzip.BadGzipFile, EOFError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid backup archive: {e}")
+
+
+def _dedupe(reader: _ChunkReader, store: BlobStore, members: dict, claimed: set, max_bytes: Optional[int],
+            report: Callable[[dict], None]) -> dict:
+    stats = {'members': 0, 'bytes': 0, 'stored': 0, 'stored_bytes': 0, 'downloaded': 0}
+    with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            stats['bytes'] += member.size
+            if max_bytes and stats['bytes'] > max_bytes:
+                raise ExtractQuotaExceeded(f"backup exceeds {max_bytes} bytes")
+            data = tar.extractfile(member).read()
+            digest, stored = store.put(data, claimed)
+            members[member_name(member.name)] = (digest, member.size)
+            stats['members'] += 1
+            if stored:
+                stats['stored'] += 1
+                stats['stored_bytes'] += member.size
+            stats['downloaded'] = reader.downloaded
+            report(stats)
+    stats['downloaded'] = reader.downloaded
+    return stats
+
+
+async def dedupe_stream(chunks: AsyncIterator[bytes], store: BlobStore, directory: str,
+                        max_bytes: Optional[int] = None, progress: Optional[ProgressCallback] = None) -> dict:
+    """
+    Store the files of a .tar.gz stream in the blob store while it is downloaded (see extract_stream), only
+    the contents not already stored are written; the backup folder gets the manifest path -> blob
+
+    :return: counters (members, bytes, stored: new blobs, stored_bytes, downloaded)
+    """
+    report = _reporter(progress)
+    members = {}
+    # the claim keeps the blobs until the manifest is saved, the lock is held only by the save
+    with store.claim() as claimed:
+        stats = await _read_in_thread(chunks, lambda reader: _dedupe(reader, store, members, claimed, max_bytes,
+                                                                     report))
+        async with store.lock:
+            await asyncio.to_thread(BlobManifest(directory, members, store).save)
+
+    if progress is not None:
+        await progress({**stats, 'completed': True})
+    return stats
+
+
+async def dedupe_url(url: str, store: BlobStore, directory: str,
+                     max_bytes: Optional[int] = BACKUP_EXTRACT_MAX_MB * 1024 * 1024,
+                     progress: Optional[ProgressCallback] = None) -> dict:
+    """Download a .tar.gz from a (signed) URL into the blob store, see dedupe_stream"""
+    try:
+        return await dedupe_stream(iter_url_chunks(url, mime_types=None), store, directory,
+                                   max_bytes=max_bytes or None, progress=progress)
+    except ExtractQuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=f"Backup too large: {e}")
+    except tarfile.TarError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid backup archive: {e}")
+
+
+def user_progress(kind: str, name: str) -> ProgressCallback:
+    """Progress callback sending the events to the WebSocket (or NATS) of the user of the current request"""
+    try:
+        user = current_user_var.get()
+    except LookupError:
+        user = None
+    control_plane_user = cp_user.get(None) if user is not None and getattr(user, 'is_nats', False) else None
+
+    async def send(stats: dict):
+        if user is None:
+            return
+        message = json.dumps({
+            'type': kind,
+            'kind': 'progress',
+            'payload': {'name': name, **stats},
+            'timestamp': datetime.utcnow().isoformat(),
+            'agent_name': config_app.k8s.cluster_id
+        })
+        try:
+            if config_app.nats.enable and getattr(user, 'is_nats', False):
+                data = {'user': control_plane_user, 'msg': message}
+                await nats_manager_proxy.nat_manager.publish("socket." + config_app.k8s.cluster_id,
+                                                             json.dumps(data).encode())
+            else:
+                await ws_manager_proxy.ws_manager.send_personal_message(str(user.id), message)
+        except Exception as e:
+            logger.warning(f"{kind} progress of '{name}' not sent: {e}")
+
+    return send
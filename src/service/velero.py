@@ -1,13 +1,11 @@
 import re
-import asyncio
-from kubernetes import client
-from kubernetes.client import ApiException
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client import ApiException
 
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from vui_common.configs.config_proxy import config_app
 from datetime import timezone
-
-coreV1 = client.CoreV1Api()
+from k8s.k8s_api_client import core_v1_api
 
 
 def _parse_version_output(output):
@@ -44,9 +42,11 @@ async def get_velero_version_service():
         "k8s-app=velero"
     ]
 
+    coreV1 = await core_v1_api()
+
     try:
         for label_selector in label_selectors:
-            pods = coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
+            pods = await coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
 
             if pods.items:
                 pod = pods.items[0]
@@ -69,7 +69,7 @@ async def get_velero_version_service():
 
 @trace_k8s_async_method(description="Get velero Pods")
 async def get_pods_service(label_selectors_by_type, namespace):
-    coreV1 = client.CoreV1Api()
+    coreV1 = await core_v1_api()
 
     pods_info = []
     seen_pods = set()
@@ -81,7 +81,7 @@ async def get_pods_service(label_selectors_by_type, namespace):
 
     for pod_type, label_selector in label_selectors_by_type.items():
         try:
-            pods = coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
+            pods = await coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
             for pod in pods.items:
                 pod_name = pod.metadata.name
                 if pod_name in seen_pods:
@@ -115,11 +115,11 @@ async def get_pods_service(label_selectors_by_type, namespace):
 
 
 async def get_pod_logs_service(pod, namespace="velero", lines=100):
-    coreV1 = client.CoreV1Api()
+    coreV1 = await core_v1_api()
 
-    def _get_logs():
+    async def _get_logs():
         try:
-            return coreV1.read_namespaced_pod_log(
+            return await coreV1.read_namespaced_pod_log(
                 name=pod,
                 namespace=namespace,
                 tail_lines=lines,
@@ -128,5 +128,5 @@ async def get_pod_logs_service(pod, namespace="velero", lines=100):
         except client.exceptions.ApiException as e:
             return f"error while fetching logs for '{pod}': {e}"
 
-    logs = (await asyncio.to_thread(_get_logs)).split("\n")
+    logs = (await _get_logs()).split("\n")
     return logs
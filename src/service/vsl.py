@@ -1,27 +1,32 @@
 from models.k8s.vsl import VolumeSnapshotLocationResponseSchema
 from schemas.request.create_vsl import CreateVslRequestSchema
 
-from kubernetes import client
-
 from schemas.request.update_vsl import UpdateVslRequestSchema
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
+from k8s.k8s_resource_cache import get_cached_items
 
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_api_client import custom_objects_api
+from service.utils.model_cache import ModelCache
 
-custom_objects = client.CustomObjectsApi()
+vsl_model_cache = ModelCache(VolumeSnapshotLocationResponseSchema)
 
 
 @trace_k8s_async_method(description="Get Volume Snapshot Locations")
 async def get_vsls_service():
-    vsl = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.VOLUME_SNAPSHOT_LOCATION].plural,
-    )
-    vsl_list = [VolumeSnapshotLocationResponseSchema(**item) for item in vsl.get("items", [])]
+    items = get_cached_items(RESOURCES[ResourcesNames.VOLUME_SNAPSHOT_LOCATION].plural)
+    if items is None:
+        custom_objects = await custom_objects_api()
+        vsl = await custom_objects.list_namespaced_custom_object(
+            group=VELERO["GROUP"],
+            version=VELERO["VERSION"],
+            namespace=config_app.k8s.velero_namespace,
+            plural=RESOURCES[ResourcesNames.VOLUME_SNAPSHOT_LOCATION].plural,
+        )
+        items = vsl.get("items", [])
+    vsl_list = vsl_model_cache.validate(items)
     return vsl_list
 
 
@@ -30,6 +35,7 @@ async def create_vsl_service(vsl_data: CreateVslRequestSchema):
     """
     Create a new VolumeSnapshotLocation in Kubernetes via the Velero API.
     """
+    custom_objects = await custom_objects_api()
     vsl_body = {
         "apiVersion": "velero.io/v1",
         "kind": "VolumeSnapshotLocation",
@@ -54,7 +60,7 @@ async def create_vsl_service(vsl_data: CreateVslRequestSchema):
             "key": vsl_data.credentialKey
         }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -67,7 +73,8 @@ async def create_vsl_service(vsl_data: CreateVslRequestSchema):
 @trace_k8s_async_method(description="Delete Volume Snapshot Locations")
 async def delete_vsl_service(vsl_name: str):
     """Delete a Velero BSL"""
-    response = custom_objects.delete_namespaced_custom_object(
+    custom_objects = await custom_objects_api()
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -81,8 +88,9 @@ async def update_vsl_service(vsl_data: UpdateVslRequestSchema):
     """
     Update a Backup Storage Location (BSL) in Kubernetes
     """
+    custom_objects = await custom_objects_api()
 
-    existing_vsl = custom_objects.get_namespaced_custom_object(
+    existing_vsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -112,7 +120,7 @@ async def update_vsl_service(vsl_data: UpdateVslRequestSchema):
         if "spec" in existing_vsl and isinstance(existing_vsl["spec"], dict) and 'credential' in existing_vsl["spec"]:
             existing_vsl['spec'].pop("credential")
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
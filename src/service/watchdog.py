@@ -1,6 +1,6 @@
 import aiohttp
 from fastapi import HTTPException
-from kubernetes import client
+from kubernetes_asyncio import client
 from vui_common.configs.config_proxy import config_app
 from datetime import datetime
 from service.k8s_secret import get_secret_service, add_or_update_key_in_secret_service
@@ -13,6 +13,7 @@ from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 from vui_common.logger.logger_proxy import logger
 from constants.watchdog import ENVIRONMENT
+from k8s.k8s_api_client import batch_v1_api, apps_v1_api
 
 
 async def __do_api_call(url):
@@ -86,10 +87,10 @@ async def get_watchdog_env_services():
 @trace_k8s_async_method(description="Get watchdog cron")
 async def get_watchdog_report_cron_service(job_name=f"{config_app.helm.release_name}-report-cronjob"):
     try:
-        api_instance = client.BatchV1Api()
+        api_instance = await batch_v1_api()
         logger.debug(f"namespace {config_app.k8s.velero_namespace} job_name {job_name}")
-        cronjob = api_instance.read_namespaced_cron_job(name=job_name,
-                                                        namespace=config_app.k8s.vui_namespace)
+        cronjob = await api_instance.read_namespaced_cron_job(name=job_name,
+                                                              namespace=config_app.k8s.vui_namespace)
         cron_schedule = cronjob.spec.schedule
         return cron_schedule
 
@@ -104,9 +105,9 @@ async def restart_watchdog_service():
         namespace = config_app.k8s.vui_namespace
         deployment_name = f"{config_app.helm.release_name}-watchdog-deploy"
 
-        api_instance = client.AppsV1Api()
+        api_instance = await apps_v1_api()
 
-        deployment = api_instance.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+        deployment = await api_instance.read_namespaced_deployment(name=deployment_name, namespace=namespace)
 
         # Update annotation in pod template (NOT just in metadata)
         restart_time = datetime.utcnow().isoformat()
@@ -115,7 +116,7 @@ async def restart_watchdog_service():
         deployment.spec.template.metadata.annotations["kubectl.kubernetes.io/restartedAt"] = restart_time
 
         # Apply the patch to update the deployment and force a restart
-        api_instance.patch_namespaced_deployment(
+        await api_instance.patch_namespaced_deployment(
             name=deployment_name,
             namespace=namespace,
             body={
@@ -10,6 +10,8 @@ from k8s.k8s_watch_manager import K8sWatchManager
 from k8s import k8s_watcher_proxy
 from vui_common.configs.config_proxy import config_app
 
+from service.utils.log_cache import log_content_cache
+
 def init_watchers(app):
     ws_manager_proxy.ws_manager = WebSocketManager()
     if config_app.nats.enable:
@@ -29,6 +31,8 @@ def init_watchers(app):
         send_global_callback=send_global_to_all,
         send_user_callback=send_user_to_all
     )
+    # cached logs are dropped when their backup / restore is deleted
+    k8s_watcher_proxy.k8s_watcher_manager.cache.add_listener(log_content_cache)
 
     if config_app.nats.enable:
         asyncio.create_task(nats_manager_proxy.nat_manager.run())
@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSONResponse that serializes pydantic models with model_dump_json() (the pydantic-core encoder),
+    skipping the model_dump() + json.dumps() round trip.
+
+    The output is the same compact UTF-8 JSON rendered by JSONResponse; any other content is rendered
+    by JSONResponse itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode('utf-8')
+        return super().render(content)
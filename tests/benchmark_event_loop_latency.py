@@ -0,0 +1,67 @@
+"""
+Benchmark (not a test) of the responsiveness of the event loop: a light endpoint is probed while concurrent
+list requests run against a live agent. Run it manually: python tests/benchmark_event_loop_latency.py
+"""
+import asyncio
+import statistics
+from time import perf_counter
+
+import aiohttp
+
+prefix = "api/v1/"
+backend_url = "http://127.0.0.1:8001/"
+login_data = {'username': 'admin', 'password': 'admin'}
+
+# number of concurrent list requests fired against the agent
+concurrency = 50
+# light endpoint used to measure the responsiveness of the event loop
+probe_url = backend_url + "health/cache"
+
+
+async def _timed_get(session, url):
+    start = perf_counter()
+    async with session.get(url) as response:
+        await response.read()
+        return perf_counter() - start, response.status
+
+
+async def _probe(session, stop, samples):
+    while not stop.is_set():
+        elapsed, _ = await _timed_get(session, probe_url)
+        samples.append(elapsed)
+        await asyncio.sleep(0.05)
+
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        async with session.post(backend_url + prefix + "token", data=login_data) as response:
+            token = (await response.json()).get('access_token')
+        if token is not None:
+            session.headers.update({"Authorization": 'Bearer ' + token})
+        else:
+            print("error: running without authentication")
+
+        # baseline latency of the probe with an idle agent
+        baseline = [(await _timed_get(session, probe_url))[0] for _ in range(20)]
+
+        stop = asyncio.Event()
+        samples = []
+        probe_task = asyncio.create_task(_probe(session, stop, samples))
+
+        start = perf_counter()
+        results = await asyncio.gather(*[_timed_get(session, backend_url + prefix + "backups")
+                                         for _ in range(concurrency)])
+        total = perf_counter() - start
+
+        stop.set()
+        await probe_task
+
+        statuses = {status for _, status in results}
+        print(f"{concurrency} concurrent /backups in {total:.3f}s, status codes {statuses}")
+        print(f"probe baseline median {statistics.median(baseline) * 1000:.1f}ms")
+        print(f"probe under load median {statistics.median(samples) * 1000:.1f}ms "
+              f"max {max(samples) * 1000:.1f}ms ({len(samples)} samples)")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
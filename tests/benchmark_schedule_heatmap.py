@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+from time import perf_counter
+
+# run from the repository root with the requirements installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.schedule_heatmap import _create_event_matrix, _get_cron_events  # noqa: E402
+
+schedules_count = 200
+repeat = 3
+crons = ['*/5 * * * *', '*/15 * * * *', '0 * * * *', '30 */2 * * *', '0 1 * * *', '15 3 * * 1-5', '0 0 * * 0',
+         '45 22 * * 6', '*/30 8-18 * * *', '0 */6 * * *']
+
+
+def _legacy_create_event_matrix(events):
+    # implementation before the NumPy engine, used as reference
+    matrix = [[[0 for _ in range(60)] for _ in range(24)] for _ in range(7)]
+    matrix_schedule_name = [[['' for _ in range(60)] for _ in range(24)] for _ in range(7)]
+
+    for event in events:
+        start_time_in_minutes = event['start_hour'] * 60 + event['start_minute']
+        duration_minute = event['duration'] if 'duration' in event else 0
+
+        for minute in range(duration_minute):
+            total_minutes = (event['weekday'] * 1440) + start_time_in_minutes + minute
+            current_weekday = (total_minutes // 1440) % 7
+            current_hour = (total_minutes % 1440) // 60
+            current_minute = total_minutes % 60
+
+            matrix[current_weekday][current_hour][current_minute] += 1
+            matrix_schedule_name[current_weekday][current_hour][current_minute] += (',' if matrix_schedule_name[
+                current_weekday][current_hour][current_minute] else '') + event['schedule_name']
+
+    return matrix, matrix_schedule_name
+
+
+random.seed(42)
+events = []
+for index in range(schedules_count):
+    duration = random.choice([1, 5, 30, 90, 360])
+    for event in _get_cron_events(random.choice(crons)):
+        event['duration'] = duration
+        event['schedule_name'] = f"schedule-{index}"
+        events.append(event)
+
+print(f"{schedules_count} schedules, {len(events)} events")
+
+for name, function in [('legacy', _legacy_create_event_matrix), ('numpy', _create_event_matrix)]:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function(events)
+        timings.append(perf_counter() - start)
+    print(f"{name}: best of {repeat} {min(timings):.3f}s")
+
+print(f"identical output: {_legacy_create_event_matrix(events) == _create_event_matrix(events)}")
@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+
+# run from the repository root with the requirements installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.schedule_heatmap import MINUTES_PER_WEEK, _get_cron_events  # noqa: E402
+from service.schedule_stagger import _StaggerItem, _shift_range, _stagger  # noqa: E402
+
+schedules_count = 500
+window = 120
+crons = ['0 2 * * *'] * 6 + ['30 1 * * 0', '0 */6 * * *', '*/30 * * * *', '15 3 * * 1-5']
+
+random.seed(42)
+items = []
+for index in range(schedules_count):
+    cron = random.choice(crons)
+    starts = [event['weekday'] * 1440 + event['start_hour'] * 60 + event['start_minute']
+              for event in _get_cron_events(cron)]
+    items.append(_StaggerItem(f"schedule-{index}", cron, random.choice([5, 15, 30, 60, 120]), starts,
+                              _shift_range(cron, window)))
+
+load_before = np.zeros(MINUTES_PER_WEEK, dtype=np.int64)
+for item in items:
+    np.add.at(load_before, item.cells(), 1)
+
+start = perf_counter()
+load_after = _stagger(items)
+elapsed = perf_counter() - start
+
+print(f"{schedules_count} schedules, window {window} minutes: {elapsed:.3f}s")
+print(f"peak before {load_before.max()}, after {load_after.max()}, "
+      f"{sum(1 for item in items if item.shift)} schedules moved")
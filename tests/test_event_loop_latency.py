@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+# run from the repository root with the requirements installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from k8s import k8s_list_pager, k8s_query  # noqa: E402
+from service.backup import get_backups_service  # noqa: E402
+
+# latency of the (stubbed) LIST of the API server
+api_latency = 1.0
+concurrency = 10
+
+
+class _SlowCustomObjects:
+    async def list_namespaced_custom_object(self, **kwargs):
+        await asyncio.sleep(api_latency)
+        return {'items': [], 'metadata': {}}
+
+
+async def _custom_objects_api():
+    return _SlowCustomObjects()
+
+
+def test_backups_listing_does_not_block_event_loop(monkeypatch):
+    # LIST towards the API server, no watch cache
+    monkeypatch.setattr(k8s_list_pager, 'custom_objects_api', _custom_objects_api)
+    monkeypatch.setattr(k8s_query, 'get_resource_cache', lambda: None)
+
+    async def run():
+        start = perf_counter()
+        listings = asyncio.gather(*[get_backups_service() for _ in range(concurrency)])
+        probe_start = perf_counter()
+        await asyncio.sleep(0.01)
+        probe = perf_counter() - probe_start
+        results = await listings
+        return probe, perf_counter() - start, results
+
+    probe, total, results = asyncio.run(run())
+
+    assert results == [[]] * concurrency
+    # the loop serves other tasks while the API calls are pending
+    assert probe < api_latency / 10
+    # the calls overlap instead of running one after the other
+    assert total < api_latency * 2